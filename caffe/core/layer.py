@@ -108,9 +108,14 @@ class Layer(object):
             call_layer = self._call_layer or self
             return call_layer.__call__(bottom)
 
-    def to_proto(self):
+    def to_proto(self, values=None):
         """Serialize to the proto.
 
+        Parameters
+        ----------
+        values : Sequence[numpy.ndarray], optional
+            The value of blobs to serialize.
+
         Returns
         -------
         LayerParameter
@@ -119,8 +124,9 @@ class Layer(object):
         """
         proto = caffe_pb2.LayerParameter()
         proto.CopyFrom(self._proto)
-        for blob in self._blobs:
-            value = blob['data'].numpy()
+        if values is None:
+            values = [blob['data'].numpy() for blob in self._blobs]
+        for value in values:
             if str(value.dtype) == 'float32':
                 blob_proto = caffe_pb2.BlobProto(
                     data=value.flatten(),
@@ -174,11 +174,13 @@ class Net(object):
 
         Parameters
         ----------
-        other : Union[str, NetParameter]
-            The path of binary proto file or ``NetParameter``.
+        other : Union[str, NetParameter, dragon.vm.caffe.Net]
+            The path of binary proto file, ``NetParameter`` or net.
 
         """
-        if (hasattr(other, 'ParseFromString') and
+        if isinstance(other, Net):
+            self._copy_from_net(other)
+        elif (hasattr(other, 'ParseFromString') and
                 callable(other.ParseFromString)):
             self.from_proto(other)
         else:
@@ -231,6 +233,18 @@ class Net(object):
         layer_proto = [layer.to_proto() for layer in self._layers]
         return caffe_pb2.NetParameter(name=self._proto.name, layer=layer_proto)
 
+    def _copy_from_net(self, other):
+        """Copy the blobs from the other net directly."""
+        layer_dict = dict((layer.name, layer) for layer in other._layers)
+        for layer in self._layers:
+            if layer.name in layer_dict:
+                src_blobs = layer_dict[layer.name].blobs
+                for i in range(min(len(layer.blobs), len(src_blobs))):
+                    dest, src = layer.blobs[i]['data'], src_blobs[i]['data']
+                    dest._impl.CopyFrom(src._impl,
+                                        dest.device.to_proto(),
+                                        src.device.to_proto())
+
     def _filter_layer(self, layer_param):
         """Check if layer should be included."""
         if not layer_param.name:
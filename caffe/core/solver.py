@@ -15,6 +15,8 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import os
+import threading
 import time
 
 import google.protobuf.text_format
@@ -32,7 +34,7 @@ from dragon.vm.caffe.core.proto import caffe_pb2
 class Solver(object):
     """Base solver class to optimize parameters."""
 
-    def __init__(self, solver_file, is_root=True):
+    def __init__(self, solver_file, is_root=True, max_async_snapshots=0):
         """Create a ``Solver``.
 
         Parameters
@@ -41,6 +43,8 @@ class Solver(object):
             The path of text proto file to load solver.
         is_root : bool, optional, default=True
             ``True`` to indicate a root solver.
+        max_async_snapshots : int, optional, default=0
+            The max number of snapshots written in background.
 
         """
         self._is_root = is_root
@@ -60,6 +64,9 @@ class Solver(object):
         self._test_nets = []
         self._iter = 0
         self._current_step = 0
+        self._max_async_snapshots = max_async_snapshots
+        self._snapshot_threads = collections.deque()
+        self._snapshot_errors = []
         self._init_train_net()
         self._init_test_nets()
 
@@ -136,10 +143,34 @@ class Solver(object):
         return self._test_nets
 
     def snapshot(self):
-        """Snapshot the parameters of train net."""
-        self._net.save(
-            '%s_iter_%d.caffemodel'
-            % (self._proto.snapshot_prefix, self._iter))
+        """Snapshot the parameters of train net.
+
+        If ``max_async_snapshots`` is positive, parameters are copied to host,
+        and then serialized and written by a background thread.
+        The snapshot is blocked only if too many writes are pending.
+
+        """
+        filepath = ('%s_iter_%d.caffemodel'
+                    % (self._proto.snapshot_prefix, self._iter))
+        if self._max_async_snapshots <= 0:
+            return self._net.save(filepath)
+        while len(self._snapshot_threads) >= self._max_async_snapshots:
+            self._snapshot_threads.popleft().join()
+        self._raise_snapshot_errors()
+        layers = []
+        for layer in self._net._layers:
+            values = [blob['data'].numpy(copy=True) for blob in layer._blobs]
+            layers.append((layer, values))
+        thread = threading.Thread(
+            target=self._write_snapshot, args=(layers, filepath))
+        thread.start()
+        self._snapshot_threads.append(thread)
+
+    def wait_snapshots(self):
+        """Wait for the pending snapshots to finish."""
+        while len(self._snapshot_threads) > 0:
+            self._snapshot_threads.popleft().join()
+        self._raise_snapshot_errors()
 
     def step(self, num_iterations=1):
         """Step the train net.
@@ -190,7 +221,7 @@ class Solver(object):
 
         """
         net = self._test_nets[test_idx]
-        net.copy_from(self._net.to_proto())
+        net.copy_from(self._net)
         test_iter = self._proto.test_iter[test_idx]
         test_scores = collections.defaultdict(float)
         for iter in range(test_iter):
@@ -227,6 +258,26 @@ class Solver(object):
         if num_test_net > 0:
             self._test_nets.append(Net(self._proto.net, 'TEST'))
 
+    def _raise_snapshot_errors(self):
+        """Raise the first error of background snapshots."""
+        if len(self._snapshot_errors) > 0:
+            error, self._snapshot_errors = self._snapshot_errors[0], []
+            raise error
+
+    def _write_snapshot(self, layers, filepath):
+        """Serialize and write the parameters into a file."""
+        try:
+            layer_proto = [layer.to_proto(values) for layer, values in layers]
+            proto = caffe_pb2.NetParameter(
+                name=self._net._proto.name, layer=layer_proto)
+            # Write to a temporary file and rename it when done.
+            tmp_filepath = filepath + '.tmp'
+            with open(tmp_filepath, 'wb') as f:
+                f.write(proto.SerializeToString())
+            os.replace(tmp_filepath, filepath)
+        except Exception as e:
+            self._snapshot_errors.append(e)
+
     def _get_learning_rate(self):
         """Get the learning rate based on preset policy."""
         policy = self._proto.lr_policy
@@ -294,7 +345,7 @@ class AdamSolver(Solver):
 
     """
 
-    def __init__(self, solver_file, is_root=True):
+    def __init__(self, solver_file, is_root=True, max_async_snapshots=0):
         """Create a ``AdamSolver``.
 
         Parameters
@@ -303,9 +354,11 @@ class AdamSolver(Solver):
             The path of solver file.
         is_root : bool, optional, default=True
             ``True`` to indicate a root solver.
+        max_async_snapshots : int, optional, default=0
+            The max number of snapshots written in background.
 
         """
-        super(AdamSolver, self).__init__(solver_file, is_root)
+        super(AdamSolver, self).__init__(solver_file, is_root, max_async_snapshots)
         self._optimizer_args['lr'] = self._proto.base_lr
         self._optimizer_args['beta1'] = self._proto.momentum
         self._optimizer_args['beta2'] = self._proto.momentum2
@@ -328,7 +381,7 @@ class NesterovSolver(Solver):
 
     """
 
-    def __init__(self, solver_file, is_root=True):
+    def __init__(self, solver_file, is_root=True, max_async_snapshots=0):
         """Create a ``NesterovSolver``.
 
         Parameters
@@ -337,9 +390,11 @@ class NesterovSolver(Solver):
             The path of solver file.
         is_root : bool, optional, default=True
             ``True`` to indicate a root solver.
+        max_async_snapshots : int, optional, default=0
+            The max number of snapshots written in background.
 
         """
-        super(NesterovSolver, self).__init__(solver_file, is_root)
+        super(NesterovSolver, self).__init__(solver_file, is_root, max_async_snapshots)
         self._optimizer_args['lr'] = self._proto.base_lr
         self._optimizer_args['momentum'] = self._proto.momentum
         self._optimizer = Nesterov(**self._optimizer_args)
@@ -361,7 +416,7 @@ class RMSPropSolver(Solver):
 
     """
 
-    def __init__(self, solver_file, is_root=True):
+    def __init__(self, solver_file, is_root=True, max_async_snapshots=0):
         """Create a ``RMSPropSolver``.
 
         Parameters
@@ -370,9 +425,11 @@ class RMSPropSolver(Solver):
             The path of solver file.
         is_root : bool, optional, default=True
             ``True`` to indicate a root solver.
+        max_async_snapshots : int, optional, default=0
+            The max number of snapshots written in background.
 
         """
-        super(RMSPropSolver, self).__init__(solver_file, is_root)
+        super(RMSPropSolver, self).__init__(solver_file, is_root, max_async_snapshots)
         self._optimizer_args['lr'] = self._proto.base_lr
         self._optimizer_args['decay'] = self._proto.rms_decay
         self._optimizer_args['eps'] = self._proto.delta
@@ -394,7 +451,7 @@ class SGDSolver(Solver):
 
     """
 
-    def __init__(self, solver_file, is_root=True):
+    def __init__(self, solver_file, is_root=True, max_async_snapshots=0):
         """Create a ``SGDSolver``.
 
         Parameters
@@ -403,9 +460,11 @@ class SGDSolver(Solver):
             The path of solver file.
         is_root : bool, optional, default=True
             ``True`` to indicate a root solver.
+        max_async_snapshots : int, optional, default=0
+            The max number of snapshots written in background.
 
         """
-        super(SGDSolver, self).__init__(solver_file, is_root)
+        super(SGDSolver, self).__init__(solver_file, is_root, max_async_snapshots)
         self._optimizer_args['lr'] = self._proto.base_lr
         self._optimizer_args['momentum'] = self._proto.momentum
         self._optimizer = SGD(**self._optimizer_args)
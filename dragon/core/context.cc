@@ -3,6 +3,159 @@
 
 namespace dragon {
 
+namespace {
+
+size_t GetSizeClass(size_t size) {
+  // Use 4 classes between the powers of two to bound the waste by 25%.
+  if (size <= 512) return 512;
+  size_t step = 128;
+  while ((step << 3) < size) {
+    step <<= 1;
+  }
+  return (size + step - 1) / step * step;
+}
+
+// The pool to allocate in current thread.
+thread_local CPUMemoryPool* current_pool = nullptr;
+
+// The live pools to apply the cache limit.
+struct PoolRegistry {
+  std::mutex mutex;
+  Set<CPUMemoryPool*> pools;
+  size_t cache_limit = size_t(1) << 30;
+};
+
+PoolRegistry& GetPoolRegistry() {
+  // Never destroyed as pools may be destroyed at exit.
+  static auto* registry = new PoolRegistry();
+  return *registry;
+}
+
+} // namespace
+
+CPUMemoryPool::Guard::Guard(CPUMemoryPool* pool) : prev_pool_(current_pool) {
+  current_pool = pool;
+}
+
+CPUMemoryPool::Guard::~Guard() {
+  current_pool = prev_pool_;
+}
+
+CPUMemoryPool::CPUMemoryPool() {
+  auto& registry = GetPoolRegistry();
+  std::lock_guard<std::mutex> lock(registry.mutex);
+  cache_limit_ = registry.cache_limit;
+  registry.pools.insert(this);
+}
+
+CPUMemoryPool::~CPUMemoryPool() {
+  {
+    auto& registry = GetPoolRegistry();
+    std::lock_guard<std::mutex> lock(registry.mutex);
+    registry.pools.erase(this);
+  }
+  // Blocks in use hold the pool, only the cached remain.
+  EmptyCache();
+}
+
+void* CPUMemoryPool::New(size_t size) {
+  auto block_size = GetSizeClass(size);
+  std::lock_guard<std::mutex> lock(mutex_);
+  void* data = nullptr;
+  auto& blocks = cached_blocks_[block_size];
+  if (!blocks.empty()) {
+    data = blocks.back();
+    blocks.pop_back();
+    cached_bytes_ -= block_size;
+  } else {
+    data = malloc(block_size);
+    if (data == nullptr && cached_bytes_ > 0) {
+      // Retry after releasing the cached blocks.
+      for (auto& it : cached_blocks_) {
+        for (auto* ptr : it.second) {
+          free(ptr);
+        }
+        it.second.clear();
+      }
+      cached_bytes_ = 0;
+      data = malloc(block_size);
+    }
+    CHECK(data) << "\nAllocate memory with " << size << " bytes failed.";
+  }
+  block_sizes_[data] = block_size;
+  allocated_bytes_ += block_size;
+  return data;
+}
+
+void CPUMemoryPool::Delete(void* ptr) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  auto it = block_sizes_.find(ptr);
+  if (it == block_sizes_.end()) {
+    // The block is not allocated by this pool.
+    free(ptr);
+    return;
+  }
+  auto block_size = it->second;
+  block_sizes_.erase(it);
+  allocated_bytes_ -= block_size;
+  if (cached_bytes_ + block_size <= cache_limit_) {
+    cached_blocks_[block_size].push_back(ptr);
+    cached_bytes_ += block_size;
+  } else {
+    free(ptr);
+  }
+}
+
+void CPUMemoryPool::EmptyCache() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  for (auto& it : cached_blocks_) {
+    for (auto* ptr : it.second) {
+      free(ptr);
+    }
+  }
+  cached_blocks_.clear();
+  cached_bytes_ = 0;
+}
+
+size_t CPUMemoryPool::allocated_bytes() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return allocated_bytes_;
+}
+
+size_t CPUMemoryPool::cached_bytes() {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return cached_bytes_;
+}
+
+void CPUMemoryPool::SetCacheLimit(size_t limit) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    cache_limit_ = limit;
+    if (cached_bytes_ <= cache_limit_) return;
+  }
+  EmptyCache();
+}
+
+void CPUMemoryPool::set_cache_limit(size_t limit) {
+  auto& registry = GetPoolRegistry();
+  std::lock_guard<std::mutex> lock(registry.mutex);
+  registry.cache_limit = limit;
+  for (auto* pool : registry.pools) {
+    pool->SetCacheLimit(limit);
+  }
+}
+
+shared_ptr<CPUMemoryPool> CPUMemoryPool::Current() {
+  if (current_pool != nullptr) return current_pool->shared_from_this();
+  return Get().shared_from_this();
+}
+
+CPUMemoryPool& CPUMemoryPool::Get() {
+  // Never destroyed as blocks may be returned at exit.
+  static auto* pool = new shared_ptr<CPUMemoryPool>(new CPUMemoryPool());
+  return **pool;
+}
+
 Workspace* CPUContext::workspace() {
   static thread_local Workspace workspace("");
   return &workspace;
@@ -19,6 +19,76 @@ namespace dragon {
 
 class Workspace;
 
+/*!
+ * \brief The caching pool of cpu memory blocks.
+ */
+class DRAGON_API CPUMemoryPool
+    : public std::enable_shared_from_this<CPUMemoryPool> {
+ public:
+  /*!
+   * \brief Guard to allocate from a pool in current thread.
+   */
+  class DRAGON_API Guard {
+   public:
+    /*! \brief Constructor with the pool */
+    explicit Guard(CPUMemoryPool* pool);
+
+    /*! \brief Destructor */
+    ~Guard();
+
+   private:
+    CPUMemoryPool* prev_pool_;
+  };
+
+  /*! \brief Default constructor */
+  CPUMemoryPool();
+
+  /*! \brief Destructor */
+  ~CPUMemoryPool();
+
+  /*! \brief Allocate a block from the pool */
+  void* New(size_t size);
+
+  /*! \brief Return a block to the pool */
+  void Delete(void* ptr);
+
+  /*! \brief Release all the cached blocks */
+  void EmptyCache();
+
+  /*! \brief Return the number of bytes in use */
+  size_t allocated_bytes();
+
+  /*! \brief Return the number of cached bytes */
+  size_t cached_bytes();
+
+  /*! \brief Set the max number of cached bytes for all pools */
+  static void set_cache_limit(size_t limit);
+
+  /*! \brief Return the pool to allocate in current thread */
+  static shared_ptr<CPUMemoryPool> Current();
+
+  /*! \brief Return the default pool */
+  static CPUMemoryPool& Get();
+
+ private:
+  /*! \brief Set the max number of cached bytes */
+  void SetCacheLimit(size_t limit);
+
+  /*! \brief The synchronization mutex */
+  std::mutex mutex_;
+
+  /*! \brief The size class of allocated blocks */
+  Map<void*, size_t> block_sizes_;
+
+  /*! \brief The cached blocks of each size class */
+  Map<size_t, vector<void*>> cached_blocks_;
+
+  /*! \brief The memory counters */
+  size_t allocated_bytes_ = 0, cached_bytes_ = 0, cache_limit_;
+
+  DISABLE_COPY_AND_ASSIGN(CPUMemoryPool);
+};
+
 /*!
  * \brief The cpu device context.
  */
@@ -41,9 +111,7 @@ class DRAGON_API CPUContext {
 
   /*! \brief Allocate a block of memory */
   static void* New(size_t size) {
-    void* data = malloc(size);
-    CHECK(data) << "\nAllocate memory with " << size << " bytes failed.";
-    return data;
+    return CPUMemoryPool::Get().New(size);
   }
 
   /*! \brief Set a memory block to the given value */
@@ -70,7 +138,7 @@ class DRAGON_API CPUContext {
 
   /*! \brief Deallocate a memory block */
   static void Delete(void* ptr) {
-    free(ptr);
+    CPUMemoryPool::Get().Delete(ptr);
   }
 
   /*! \brief Switch to the device in current thread */
@@ -1,7 +1,6 @@
 #include <regex>
 
 #include "dragon/core/graph.h"
-#include "dragon/core/graph_optimizer.h"
 #include "dragon/core/workspace.h"
 
 namespace dragon {
@@ -48,13 +47,19 @@ bool Graph::Create(const GraphDef& def) {
   return true;
 }
 
-Graph::Graph(const GraphDef& def, Workspace* ws) : GraphBase(def, ws) {
+Graph::Graph(const GraphDef& def, Workspace* ws)
+    : GraphBase(def, ws), plan_memory_(false), memory_planned_(false) {
   // Apply the optimizations.
   GraphDef def_v2(def);
   GraphOptimizer optimizer(ws);
   Map<string, vec32_t> subgraph_indices;
   int opt = 1;
   if (args().count("optimization")) opt = arg("optimization").i();
+  if (opt >= 4 && phase() == "TEST") {
+    def_v2 = optimizer.EliminateIdentities(def_v2);
+    def_v2 = optimizer.FuseOperators(def_v2);
+    foldings_ = optimizer.foldings();
+  }
   if (opt >= 2) optimizer.PlanInplace(def_v2, output_aliases_);
   if (opt >= 3) {
     if (phase() == "TRAIN") {
@@ -65,6 +70,9 @@ Graph::Graph(const GraphDef& def, Workspace* ws) : GraphBase(def, ws) {
         tape.Optimize({grad_sources.begin(), grad_sources.end()});
         def_v2 = tape.def();
       }
+    } else if (opt >= 5) {
+      // Intermediates are placed into an arena after the first run.
+      plan_memory_ = true;
     } else {
       def_v2 = optimizer.EliminateIntermediates(def_v2);
     }
@@ -85,19 +93,265 @@ Graph::Graph(const GraphDef& def, Workspace* ws) : GraphBase(def, ws) {
   }
 }
 
-bool Graph::Run(int stream, const string& include, const string& exclude) {
+const vector<OperatorBase*>& Graph::GetStageOps(
+    const string& include,
+    const string& exclude) {
+  if (include.empty() && exclude.empty()) return ops_;
+  auto& exclude_ops = stage_ops_[include];
+  auto it = exclude_ops.find(exclude);
+  if (it != exclude_ops.end()) return it->second;
+  // Match the operator types once for this stage.
   unique_ptr<std::regex> regex_incl, regex_excl;
   if (!include.empty()) regex_incl.reset(new std::regex(include));
   if (!exclude.empty()) regex_excl.reset(new std::regex(exclude));
-  LOG(DEBUG) << "Run: " << name();
+  auto& ops = exclude_ops[exclude];
   for (auto* op : ops_) {
     if (regex_incl && !regex_match(op->type(), *regex_incl)) continue;
     if (regex_excl && regex_match(op->type(), *regex_excl)) continue;
+    ops.push_back(op);
+  }
+  return ops;
+}
+
+bool Graph::Run(int stream, const string& include, const string& exclude) {
+  LOG(DEBUG) << "Run: " << name();
+  RefoldParameters();
+  for (auto* op : GetStageOps(include, exclude)) {
     op->SwitchToPhase(phase());
     LOG(DEBUG) << "Run: " << op->name();
     op->Run(stream);
     LOG(DEBUG) << "Finish: " << op->name();
   }
+  if (plan_memory_ && include.empty() && exclude.empty()) {
+    // Replan if any tensor leaves the arena, e.g., the shape grows.
+    bool planned = memory_planned_;
+    for (const auto& iter : planned_memories_) {
+      auto* memory = iter.first->memory(false, true);
+      if (memory != iter.second || !memory->external()) planned = false;
+    }
+    if (!planned) PlanMemory();
+  }
+  LOG(DEBUG) << "Finish: " << name();
+  return true;
+}
+
+void Graph::RefoldParameters() {
+  // Sources written by other graphs or eager operators change the counts.
+  for (auto& folding : foldings_) {
+    bool updated = false, available = true;
+    for (size_t i = 0; i < folding.sources.size(); ++i) {
+      auto* tensor = ws_->TryGetTensor(folding.sources[i]);
+      if (tensor == nullptr || !tensor->has_memory()) {
+        available = false;
+        break;
+      }
+      updated |= tensor->write_count() != folding.write_counts[i];
+    }
+    if (!updated || !available) continue;
+    LOG(DEBUG) << "Refold: " << folding.op.name();
+    GraphOptimizer(ws_).ComputeFolding(&folding);
+  }
+}
+
+void Graph::PlanMemory() {
+  const size_t kAlignment = 256;
+  const auto& device_option = optimized_def_.device_option();
+  const bool is_cuda = device_option.device_type() == PROTO_CUDA;
+  const int device_id = device_option.device_id();
+  const auto state =
+      is_cuda ? UnifiedMemory::STATE_AT_CUDA : UnifiedMemory::STATE_AT_CPU;
+  GraphOptimizer optimizer(ws_);
+  Map<string, GraphOptimizer::Block> lifetimes;
+  optimizer.PlanLifetimes(optimized_def_, lifetimes);
+  // Group the tensors sharing a memory, e.g., the in-place outputs.
+  Map<UnifiedMemory*, GraphOptimizer::Block> blocks;
+  Map<UnifiedMemory*, Tensor*> owners;
+  Set<UnifiedMemory*> unplannable;
+  vector<UnifiedMemory*> memories;
+  Set<string> names;
+  for (const auto& op : optimized_def_.op()) {
+    for (const auto& in : op.input()) {
+      names.insert(in);
+    }
+    for (const auto& out : op.output()) {
+      if (!out.empty()) names.insert(out);
+    }
+  }
+  for (const auto& name : names) {
+    auto* tensor = ws_->TryGetTensor(name);
+    auto* memory = tensor != nullptr ? tensor->memory() : nullptr;
+    if (memory == nullptr) continue;
+    auto it = lifetimes.find(name);
+    if (it == lifetimes.end() || tensor->meta().ctor() ||
+        memory->state() != state ||
+        (is_cuda && memory->device() != device_id)) {
+      unplannable.insert(memory);
+      continue;
+    }
+    auto& block = blocks[memory];
+    if (block.start < 0) memories.push_back(memory);
+    block.start = block.start < 0 ? it->second.start
+                                  : std::min(block.start, it->second.start);
+    block.end = std::max(block.end, it->second.end);
+    block.size = memory->size();
+    if (tensor->memory(false, true) == memory) owners[memory] = tensor;
+  }
+  vector<GraphOptimizer::Block*> plan;
+  vector<pair<Tensor*, UnifiedMemory*>> planned_memories;
+  for (auto* memory : memories) {
+    if (unplannable.count(memory) || !owners.count(memory)) continue;
+    plan.push_back(&blocks[memory]);
+    planned_memories.emplace_back(owners[memory], memory);
+  }
+  const auto arena_size = optimizer.PlanOffsets(plan, kAlignment);
+  // Release the tensors left in the previous arena.
+  Set<UnifiedMemory*> planned;
+  for (const auto& iter : planned_memories) {
+    planned.insert(iter.second);
+  }
+  for (const auto& iter : planned_memories_) {
+    auto* memory = iter.first->memory(false, true);
+    if (memory == iter.second && !planned.count(memory)) iter.first->Reset();
+  }
+  // Point the memories into the new arena.
+  unique_ptr<Tensor> arena(new Tensor);
+  uint8_t* arena_data = nullptr;
+  if (arena_size > 0) {
+    arena->Reshape({int64_t(arena_size)});
+    if (is_cuda) {
+      CUDADeviceGuard guard(device_id);
+      arena_data = arena->mutable_data<uint8_t, CUDAContext>();
+    } else {
+      arena_data = arena->mutable_data<uint8_t, CPUContext>();
+    }
+  }
+  for (const auto& iter : planned_memories) {
+    auto* memory = iter.second;
+    auto* data = arena_data + blocks[memory].offset;
+    if (is_cuda) {
+      memory->set_cuda_data(data, memory->size(), device_id);
+    } else {
+      memory->set_cpu_data(data, memory->size());
+    }
+  }
+  arena_.swap(arena);
+  planned_memories_.swap(planned_memories);
+  memory_planned_ = true;
+  // Report the footprint against the peak of live memories.
+  int64_t total_size = 0, peak_size = 0, live_size = 0;
+  vector<int64_t> live_deltas(optimized_def_.op_size() + 1, 0);
+  for (const auto* block : plan) {
+    total_size += block->size;
+    live_deltas[block->start] += block->size;
+    live_deltas[block->end + 1] -= block->size;
+  }
+  for (auto delta : live_deltas) {
+    live_size += delta;
+    peak_size = std::max(peak_size, live_size);
+  }
+  LOG(INFO) << "Plan memory of " << name() << ": " << plan.size()
+            << " tensors, arena " << arena_size / 1048576.f << " MB, peak "
+            << peak_size / 1048576.f << " MB, total "
+            << total_size / 1048576.f << " MB.";
+}
+
+DAGGraph::DAGGraph(const GraphDef& def, Workspace* ws)
+    : Graph(def, ws),
+      stream_(0),
+      num_remaining_(0),
+      warmed_(false),
+      stopped_(false) {
+  int num_threads = std::thread::hardware_concurrency();
+  if (args().count("num_threads")) num_threads = arg("num_threads").i();
+  // Only the cpu operators without recomputing are scheduled concurrently.
+  // The scratch data of cpu operators comes from the thread-local workspace
+  // of CPUContext, so each worker uses its own "shared/buffer/data:0".
+  parallel_ = num_threads > 1;
+  for (auto* op : ops_) {
+    if (op->def().device_option().device_type() != PROTO_CPU ||
+        !op->subgraph().empty()) {
+      parallel_ = false;
+    }
+  }
+  // The arena is planned for the sequential order only.
+  if (parallel_) plan_memory_ = false;
+  if (!parallel_) return;
+  GraphOptimizer optimizer(ws);
+  optimizer.PlanDependencies(optimized_def_, output_aliases_, op_childs_);
+  num_parents_.assign(ops_.size(), 0);
+  for (const auto& childs : op_childs_) {
+    for (auto child : childs) {
+      num_parents_[child]++;
+    }
+  }
+  num_pending_.resize(ops_.size());
+  for (int i = 1; i < num_threads; ++i) {
+    workers_.emplace_back([this]() {
+      CPUMemoryPool::Guard guard(workspace()->cpu_pool());
+      RunTasks(true);
+    });
+  }
+}
+
+DAGGraph::~DAGGraph() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stopped_ = true;
+  }
+  cond_.notify_all();
+  for (auto& worker : workers_) {
+    worker.join();
+  }
+}
+
+void DAGGraph::RunTasks(bool is_worker) {
+  std::unique_lock<std::mutex> lock(mutex_);
+  while (true) {
+    cond_.wait(lock, [&]() {
+      return stopped_ || !ready_ops_.empty() ||
+          (!is_worker && num_remaining_ == 0);
+    });
+    if (stopped_ || ready_ops_.empty()) return;
+    auto op_idx = ready_ops_.front();
+    ready_ops_.pop();
+    auto* op = ops_[op_idx];
+    lock.unlock();
+    op->SwitchToPhase(phase());
+    LOG(DEBUG) << "Run: " << op->name();
+    op->Run(stream_);
+    LOG(DEBUG) << "Finish: " << op->name();
+    lock.lock();
+    int num_ready = 0;
+    for (auto child : op_childs_[op_idx]) {
+      if (--num_pending_[child] == 0) {
+        ready_ops_.push(child);
+        num_ready++;
+      }
+    }
+    // This thread takes one of the ready operators directly.
+    if (--num_remaining_ == 0 || num_ready > 1) cond_.notify_all();
+  }
+}
+
+bool DAGGraph::Run(int stream, const string& include, const string& exclude) {
+  // The first run is sequential to create buffers in the workspace.
+  if (!parallel_ || !warmed_ || !include.empty() || !exclude.empty()) {
+    warmed_ = true;
+    return Graph::Run(stream, include, exclude);
+  }
+  LOG(DEBUG) << "Run: " << name();
+  RefoldParameters();
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stream_ = stream;
+    num_remaining_ = (int)ops_.size();
+    for (int i = 0; i < ops_.size(); ++i) {
+      num_pending_[i] = num_parents_[i];
+      if (num_parents_[i] == 0) ready_ops_.push(i);
+    }
+  }
+  cond_.notify_all();
+  RunTasks(false);
   LOG(DEBUG) << "Finish: " << name();
   return true;
 }
@@ -113,4 +367,6 @@ GraphBase* GraphBase::New(const GraphDef& def, Workspace* ws) {
 /* Graph Registry */
 DEFINE_REGISTRY(GraphRegistry, GraphBase, const GraphDef&, Workspace*);
 
+REGISTER_GRAPH(DAG, DAGGraph);
+
 } // namespace dragon
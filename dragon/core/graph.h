@@ -13,7 +13,11 @@
 #ifndef DRAGON_CORE_GRAPH_H_
 #define DRAGON_CORE_GRAPH_H_
 
+#include <condition_variable>
+#include <thread>
+
 #include "dragon/core/common.h"
+#include "dragon/core/graph_optimizer.h"
 #include "dragon/core/operator.h"
 
 namespace dragon {
@@ -122,11 +126,79 @@ class Graph : public GraphBase {
       const string& exclude = "") override;
 
  protected:
+  /*! \brief Return the operators matching the stage patterns */
+  const vector<OperatorBase*>& GetStageOps(
+      const string& include,
+      const string& exclude);
+
+  /*! \brief Plan the memory of intermediates into an arena */
+  void PlanMemory();
+
+  /*! \brief Refold the parameters if sources are updated */
+  void RefoldParameters();
+
   /*! \brief The created operators */
   vector<OperatorBase*> ops_;
 
+  /*! \brief The cached operators of executing stages */
+  Map<string, Map<string, vector<OperatorBase*>>> stage_ops_;
+
   /*! \brief The output aliases */
   Map<string, Set<string>> output_aliases_;
+
+  /*! \brief The folded parameters of operators */
+  vector<GraphOptimizer::Folding> foldings_;
+
+  /*! \brief The memory arena of intermediates */
+  unique_ptr<Tensor> arena_;
+
+  /*! \brief The planned owner tensors and memories */
+  vector<pair<Tensor*, UnifiedMemory*>> planned_memories_;
+
+  /*! \brief The memory planning states */
+  bool plan_memory_, memory_planned_;
+};
+
+/*!
+ * \brief Graph to execute independent operators concurrently.
+ */
+class DAGGraph : public Graph {
+ public:
+  /*! \brief Constructor with the def and workspace */
+  DAGGraph(const GraphDef& def, Workspace* ws);
+
+  /*! \brief Destructor */
+  virtual ~DAGGraph();
+
+  /*! \brief Run graph on the given stream */
+  bool Run(
+      int stream = 0,
+      const string& include = "",
+      const string& exclude = "") override;
+
+ protected:
+  /*! \brief Run the ready operators until the graph is finished */
+  void RunTasks(bool is_worker);
+
+  /*! \brief The child operators of each operator */
+  vector<vec32_t> op_childs_;
+
+  /*! \brief The number of parent and pending operators */
+  vec32_t num_parents_, num_pending_;
+
+  /*! \brief The ready operators to execute */
+  queue<int> ready_ops_;
+
+  /*! \brief The worker threads */
+  vector<std::thread> workers_;
+
+  /*! \brief The synchronization primitives */
+  std::mutex mutex_;
+  std::condition_variable cond_;
+
+  /*! \brief The executing states */
+  int stream_, num_remaining_;
+  bool parallel_, warmed_, stopped_;
 };
 
 /* Macros */
@@ -6,6 +6,94 @@
 
 namespace dragon {
 
+namespace {
+
+const Argument* GetArgument(const OperatorDef& op, const string& name) {
+  for (const auto& arg : op.arg()) {
+    if (arg.name() == name) return &arg;
+  }
+  return nullptr;
+}
+
+Argument* MutableArgument(OperatorDef* op, const string& name) {
+  for (auto& arg : *op->mutable_arg()) {
+    if (arg.name() == name) return &arg;
+  }
+  auto* arg = op->add_arg();
+  arg->set_name(name);
+  return arg;
+}
+
+bool FuseBiasAdd(OperatorDef* op, const OperatorDef& next) {
+  if (op->input_size() != 2 || next.input_size() != 2) return false;
+  const auto* arg = GetArgument(next, "data_format");
+  const string data_format = arg ? arg->s() : "NCHW";
+  if (op->type() == "Conv") {
+    arg = GetArgument(*op, "data_format");
+    if (data_format != (arg ? arg->s() : "NCHW")) return false;
+  } else if (op->type() == "Gemm") {
+    // Matrix C is broadcast to the last axis of Y.
+    if (data_format != "NHWC") return false;
+    MutableArgument(op, "beta")->set_f(1.f);
+  } else {
+    return false;
+  }
+  op->add_input(next.input(1));
+  return true;
+}
+
+bool GetFoldingDims(
+    const OperatorDef& op,
+    const OperatorDef& next,
+    Tensor* W,
+    int64_t* dims) {
+  // Determine the output channels, outer and inner dims of weight.
+  const auto* arg = GetArgument(next, "axis");
+  const auto axis = arg ? arg->i() : int64_t(-1);
+  int64_t C, inner_dim = 1, outer_dim = 1;
+  if (op.type() == "Conv") {
+    arg = GetArgument(op, "data_format");
+    const auto ndim = W->ndim();
+    if (arg == nullptr || arg->s() == "NCHW") {
+      if (axis != 1 && axis != 1 - ndim) return false;
+    } else {
+      if (axis != -1 && axis != ndim - 1) return false;
+    }
+    C = W->dim(0), inner_dim = W->count(1);
+  } else {
+    if (axis != -1) return false;
+    arg = GetArgument(op, "transB");
+    if (arg != nullptr && arg->i() > 0) {
+      if (W->ndim() != 2) return false;
+      C = W->dim(0), inner_dim = W->dim(1);
+    } else {
+      C = W->dim(-1), outer_dim = W->count() / C;
+    }
+  }
+  dims[0] = C, dims[1] = outer_dim, dims[2] = inner_dim;
+  return true;
+}
+
+bool FuseActivation(
+    const GraphDef& graph,
+    OperatorDef* op,
+    const OperatorDef& next) {
+  if (op->type() != "Conv" && op->type() != "Gemm") return false;
+  // Only the cpu operators implement the fused activation.
+  const auto& device_option =
+      op->has_device_option() ? op->device_option() : graph.device_option();
+  if (device_option.device_type() != PROTO_CPU) return false;
+  for (const auto& arg : next.arg()) {
+    if (arg.name() == "alpha" || arg.name() == "max_value") {
+      if (arg.f() != 0.f) return false;
+    }
+  }
+  MutableArgument(op, "activation")->set_s("Relu");
+  return true;
+}
+
+} // namespace
+
 void GraphOptimizer::BuildDAG(const GraphDef& graph) {
   nodes_.clear();
   inputs_count_.clear();
@@ -227,4 +315,392 @@ GraphDef GraphOptimizer::EliminateIntermediates(const GraphDef& graph) {
   return graph_v2;
 }
 
+GraphDef GraphOptimizer::EliminateIdentities(const GraphDef& graph) {
+  Set<string> required_outputs;
+  Map<string, set<int>> readers, writers;
+  static Set<string> identity_ops = {"Identity", "Dropout"};
+
+  // Collect the readers and writers.
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    const auto& op = graph.op(op_idx);
+    for (const auto& input : op.input()) {
+      readers[input].insert(op_idx);
+    }
+    for (const auto& output : op.output()) {
+      writers[output].insert(op_idx);
+    }
+  }
+  for (const auto& output : graph.output()) {
+    required_outputs.insert(output);
+  }
+
+  // Forward the inputs to readers of the outputs.
+  auto graph_v2(graph);
+  vector<bool> removed(graph.op_size(), false);
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    const auto& op = graph_v2.op(op_idx);
+    if (!identity_ops.count(op.type())) continue;
+    if (op.input_size() != 1 || op.output_size() != 1) continue;
+    const auto input = op.input(0), output = op.output(0);
+    if (input != output) {
+      if (required_outputs.count(output) > 0) continue;
+      if (writers[output] != set<int>({op_idx})) continue;
+      auto& output_readers = readers[output];
+      if (!output_readers.empty() && *output_readers.begin() < op_idx) {
+        continue;
+      }
+      // The input should not be overwritten by the later operators.
+      const auto& input_writers = writers[input];
+      if (!input_writers.empty() && *input_writers.rbegin() > op_idx) {
+        continue;
+      }
+      for (auto reader_idx : output_readers) {
+        auto* reader = graph_v2.mutable_op(reader_idx);
+        for (int i = 0; i < reader->input_size(); ++i) {
+          if (reader->input(i) == output) reader->set_input(i, input);
+        }
+        readers[input].insert(reader_idx);
+      }
+      output_readers.clear();
+    }
+    readers[input].erase(op_idx);
+    writers[output].erase(op_idx);
+    removed[op_idx] = true;
+  }
+
+  // Remove the identities.
+  GraphDef graph_v3(graph_v2);
+  graph_v3.clear_op();
+  for (int op_idx = 0; op_idx < graph_v2.op_size(); ++op_idx) {
+    if (removed[op_idx]) continue;
+    graph_v3.add_op()->CopyFrom(graph_v2.op(op_idx));
+  }
+  return graph_v3;
+}
+
+GraphDef GraphOptimizer::FuseOperators(const GraphDef& graph) {
+  Set<string> required_outputs, written;
+  Map<string, set<int>> readers, writers;
+
+  // Collect the readers and writers.
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    const auto& op = graph.op(op_idx);
+    for (const auto& input : op.input()) {
+      readers[input].insert(op_idx);
+    }
+    for (const auto& output : op.output()) {
+      writers[output].insert(op_idx);
+      written.insert(output);
+    }
+  }
+  for (const auto& output : graph.output()) {
+    required_outputs.insert(output);
+  }
+
+  // Fuse the following operators into producers.
+  auto graph_v2(graph);
+  vector<bool> fused(graph.op_size(), false);
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    auto* op = graph_v2.mutable_op(op_idx);
+    if (fused[op_idx] || op->output_size() != 1) continue;
+    while (GetArgument(*op, "activation") == nullptr) {
+      const auto output = op->output(0);
+      const auto& output_readers = readers[output];
+      auto reader_iter = output_readers.upper_bound(op_idx);
+      if (reader_iter == output_readers.end()) break;
+      const int next_idx = *reader_iter;
+      const auto& next = graph_v2.op(next_idx);
+      if (next.input_size() == 0 || next.input(0) != output) break;
+      if (next.output_size() != 1) break;
+      const auto next_output = next.output(0);
+      if (next_output == output) {
+        // In-place: readers after the next read the fused output.
+        if (writers[output] != set<int>({op_idx, next_idx})) break;
+      } else {
+        // Otherwise, the next should be the only reader.
+        if (required_outputs.count(output) > 0) break;
+        if (writers[output] != set<int>({op_idx})) break;
+        if (output_readers != set<int>({next_idx})) break;
+        if (writers[next_output] != set<int>({next_idx})) break;
+        const auto& next_output_readers = readers[next_output];
+        if (!next_output_readers.empty() &&
+            *next_output_readers.begin() < next_idx) {
+          break;
+        }
+      }
+      // Other inputs are read earlier after fusion.
+      bool hazard = false;
+      for (int i = 1; i < next.input_size(); ++i) {
+        for (auto writer_idx : writers[next.input(i)]) {
+          hazard |= (writer_idx >= op_idx && writer_idx <= next_idx);
+        }
+      }
+      if (hazard) break;
+      bool success = false;
+      if (next.type() == "BiasAdd") {
+        success = FuseBiasAdd(op, next);
+      } else if (next.type() == "BatchNorm") {
+        success = FoldBatchNorm(written, op, next);
+      } else if (next.type() == "Relu") {
+        success = FuseActivation(graph, op, next);
+      }
+      if (!success) break;
+      LOG(DEBUG) << "Fuse: " << next.name() << " [" << next.type() << "]"
+                 << " => " << op->name() << " [" << op->type() << "]";
+      op->set_output(0, next_output);
+      fused[next_idx] = true;
+      for (const auto& input : next.input()) {
+        readers[input].erase(next_idx);
+      }
+      for (const auto& input : op->input()) {
+        readers[input].insert(op_idx);
+      }
+      writers[next_output].erase(next_idx);
+      writers[output].erase(op_idx);
+      writers[next_output].insert(op_idx);
+    }
+  }
+
+  // Remove the fused operators.
+  GraphDef graph_v3(graph_v2);
+  graph_v3.clear_op();
+  for (int op_idx = 0; op_idx < graph_v2.op_size(); ++op_idx) {
+    if (fused[op_idx]) continue;
+    graph_v3.add_op()->CopyFrom(graph_v2.op(op_idx));
+  }
+  return graph_v3;
+}
+
+bool GraphOptimizer::FoldBatchNorm(
+    const Set<string>& written,
+    OperatorDef* op,
+    const OperatorDef& next) {
+  if (op->type() != "Conv" && op->type() != "Gemm") return false;
+  const auto* arg = GetArgument(next, "use_stats");
+  if (arg != nullptr && arg->i() == 0) return false;
+
+  // Check the constant parameters.
+  // The values are refolded by graph if sources are written elsewhere.
+  vector<Tensor*> params;
+  vector<string> names(op->input().begin() + 1, op->input().end());
+  names.insert(names.end(), next.input().begin() + 1, next.input().end());
+  for (const auto& name : names) {
+    auto* tensor = written.count(name) ? nullptr : ws_->TryGetTensor(name);
+    if (tensor == nullptr || !tensor->has_memory()) return false;
+    if (!tensor->IsType<float>()) return false;
+    params.push_back(tensor);
+  }
+  auto* B = op->input_size() > 2 ? params[1] : nullptr;
+  auto** bn_params = params.data() + params.size() - 4;
+
+  // Check the output channels of weight.
+  int64_t dims[3];
+  if (!GetFoldingDims(*op, next, params[0], dims)) return false;
+  if (B != nullptr && B->count() != dims[0]) return false;
+  for (int i = 0; i < 4; ++i) {
+    if (bn_params[i]->count() != dims[0]) return false;
+  }
+
+  Folding folding;
+  folding.op = *op, folding.next = next, folding.sources = names;
+  folding.weight = ws_->UniqueName(op->input(1), "/folded", "Fold", true);
+  folding.bias = ws_->UniqueName(next.input(2), "/folded", "Fold", true);
+  ComputeFolding(&folding);
+  op->set_input(1, folding.weight);
+  if (B != nullptr) {
+    op->set_input(2, folding.bias);
+  } else {
+    op->add_input(folding.bias);
+  }
+  if (op->type() == "Gemm") MutableArgument(op, "beta")->set_f(1.f);
+  foldings_.push_back(folding);
+  return true;
+}
+
+void GraphOptimizer::ComputeFolding(Folding* folding) {
+  const auto& op = folding->op;
+  const auto& next = folding->next;
+  vector<Tensor*> params;
+  folding->write_counts.clear();
+  for (const auto& name : folding->sources) {
+    params.push_back(ws_->GetTensor(name));
+    folding->write_counts.push_back(params.back()->write_count());
+  }
+  auto* W = params[0];
+  auto* B = op.input_size() > 2 ? params[1] : nullptr;
+  auto** bn_params = params.data() + params.size() - 4;
+  int64_t dims[3];
+  CHECK(GetFoldingDims(op, next, W, dims))
+      << "\nFailed to fold the parameters of " << op.name() << ".";
+  const auto C = dims[0], outer_dim = dims[1], inner_dim = dims[2];
+  const auto* arg = GetArgument(next, "epsilon");
+  const auto epsilon = arg ? arg->f() : 1e-5f;
+
+  // Fold the scale into weight and shift into bias.
+  // y = (x - mean) * gamma / sqrt(var + eps) + beta.
+  auto* gamma = bn_params[0]->data<float, CPUContext>();
+  auto* beta = bn_params[1]->data<float, CPUContext>();
+  auto* mean = bn_params[2]->data<float, CPUContext>();
+  auto* var = bn_params[3]->data<float, CPUContext>();
+  vector<float> scale(C);
+  for (int64_t j = 0; j < C; ++j) {
+    scale[j] = gamma[j] / std::sqrt(var[j] + epsilon);
+  }
+  auto* W_folded = ws_->CreateTensor(folding->weight)->ReshapeLike(*W);
+  auto* B_folded = ws_->CreateTensor(folding->bias)->Reshape({C});
+  auto* w = W->data<float, CPUContext>();
+  auto* w_folded = W_folded->mutable_data<float, CPUContext>();
+  for (int64_t i = 0; i < outer_dim; ++i) {
+    for (int64_t j = 0; j < C; ++j) {
+      for (int64_t k = 0; k < inner_dim; ++k) {
+        const auto index = (i * C + j) * inner_dim + k;
+        w_folded[index] = w[index] * scale[j];
+      }
+    }
+  }
+  float bias_scale = 1.f;
+  if (B != nullptr && op.type() == "Gemm") {
+    arg = GetArgument(op, "beta");
+    bias_scale = arg ? arg->f() : 1.f;
+  }
+  auto* b_folded = B_folded->mutable_data<float, CPUContext>();
+  for (int64_t j = 0; j < C; ++j) {
+    float bias = 0.f;
+    if (B != nullptr) bias = B->data<float, CPUContext>()[j];
+    b_folded[j] = (bias * bias_scale - mean[j]) * scale[j] + beta[j];
+  }
+}
+
+void GraphOptimizer::PlanLifetimes(
+    const GraphDef& graph,
+    Map<string, Block>& lifetimes) {
+  // The lifetime of an intermediate starts from the first writer,
+  // and ends at the last reader or writer in the sequential order.
+  Set<string> externals;
+  for (const auto& input : graph.input()) {
+    externals.insert(input);
+  }
+  for (const auto& output : graph.output()) {
+    externals.insert(output);
+  }
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    const auto& op = graph.op(op_idx);
+    for (const auto& in : op.input()) {
+      auto it = lifetimes.find(in);
+      if (it == lifetimes.end()) {
+        externals.insert(in); // Read before written.
+      } else {
+        it->second.end = op_idx;
+      }
+    }
+    for (const auto& out : op.output()) {
+      if (out.empty()) continue;
+      auto& block = lifetimes[out];
+      if (block.start < 0) block.start = op_idx;
+      block.end = op_idx;
+    }
+  }
+  for (const auto& name : externals) {
+    lifetimes.erase(name);
+  }
+}
+
+size_t GraphOptimizer::PlanOffsets(vector<Block*>& blocks, size_t alignment) {
+  auto aligned_size = [&](const Block* block) {
+    return (block->size + alignment - 1) / alignment * alignment;
+  };
+  // Place the larger blocks first, each into the best fitting gap
+  // between the placed blocks whose lifetimes are overlapped.
+  std::stable_sort(blocks.begin(), blocks.end(), [](Block* a, Block* b) {
+    return a->size > b->size;
+  });
+  size_t arena_size = 0;
+  vector<Block*> placed;
+  for (auto* block : blocks) {
+    const auto size = aligned_size(block);
+    vector<Block*> overlaps;
+    for (auto* other : placed) {
+      if (other->start <= block->end && block->start <= other->end) {
+        overlaps.push_back(other);
+      }
+    }
+    std::sort(overlaps.begin(), overlaps.end(), [](Block* a, Block* b) {
+      return a->offset < b->offset;
+    });
+    size_t offset = 0, best_offset = 0, best_gap = 0;
+    bool found = false;
+    for (auto* other : overlaps) {
+      if (other->offset >= offset + size) {
+        const auto gap = other->offset - offset;
+        if (!found || gap < best_gap) {
+          best_offset = offset, best_gap = gap, found = true;
+        }
+      }
+      offset = std::max(offset, other->offset + aligned_size(other));
+    }
+    block->offset = found ? best_offset : offset;
+    arena_size = std::max(arena_size, block->offset + size);
+    placed.push_back(block);
+  }
+  return arena_size;
+}
+
+void GraphOptimizer::PlanDependencies(
+    const GraphDef& graph,
+    const Map<string, Set<string>>& output_aliases,
+    vector<vec32_t>& op_childs) {
+  // The shared buffers and in-place outputs are reused by name,
+  // so the tensor-level DAG is extended with the write-after-read
+  // and write-after-write hazards to order the operators.
+  Map<string, int> last_writers;
+  Map<string, vec32_t> last_readers;
+  vector<Set<int>> op_parents(graph.op_size());
+  op_childs.assign(graph.op_size(), vec32_t());
+  // Collect the writes including the in-place aliases.
+  auto get_writes = [&](const OperatorDef& op) {
+    Set<string> writes;
+    for (const auto& out : op.output()) {
+      if (out.empty()) continue;
+      writes.insert(out);
+      const auto& it = output_aliases.find(out);
+      if (it == output_aliases.end()) continue;
+      for (const auto& alias : it->second) {
+        writes.insert(alias);
+      }
+    }
+    return writes;
+  };
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    const auto& op = graph.op(op_idx);
+    auto& parents = op_parents[op_idx];
+    auto writes = get_writes(op);
+    // Read after write.
+    for (const auto& in : op.input()) {
+      auto it = last_writers.find(in);
+      if (it != last_writers.end()) parents.insert(it->second);
+    }
+    // Write after read and write after write.
+    for (const auto& out : writes) {
+      auto it = last_writers.find(out);
+      if (it != last_writers.end()) parents.insert(it->second);
+      for (auto reader : last_readers[out]) {
+        parents.insert(reader);
+      }
+    }
+    parents.erase(op_idx);
+    for (const auto& in : op.input()) {
+      last_readers[in].push_back(op_idx);
+    }
+    for (const auto& out : writes) {
+      last_writers[out] = op_idx;
+      last_readers[out].clear();
+    }
+  }
+  for (int op_idx = 0; op_idx < graph.op_size(); ++op_idx) {
+    for (auto parent : op_parents[op_idx]) {
+      op_childs[parent].push_back(op_idx);
+    }
+  }
+}
+
 } // namespace dragon
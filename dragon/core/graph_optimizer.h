@@ -29,6 +29,20 @@ class GraphOptimizer {
     OperatorDef op_def;
   };
 
+  /*! \brief The memory block of tensors */
+  struct Block {
+    int start = -1, end = -1;
+    size_t size = 0, offset = 0;
+  };
+
+  /*! \brief The folded parameters of operator */
+  struct Folding {
+    OperatorDef op, next;
+    string weight, bias;
+    vector<string> sources;
+    vector<int64_t> write_counts;
+  };
+
   /*! \brief Default constructor */
   GraphOptimizer(Workspace* ws) : ws_(ws) {}
 
@@ -48,6 +62,32 @@ class GraphOptimizer {
   /*! \brief Eliminate the intermediate outputs */
   GraphDef EliminateIntermediates(const GraphDef& graph);
 
+  /*! \brief Eliminate the identity operators for inference */
+  GraphDef EliminateIdentities(const GraphDef& graph);
+
+  /*! \brief Fuse the bias, batchnorm and activation into producers */
+  GraphDef FuseOperators(const GraphDef& graph);
+
+  /*! \brief Compute the folded parameters from sources */
+  void ComputeFolding(Folding* folding);
+
+  /*! \brief Return the folded parameters */
+  vector<Folding>& foldings() {
+    return foldings_;
+  }
+
+  /*! \brief Plan the lifetime of intermediate outputs */
+  void PlanLifetimes(const GraphDef& graph, Map<string, Block>& lifetimes);
+
+  /*! \brief Plan the offset of memory blocks in an arena */
+  size_t PlanOffsets(vector<Block*>& blocks, size_t alignment);
+
+  /*! \brief Plan the operator dependencies for concurrent execution */
+  void PlanDependencies(
+      const GraphDef& graph,
+      const Map<string, Set<string>>& output_aliases,
+      vector<vec32_t>& op_childs);
+
  protected:
   /* \brief The graph workspace */
   Workspace* ws_;
@@ -61,7 +101,16 @@ class GraphOptimizer {
   /* \brief The inputs counter */
   Map<string, int> inputs_count_;
 
+  /* \brief The folded parameters */
+  vector<Folding> foldings_;
+
  private:
+  /*! \brief Fold the batchnorm into the producer */
+  bool FoldBatchNorm(
+      const Set<string>& written,
+      OperatorDef* op,
+      const OperatorDef& next);
+
   DISABLE_COPY_AND_ASSIGN(GraphOptimizer);
 };
 
@@ -6,13 +6,15 @@ namespace dragon {
 void UnifiedMemory::ToCPU(size_t size) {
   switch (state_) {
     case UNINITIALIZED:
-      cpu_ptr_ = CPUContext::New(size_);
+      cpu_pool_ = CPUMemoryPool::Current();
+      cpu_ptr_ = cpu_pool_->New(size_);
       CPUContext::Memset(size_, cpu_ptr_);
       state_ = STATE_AT_CPU;
       break;
     case STATE_AT_CUDA:
       if (cpu_ptr_ == nullptr) {
-        cpu_ptr_ = CPUContext::New(size_);
+        cpu_pool_ = CPUMemoryPool::Current();
+        cpu_ptr_ = cpu_pool_->New(size_);
       }
       CUDAContext::Memcpy<CPUContext, CUDAContext>(
           size > 0 ? size : size_, cpu_ptr_, cuda_ptr_, device_id_);
@@ -76,7 +78,7 @@ void UnifiedMemory::set_cpu_data(void* cpu_ptr, size_t size) {
     if (meta_.dtor()) {
       meta_.dtor()(cpu_ptr_, size_ / meta_.itemsize());
     }
-    CPUContext::Delete(cpu_ptr_);
+    cpu_pool_->Delete(cpu_ptr_);
   }
   size_ = size;
   cpu_ptr_ = cpu_ptr;
@@ -100,7 +102,7 @@ UnifiedMemory::~UnifiedMemory() {
     if (meta_.dtor()) {
       meta_.dtor()(cpu_ptr_, size_ / meta_.itemsize());
     }
-    CPUContext::Delete(cpu_ptr_);
+    cpu_pool_->Delete(cpu_ptr_);
   }
   if (own_cuda_ptr_ && cuda_ptr_) {
     CUDAContext::Delete(cuda_ptr_);
@@ -85,6 +85,11 @@ class DRAGON_API UnifiedMemory {
     return device_id_;
   }
 
+  /*! \brief Return whether the data is set from an external block */
+  bool external() const {
+    return state_ == STATE_AT_CUDA ? !own_cuda_ptr_ : !own_cpu_ptr_;
+  }
+
   /*! \brief Return the data info */
   Map<string, string> info() const;
 
@@ -130,6 +135,9 @@ class DRAGON_API UnifiedMemory {
   /*! \brief The cpu data pointer */
   void* cpu_ptr_ = nullptr;
 
+  /*! \brief The pool of cpu data */
+  shared_ptr<CPUMemoryPool> cpu_pool_;
+
   /*! \brief The cuda data pointer */
   void* cuda_ptr_ = nullptr;
 
@@ -138,6 +138,7 @@ class DRAGON_API Tensor {
 
   /*! \brief Map memory from a tensor */
   Tensor* MapFrom(Tensor* other, size_t offset = 0) {
+    write_count_++;
     if (other == nullptr) {
       if (mapped_memory_ != nullptr) {
         mapped_memory_ = nullptr;
@@ -212,6 +213,11 @@ class DRAGON_API Tensor {
     return version_;
   }
 
+  /*! \brief Return the number of mutable accesses */
+  int64_t write_count() const {
+    return write_count_;
+  }
+
   /*! \brief Return the number of elements */
   size_t size() const {
     return size_;
@@ -349,6 +355,7 @@ class DRAGON_API Tensor {
   void* raw_mutable_data() {
     CHECK_NE(meta_.id(), 0) << "\nTensor(" << name_ << "): unknown type, "
                             << "or does not have a type.";
+    write_count_++;
     void* data_ptr;
     raw_mutable_data<Context>(&data_ptr);
     if (data_ptr) return data_ptr;
@@ -390,6 +397,7 @@ class DRAGON_API Tensor {
   /*! \brief Set the managed memory */
   void set_memory(UnifiedMemory* memory) {
     if (memory != nullptr) {
+      write_count_++;
       if (memory != memory_.get()) {
         memory_.reset(memory);
       }
@@ -418,6 +426,9 @@ class DRAGON_API Tensor {
   /*! \brief The tensor version */
   int version_ = -1;
 
+  /*! \brief The number of mutable accesses */
+  int64_t write_count_ = 0;
+
   /*! \brief The dimensions */
   vec64_t dims_;
 
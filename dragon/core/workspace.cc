@@ -4,7 +4,9 @@
 
 namespace dragon {
 
-Workspace::Workspace(const string& name) : name_(name) {
+Workspace::Workspace(const string& name)
+    : name_(name), cpu_pool_(new CPUMemoryPool()) {
+  CPUMemoryPool::Guard guard(cpu_pool_.get());
   CreateTensor(""); // Empty placeholder
   CreateTensor("flagged/recomp")
       ->Reshape({})
@@ -40,7 +42,10 @@ void Workspace::Clear() {
     // Reset memory only to avoid the dangling pointer.
     it.second->Reset();
   }
+  // Release the cached cpu blocks
+  cpu_pool_->EmptyCache();
   // Reinitialize the tensor flags
+  CPUMemoryPool::Guard guard(cpu_pool_.get());
   GetTensor("flagged/recomp")
       ->Reshape({})
       ->mutable_data<bool, CPUContext>()[0] = false;
@@ -77,26 +82,38 @@ Tensor* Workspace::GetTensor(const string& name, bool external) const {
   return tensor;
 }
 
-void Workspace::RunOperator(const OperatorDef& def) {
+OperatorBase* Workspace::CreateOperator(const OperatorDef& def) {
+  CPUMemoryPool::Guard guard(cpu_pool_.get());
   string cache_key;
-  OperatorBase* execute_op = nullptr;
   if (!def.arg().empty()) {
     const auto& arg = *(def.arg().end() - 1);
     if (arg.name() == "cache_key") cache_key = arg.s();
   }
-  if (cache_key.empty()) {
-    execute_op = OperatorBase::New(def, this);
+  CHECK(!cache_key.empty()) << "\nExcepted the cache key of operator.";
+  OperatorBase* op = nullptr;
+  const auto& iter = operator_map_.find(cache_key);
+  if (iter == operator_map_.end()) {
+    op = OperatorBase::New(def, this);
+    operator_map_[cache_key] = unique_ptr<OperatorBase>(op);
+  } else {
+    op = iter->second.get();
+  }
+  return op->DeriveFrom(def);
+}
+
+void Workspace::RunOperator(const OperatorDef& def) {
+  CPUMemoryPool::Guard guard(cpu_pool_.get());
+  bool cached = false;
+  if (!def.arg().empty()) {
+    const auto& arg = *(def.arg().end() - 1);
+    cached = arg.name() == "cache_key" && !arg.s().empty();
+  }
+  if (cached) {
+    CreateOperator(def)->Run();
+  } else {
+    auto* execute_op = OperatorBase::New(def, this);
     execute_op->Run();
     delete execute_op;
-  } else {
-    const auto& iter = operator_map_.find(cache_key);
-    if (iter == operator_map_.end()) {
-      execute_op = OperatorBase::New(def, this);
-      operator_map_[cache_key] = unique_ptr<OperatorBase>(execute_op);
-    } else {
-      execute_op = iter->second.get();
-    }
-    execute_op->DeriveFrom(def)->Run();
   }
 }
 
@@ -117,6 +134,7 @@ void Workspace::RunGraph(
     const int stream) {
   CHECK(graph_map_.count(name))
       << "\nGraph " << name << " is not in current workspace.";
+  CPUMemoryPool::Guard guard(cpu_pool_.get());
   graph_map_[name]->Run(stream, include, exclude);
 }
 
@@ -57,6 +57,9 @@ class DRAGON_API Workspace {
   /*! \brief Return the tensor */
   Tensor* GetTensor(const string& name, bool external = true) const;
 
+  /*! \brief Create the operator cached by the key */
+  OperatorBase* CreateOperator(const OperatorDef& def);
+
   /*! \brief Run the operator */
   void RunOperator(const OperatorDef& def);
 
@@ -75,6 +78,11 @@ class DRAGON_API Workspace {
     return name_;
   }
 
+  /*! \brief Return the pool of cpu memory */
+  CPUMemoryPool* cpu_pool() const {
+    return cpu_pool_.get();
+  }
+
   /*! \brief Return the name of cached tensors */
   vector<string> tensors(bool external = true) const;
 
@@ -118,6 +126,9 @@ class DRAGON_API Workspace {
   /*! \brief The workspace name */
   string name_;
 
+  /*! \brief The pool of cpu memory */
+  shared_ptr<CPUMemoryPool> cpu_pool_;
+
   /*! \brief The unique indices */
   Map<string, Map<string, int64_t>> unique_index_map_;
 
@@ -17,6 +17,133 @@ inline string GetVerboseDef(const string& def_str, const string& type) {
   return type + " {" + str::replace_all(s, "\n", "\n  ") + "\n}\n";
 }
 
+inline Map<int, vector<string>> GetGradientBuckets(
+    Workspace* ws,
+    const GraphDef& graph_def,
+    const vector<string>& sources,
+    int64_t bucket_size) {
+  // Find the last op reading or writing each grad.
+  Map<string, int> last_users;
+  for (int i = 0; i < graph_def.op_size(); ++i) {
+    for (const auto& input : graph_def.op(i).input()) {
+      last_users[input] = i;
+    }
+    for (const auto& output : graph_def.op(i).output()) {
+      last_users[output] = i;
+    }
+  }
+  // Sort grads in the finished order, i.e., reverse-topological order.
+  vector<pair<int, string>> grads;
+  for (const auto& source : sources) {
+    const auto& iter = last_users.find(source + "_grad");
+    if (iter != last_users.end()) {
+      grads.emplace_back(iter->second, source);
+    }
+  }
+  std::sort(grads.begin(), grads.end());
+  // Cut the size-capped buckets.
+  Map<int, vector<string>> buckets;
+  vector<string> bucket;
+  int64_t bucket_bytes = 0;
+  for (int i = 0; i < grads.size(); ++i) {
+    auto* X = ws->TryGetTensor(grads[i].second);
+    bucket.emplace_back(grads[i].second + "_grad");
+    bucket_bytes += (X != nullptr ? X->nbytes() : 0);
+    if (bucket_bytes >= bucket_size || i == grads.size() - 1) {
+      auto& ready_bucket = buckets[grads[i].first];
+      ready_bucket.insert(ready_bucket.end(), bucket.begin(), bucket.end());
+      bucket.clear();
+      bucket_bytes = 0;
+    }
+  }
+  return buckets;
+}
+
+/*!
+ * \brief Run the bucket reductions on a communication thread.
+ */
+class BucketReducer {
+ public:
+  /*! \brief The stream to run the cuda reductions */
+  static const int kStream = 1;
+
+  explicit BucketReducer(Workspace* ws) : ws_(ws), stopped_(false) {}
+
+  ~BucketReducer() {
+    Wait();
+  }
+
+  /*! \brief Issue a reduction after the issued ones */
+  void Push(OperatorBase* op) {
+#ifdef USE_CUDA
+    const auto& device_option = op->def().device_option();
+    if (device_option.device_type() == PROTO_CUDA) {
+      // Create the stream resources before sharing them across threads.
+      auto& objects = CUDAContext::objects();
+      auto device_id = device_option.device_id();
+      objects.stream(device_id, kStream);
+      objects.cublas_handle(device_id, kStream);
+      objects.workspace(device_id, kStream);
+    }
+#endif
+    if (!worker_.joinable()) {
+      worker_ = std::thread([this]() { RunTasks(); });
+    }
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      ops_.push(op);
+    }
+    cond_.notify_one();
+  }
+
+  /*! \brief Wait for the issued reductions */
+  void Wait() {
+    if (!worker_.joinable()) return;
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      stopped_ = true;
+    }
+    cond_.notify_one();
+    worker_.join();
+  }
+
+ private:
+  void RunTasks() {
+    CPUMemoryPool::Guard guard(ws_->cpu_pool());
+    std::unique_lock<std::mutex> lock(mutex_);
+    while (true) {
+      cond_.wait(lock, [&]() { return stopped_ || !ops_.empty(); });
+      if (ops_.empty()) return;
+      auto* op = ops_.front();
+      ops_.pop();
+      lock.unlock();
+#ifdef USE_CUDA
+      const auto& device_option = op->def().device_option();
+      if (device_option.device_type() == PROTO_CUDA) {
+        // Wait for the grads computed on the default stream.
+        auto& objects = CUDAContext::objects();
+        auto device_id = device_option.device_id();
+        CUDAContext::SynchronizeStream(objects.stream(device_id, 0));
+        op->Run(kStream);
+        CUDAContext::SynchronizeStream(objects.stream(device_id, kStream));
+      } else {
+        op->Run();
+      }
+#else
+      op->Run();
+#endif
+      lock.lock();
+    }
+  }
+
+  Workspace* ws_;
+  bool stopped_;
+  std::mutex mutex_;
+  std::condition_variable cond_;
+  std::queue<OperatorBase*> ops_;
+  std::thread worker_;
+};
+
 PYBIND11_MODULE(libdragon_python, m) {
   /*! \brief Workspace class */
   py::class_<Workspace>(m, "Workspace")
@@ -75,6 +202,16 @@ PYBIND11_MODULE(libdragon_python, m) {
             return size;
           })
 
+      /*! \brief Return the size of memory cached by pool on given device */
+      .def(
+          "MemoryCached",
+          [](Workspace* self, const string& device_type, int device_id) {
+            if (device_type == "cpu") {
+              return self->cpu_pool()->cached_bytes();
+            }
+            return size_t(0);
+          })
+
       /*! \brief Run the operator */
       .def(
           "RunOperator",
@@ -156,18 +293,59 @@ PYBIND11_MODULE(libdragon_python, m) {
              const vector<string>& targets,
              const vector<string>& grad_grads,
              const vector<string>& sources,
+             const vector<string>& reduce_sources,
+             const OperatorDef* reduce_def,
+             int64_t bucket_size,
              bool optimize,
              bool verbose) {
             GradientTape tape;
             tape.CreateGradientDefs(op_defs, targets, grad_grads);
             py::gil_scoped_release g;
             if (optimize) tape.Optimize(sources);
-            for (const auto& op : tape.def().op()) {
+            Map<int, vector<string>> buckets;
+            if (reduce_def != nullptr) {
+              buckets = GetGradientBuckets(
+                  self, tape.def(), reduce_sources, bucket_size);
+            }
+            int num_buckets = 0;
+            // Reduce the buckets while running the remaining ops.
+            BucketReducer reducer(self);
+            for (int i = 0; i < tape.def().op_size(); ++i) {
+              const auto& op = tape.def().op(i);
               if (verbose) {
                 PRINT(INFO) << GetVerboseDef(op.DebugString(), "op");
               }
               self->RunOperator(op);
+              // Reduce the bucket once its grads are finished.
+              const auto& iter = buckets.find(i);
+              if (iter != buckets.end()) {
+                OperatorDef bucket_def(*reduce_def);
+                auto* device_option = bucket_def.mutable_device_option();
+                device_option->CopyFrom(op.device_option());
+                for (const auto& grad : iter->second) {
+                  bucket_def.add_input(grad);
+                  bucket_def.add_output(grad);
+                }
+                // Each bucket holds an operator to run concurrently.
+                int64_t group = 0;
+                for (const auto& arg : reduce_def->arg()) {
+                  if (arg.name() == "group") group = arg.i();
+                }
+                auto* cache_arg = bucket_def.add_arg();
+                cache_arg->set_name("cache_key");
+                cache_arg->set_s(
+                    bucket_def.type() + "/" +
+                    str::to(device_option->device_type()) + ":" +
+                    str::to(device_option->device_id()) + "/" +
+                    str::to(group) + "/" + str::to(num_buckets++));
+                if (verbose) {
+                  PRINT(INFO) << GetVerboseDef(bucket_def.DebugString(), "op");
+                }
+                reducer.Push(self->CreateOperator(bucket_def));
+              }
             }
+            // Finish the reductions before the optimizer updates.
+            reducer.Wait();
           })
 
       /*! \brief Load tensors and graph from a ONNX model */
@@ -52,7 +52,8 @@ void RegisterModule_mpi(py::module& m) {
       CHECK_EQ(thread_type, MPI_THREAD_MULTIPLE)
           << "\nRequire to enable <MPI_THREAD_MULTIPLE> support.";
     } else {
-      MPI_Init_thread(NULL, NULL, MPI_THREAD_SINGLE, &thread_type);
+      // The bucket reductions are called from a communication thread.
+      MPI_Init_thread(NULL, NULL, MPI_THREAD_SERIALIZED, &thread_type);
     }
 #else
     LOG(FATAL) << "MPI was not compiled.";
@@ -32,6 +32,11 @@ void RegisterModule_sysconfig(py::module& m) {
   /*! \brief Return the number of threads for cpu parallelism */
   m.def("GetNumThreads", []() { return Eigen::nbThreads(); });
 
+  /*! \brief Set the max number of bytes cached by cpu memory pools */
+  m.def("SetCPUMemoryCacheLimit", [](size_t limit) {
+    CPUMemoryPool::set_cache_limit(limit);
+  });
+
   m.def("GetBuildInformation", []() {
     static string build_info;
     if (!build_info.empty()) {
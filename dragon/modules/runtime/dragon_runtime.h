@@ -75,11 +75,17 @@ DRAGON_API void DestroyWorkspace(const std::string& name);
  * Graph API
  */
 
-DRAGON_API std::string
-CreateGraph(const GraphDef_t def, const Device& device, Workspace_t ws);
+DRAGON_API std::string CreateGraph(
+    const GraphDef_t def,
+    const Device& device,
+    Workspace_t ws,
+    int optimization = -1);
 
-DRAGON_API std::string
-CreateGraph(const std::string& file, const Device& device, Workspace_t ws);
+DRAGON_API std::string CreateGraph(
+    const std::string& file,
+    const Device& device,
+    Workspace_t ws,
+    int optimization = -1);
 
 DRAGON_API void
 RunGraph(const std::string& name, Workspace_t ws, int stream = 0);
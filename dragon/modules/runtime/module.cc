@@ -63,21 +63,40 @@ void DestroyWorkspace(Workspace_t ws) {
   return DestroyWorkspace(ws->name());
 }
 
-string CreateGraph(const GraphDef_t def, const Device& device, Workspace_t ws) {
+string CreateGraph(
+    const GraphDef_t def,
+    const Device& device,
+    Workspace_t ws,
+    int optimization) {
   auto def_v2(*def);
   auto* device_option = def_v2.mutable_device_option();
   device_option->set_device_type((DeviceTypeProto)device.device_type());
   device_option->set_device_id(device.device_id());
+  if (optimization >= 0) {
+    // Override the optimization level of given def.
+    Argument* arg = nullptr;
+    for (auto& graph_arg : *def_v2.mutable_arg()) {
+      if (graph_arg.name() == "optimization") arg = &graph_arg;
+    }
+    if (arg == nullptr) {
+      arg = def_v2.add_arg();
+      arg->set_name("optimization");
+    }
+    arg->set_i(optimization);
+  }
   auto* graph = ws->CreateGraph(def_v2);
   if (!graph) LOG(FATAL) << "Can not create the graph.";
   return graph->name();
 }
 
-std::string
-CreateGraph(const string& file, const Device& device, Workspace_t ws) {
+std::string CreateGraph(
+    const string& file,
+    const Device& device,
+    Workspace_t ws,
+    int optimization) {
   GraphDef graph_def;
   ParseProtoFromText(file.c_str(), &graph_def);
-  return CreateGraph(&graph_def, device, ws);
+  return CreateGraph(&graph_def, device, ws, optimization);
 }
 
 void RunGraph(const string& name, Workspace_t ws, int stream) {
@@ -122,6 +122,41 @@ void CollectiveOp<Context>::DoRunWithType() {
   }
 }
 
+template <class Context>
+void CollectiveOp<Context>::RunCoalesced() {
+  int64_t count = 0;
+  for (int i = 0; i < InputSize(); ++i) {
+    CHECK(Input(i).meta() == Input(0).meta())
+        << "\nCoalesced tensors should have the same data type.";
+    count += Input(i).count();
+  }
+  // Gather tensors into the buffer.
+  auto* buffer = ctx()->workspace()->CreateTensor("shared/buffer/collective");
+  buffer->Reshape({count})->set_meta(Input(0).meta());
+  auto* data = (uint8_t*)buffer->template raw_mutable_data<Context>();
+  size_t offset = 0;
+  for (int i = 0; i < InputSize(); ++i) {
+    auto& X = Input(i);
+    ctx()->template MemcpyAsync<Context, Context>(
+        X.nbytes(), data + offset, X.template raw_data<Context>());
+    offset += X.nbytes();
+  }
+  // Run the collective once.
+  ctx()->FinishDeviceComputation();
+  src_tensor_ = buffer;
+  DispatchHelper<dtypes::Numerical>::Call(this, *src_tensor_);
+  src_tensor_ = nullptr, dest_tensor_ = buffer;
+  DispatchHelper<dtypes::Numerical>::Call(this, *dest_tensor_);
+  // Scatter the buffer back to tensors.
+  offset = 0;
+  for (int i = 0; i < InputSize(); ++i) {
+    auto& X = Input(i);
+    ctx()->template MemcpyAsync<Context, Context>(
+        X.nbytes(), X.template raw_mutable_data<Context>(), data + offset);
+    offset += X.nbytes();
+  }
+}
+
 template <class Context>
 void CollectiveOp<Context>::RunOnDevice() {
   if (comm_size_ <= 1) return;
@@ -129,6 +164,10 @@ void CollectiveOp<Context>::RunOnDevice() {
   // Otherwise, data corruption will happen through UVA
   // during executing collectives asynchronously.
   ctx()->FinishDeviceComputation();
+  if (coalesce_ > 0 && InputSize() > 1) {
+    RunCoalesced();
+    return;
+  }
   for (int i = 0; i < InputSize(); i++) {
     src_tensor_ = &Input(i);
     DispatchHelper<dtypes::Numerical>::Call(this, *src_tensor_);
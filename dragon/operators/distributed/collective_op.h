@@ -25,12 +25,15 @@ class CollectiveOp final : public CollectiveOpBase<Context> {
   CollectiveOp(const OperatorDef& def, Workspace* ws)
       : CollectiveOpBase<Context>(def, ws),
         communication_(OP_SINGLE_ARG(string, "communication", "")),
-        operation_(OP_SINGLE_ARG(string, "operation", "MEAN")) {}
+        operation_(OP_SINGLE_ARG(string, "operation", "MEAN")),
+        coalesce_(OP_SINGLE_ARG(int64_t, "coalesce", 0)) {}
   USE_OPERATOR_FUNCTIONS;
   USE_COLLECTIVE_FUNCTIONS;
 
   void RunOnDevice() override;
 
+  void RunCoalesced();
+
   template <typename T>
   void AllReduceMPI();
 
@@ -48,6 +51,7 @@ class CollectiveOp final : public CollectiveOpBase<Context> {
 
  protected:
   string communication_, operation_;
+  int64_t coalesce_;
   Tensor *src_tensor_, *dest_tensor_;
 };
 
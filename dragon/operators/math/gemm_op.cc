@@ -1,6 +1,7 @@
 #include "dragon/operators/math/gemm_op.h"
 #include "dragon/core/workspace.h"
 #include "dragon/utils/math_functions.h"
+#include "dragon/utils/op_kernels.h"
 
 namespace dragon {
 
@@ -67,6 +68,11 @@ void GemmOp<Context>::DoRunWithType() {
       InputSize() > 2 ? beta_ : 0.f,
       Y->Reshape(Y_dims)->template mutable_data<T, Context>(),
       ctx());
+
+  if (activation_ == "Relu") {
+    auto* y = Y->template mutable_data<T, Context>();
+    kernels::Relu(Y->count(), 0.f, y, y, ctx());
+  }
 }
 
 template <class Context>
@@ -26,7 +26,8 @@ class GemmOp final : public Operator<Context> {
         alpha_(OP_SINGLE_ARG(float, "alpha", 1.f)),
         beta_(OP_SINGLE_ARG(float, "beta", 1.f)),
         transA_(OP_SINGLE_ARG(int64_t, "transA", 0)),
-        transB_(OP_SINGLE_ARG(int64_t, "transB", 0)) {}
+        transB_(OP_SINGLE_ARG(int64_t, "transB", 0)),
+        activation_(OP_SINGLE_ARG(string, "activation", "")) {}
   USE_OPERATOR_FUNCTIONS;
 
   void RunOnDevice() override;
@@ -37,6 +38,7 @@ class GemmOp final : public Operator<Context> {
  protected:
   float alpha_, beta_;
   int64_t n_, transA_, transB_;
+  string activation_;
 };
 
 template <class Context>
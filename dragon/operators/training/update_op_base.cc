@@ -13,10 +13,23 @@ float UpdateOpBase<Context>::Hyper(const string& name) {
 
 template <class Context>
 Tensor* UpdateOpBase<Context>::Slot(const string& name) {
+  if (input_index_ < 0) {
+    auto* slot = workspace()->CreateTensor(handle() + "/flat/" + name);
+    if (std::find(flat_slots_.begin(), flat_slots_.end(), slot) ==
+        flat_slots_.end()) {
+      flat_slots_.push_back(slot);
+    }
+    return slot;
+  }
   const string& var_name = Output(input_index_)->name();
   return workspace()->CreateTensor(handle() + "/" + var_name + "/" + name);
 }
 
+template <class Context>
+string UpdateOpBase<Context>::FlatName(const string& name) {
+  return handle() + "/flat/" + name + ":" + str::to(flat_index_);
+}
+
 template <class Context>
 template <typename T>
 void UpdateOpBase<Context>::AdjustGradient(Tensor* dX, Tensor* X) {
@@ -28,9 +41,15 @@ void UpdateOpBase<Context>::AdjustGradient(Tensor* dX, Tensor* X) {
   // Clip
   if (clip_norm_ > 0.f) {
     auto* dx = dX->template mutable_data<T, Context>();
-    auto norm = std::sqrt(math::Dot(dX->count(), dx, dx, ctx()));
-    if (norm > clip_norm_) {
-      math::Scale(dX->count(), clip_norm_ / norm, dx, dx, ctx());
+    // Clip each gradient of the flat buffer separately.
+    auto counts = input_index_ < 0 ? flat_counts_ : vec64_t({dX->count()});
+    auto offsets = input_index_ < 0 ? flat_offsets_ : vec64_t({0});
+    for (int i = 0; i < counts.size(); ++i) {
+      auto* data = dx + offsets[i];
+      auto norm = std::sqrt(math::Dot(counts[i], data, data, ctx()));
+      if (norm > clip_norm_) {
+        math::Scale(counts[i], clip_norm_ / norm, data, data, ctx());
+      }
     }
   }
   // Penalty
@@ -55,9 +74,99 @@ void UpdateOpBase<Context>::ApplyUpdate(Tensor* dX, Tensor* X) {
       ctx());
 }
 
+template <class Context>
+void UpdateOpBase<Context>::RunOnFlat() {
+  // Params and grads are the views into the flat buffers.
+  // Each segment is aligned to 256 bytes for the vectorized kernels.
+  const int64_t kAlignment = 64;
+  vec64_t counts;
+  for (int i = 0; i < InputSize(); ++i) {
+    auto &dX = Input(i), *X = Output(i);
+    CHECK(dX.dims() == X->dims())
+        << "\nParam and grad should have the same dimensions."
+        << "\nGot" << X->DimString() << " and " << dX.DimString();
+    counts.push_back(dX.count());
+  }
+  // Allocate the buffers once the layout of group changed.
+  // The previous buffers are kept until the views are gathered.
+  Tensor* prev_buffers[2] = {nullptr, nullptr};
+  bool relayout = counts != flat_counts_;
+  if (relayout) {
+    for (auto* slot : flat_slots_) {
+      slot->Reset();
+    }
+    flat_counts_ = counts;
+    flat_offsets_.clear();
+    flat_size_ = 0;
+    for (auto count : counts) {
+      flat_offsets_.push_back(flat_size_);
+      flat_size_ += (count + kAlignment - 1) / kAlignment * kAlignment;
+    }
+    flat_memories_.assign(counts.size() * 2, nullptr);
+    if (flat_size_ > 0) {
+      prev_buffers[0] = workspace()->TryGetTensor(FlatName("grad"));
+      prev_buffers[1] = workspace()->TryGetTensor(FlatName("param"));
+      flat_index_ ^= 1;
+    }
+  }
+  if (flat_size_ == 0) return;
+  auto* dX_flat = workspace()->CreateTensor(FlatName("grad"));
+  auto* X_flat = workspace()->CreateTensor(FlatName("param"));
+  float* buffers[2] = {
+      dX_flat->Reshape({flat_size_})->template mutable_data<float, Context>(),
+      X_flat->Reshape({flat_size_})->template mutable_data<float, Context>()};
+  if (relayout) {
+    // Zero the paddings to keep them unchanged by the update.
+    math::Set(flat_size_, 0.f, buffers[0], ctx());
+    math::Set(flat_size_, 0.f, buffers[1], ctx());
+  }
+  // Gather the tensors leaving the buffers, e.g., the reset grads.
+  for (int i = 0; i < InputSize(); ++i) {
+    if (counts[i] == 0) continue;
+    Tensor* tensors[2] = {&Input(i), Output(i)};
+    for (int j = 0; j < 2; ++j) {
+      auto* X = tensors[j];
+      auto* memory = X->memory();
+      if (memory != nullptr && memory == flat_memories_[i * 2 + j] &&
+          memory->external()) {
+        continue;
+      }
+      auto* data = buffers[j] + flat_offsets_[i];
+      math::Copy(counts[i], X->template data<float, Context>(), data, ctx());
+      memory = new UnifiedMemory(X->meta(), X->nbytes());
+      if (std::is_same<Context, CPUContext>::value) {
+        memory->set_cpu_data(data, X->nbytes());
+      } else {
+        memory->set_cuda_data(data, X->nbytes(), ctx()->device());
+      }
+      X->set_memory(memory);
+      flat_memories_[i * 2 + j] = memory;
+    }
+  }
+  for (auto* buffer : prev_buffers) {
+    if (buffer != nullptr) buffer->Reset();
+  }
+  // Update the flat buffers once.
+  input_index_ = -1;
+  AdjustGradient<float>(dX_flat, X_flat);
+  ComputeUpdate(dX_flat, X_flat);
+  ApplyUpdate<float>(dX_flat, X_flat);
+}
+
 template <class Context>
 void UpdateOpBase<Context>::RunOnDevice() {
   GetArguments();
+  if (flat_ > 0) {
+    // Update the non-float32 groups tensor by tensor.
+    bool is_float32 = true;
+    for (int i = 0; i < InputSize(); ++i) {
+      if (!Input(i).template IsType<float>()) is_float32 = false;
+    }
+    if (is_float32) {
+      RunOnFlat();
+      return;
+    }
+  }
   for (int i = 0; i < InputSize(); ++i) {
     auto &dX = Input(i), *X = Output(i);
     if (dX.count() == 0 || X->count() == 0) return;
@@ -21,7 +21,10 @@ template <class Context>
 class UpdateOpBase : public Operator<Context> {
  public:
   UpdateOpBase(const OperatorDef& def, Workspace* ws)
-      : Operator<Context>(def, ws) {}
+      : Operator<Context>(def, ws),
+        flat_(OP_SINGLE_ARG(int64_t, "flat", 0)),
+        flat_index_(0),
+        flat_size_(0) {}
   USE_OPERATOR_FUNCTIONS;
 
   virtual void GetArguments() {
@@ -35,6 +38,8 @@ class UpdateOpBase : public Operator<Context> {
 
   void RunOnDevice() override;
 
+  void RunOnFlat();
+
   virtual void ComputeUpdate(Tensor* dX, Tensor* X) = 0;
 
   template <typename T>
@@ -47,9 +52,14 @@ class UpdateOpBase : public Operator<Context> {
 
   Tensor* Slot(const string& name);
 
+  string FlatName(const string& name);
+
  protected:
-  int64_t input_index_;
+  int64_t flat_, flat_index_, flat_size_, input_index_;
   float scale_, clip_norm_, weight_decay_;
+  vec64_t flat_counts_, flat_offsets_;
+  vector<Tensor*> flat_slots_;
+  vector<UnifiedMemory*> flat_memories_;
 };
 
 #define USE_UPDATE_FUNCTIONS          \
@@ -1,6 +1,7 @@
 #include "dragon/operators/vision/conv_op.h"
 #include "dragon/core/workspace.h"
 #include "dragon/operators/vision/conv_op_impl.h"
+#include "dragon/utils/op_kernels.h"
 
 namespace dragon {
 
@@ -23,6 +24,10 @@ void ConvOp<Context>::DoRunWithType() {
     INITIALIZE_TENSOR_VIA_SPEC(Input(2), b_shape_, T);
     AddBias(Input(2).template data<T, Context>(), y);
   }
+
+  if (activation_ == "Relu") {
+    kernels::Relu(Y->count(), 0.f, y, y, ctx());
+  }
 }
 
 template <class Context>
@@ -22,7 +22,8 @@ template <class Context>
 class ConvOp final : public ConvOpBase<Context> {
  public:
   explicit ConvOp(const OperatorDef& def, Workspace* ws)
-      : ConvOpBase<Context>(def, ws) {
+      : ConvOpBase<Context>(def, ws),
+        activation_(OP_SINGLE_ARG(string, "activation", "")) {
     GetBaseArguments();
   }
   USE_OPERATOR_FUNCTIONS;
@@ -37,6 +38,8 @@ class ConvOp final : public ConvOpBase<Context> {
   bool HasBias() override {
     return InputSize() > 2;
   }
+
+  string activation_;
 };
 
 template <class Context>
@@ -48,6 +48,7 @@ from dragon.core.autograph.context import graph_mode
 from dragon.core.autograph.function_impl import function
 from dragon.core.framework.backend import load_library
 from dragon.core.framework.config import get_num_threads
+from dragon.core.framework.config import set_cpu_memory_cache_limit
 from dragon.core.framework.config import set_num_threads
 from dragon.core.framework.context import device
 from dragon.core.framework.context import name_scope
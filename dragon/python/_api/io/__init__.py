@@ -16,6 +16,8 @@ from __future__ import print_function as _print_function
 from dragon.core.io.kpl_record import KPLRecordDataset
 from dragon.core.io.kpl_record import KPLRecordWriter
 from dragon.core.io.reader import DataReader
+from dragon.core.io.tf_record import ParallelRecordWriter
+from dragon.core.io.tf_record import TFRecordDataset
 from dragon.core.io.tf_record import TFRecordExample
 from dragon.core.io.tf_record import TFRecordWriter
 
@@ -15,6 +15,7 @@ from __future__ import print_function as _print_function
 
 # Classes
 from dragon.vm.onnx.core.backend.native import BackendRep
+from dragon.vm.onnx.core.backend.serving import ServingRep
 
 # Functions
 from dragon.vm.onnx.core.backend.native import prepare as prepare_backend
@@ -30,6 +30,14 @@ def set_optimization(level=1):
 
     * level = ``3``: Allocate the shared buffer to outputs if available.
 
+    * level = ``4``: Fuse the inference operators in the ``TEST`` phase.
+
+    * level = ``5``: Plan the intermediates into an arena in the ``TEST`` phase.
+
+    At level ``4``, batchnorm parameters are folded into copies of the producer weights
+    when the graph is created, and refolded before a run if the source tensors were written.
+    Writes through the shared numpy arrays are not tracked.
+
     Parameters
     ----------
     level : int, optional, default=3
@@ -42,18 +50,30 @@ def set_optimization(level=1):
 def set_scheduler(scheduler='SIMPLE'):
     """Set the scheduler for symbolic graph.
 
+    Following schedulers are defined (default='SIMPLE'):
+
+    * scheduler = ``SIMPLE``: Execute operators sequentially.
+
+    * scheduler = ``FUSION``: Fuse operators into the kernels.
+
+    * scheduler = ``DAG``: Execute independent cpu operators concurrently.
+
+    Threads of ``DAG`` scheduler are set by ``dragon.set_num_threads(...)``.
+
     Parameters
     ----------
-    scheduler : {'SIMPLE', 'FUSION'}, optional
+    scheduler : {'SIMPLE', 'FUSION', 'DAG'}, optional
         The scheduler type.
 
     """
-    if scheduler not in ('SIMPLE', 'FUSION'):
+    if scheduler not in ('SIMPLE', 'FUSION', 'DAG'):
         raise ValueError('Unsupported scheduler: ' + scheduler)
     if scheduler == 'SIMPLE':
         config.config().graph_type = ''
     elif scheduler == 'FUSION':
         config.config().graph_type = 'FusionGraph'
+    elif scheduler == 'DAG':
+        config.config().graph_type = 'DAG'
 
 
 def set_verbosity(level=1):
@@ -83,7 +83,8 @@ def class_method_to_instance_method(original_function, instance):
         original_function.python_function,
         type(original_function)(
             decorator.make_decorator(bound_method, bound_method_wrapper),
-            input_signature=original_function.input_signature),
+            input_signature=original_function.input_signature,
+            **getattr(original_function, 'cache_options', {})),
     )
 
 
@@ -159,38 +160,73 @@ class FunctionSpec(object):
         return inputs, kwargs
 
 
+class ConcreteFunction(object):
+    """Graphs traced for a specific input signature."""
+
+    def __init__(self, inputs, outputs, graphs):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.graphs = graphs
+
+    def __call__(self, values):
+        """Feed the values and run the graphs."""
+        for input, value in zip(self.inputs, values):
+            input._impl.FromNumpy(value)
+        for graph in self.graphs:
+            graph.run()
+        outputs = []
+        for output in self.outputs:
+            if isinstance(output, Tensor):
+                device = device_spec.DeviceSpec(*output._impl.device)
+                outputs.append(Tensor(impl=output._impl, device=device))
+            else:
+                outputs.append(output)
+        return outputs[0] if len(outputs) == 1 else outputs
+
+
 class FunctionGuard(object):
     """Map a python function to callable graphs."""
 
-    def __init__(self, python_function, input_signature=None):
+    CacheInfo = collections.namedtuple(
+        'CacheInfo', ['hits', 'misses', 'retraces', 'maxsize', 'currsize'])
+
+    def __init__(
+        self,
+        python_function,
+        input_signature=None,
+        max_cache_size=32,
+        relax_shapes_after=3,
+    ):
         self._python_function = python_function
         self._spec = FunctionSpec.from_function_and_signature(
             python_function, input_signature)
-        self._graphs = dict()
-        self._inputs = collections.defaultdict(list)
-        self._outputs = collections.defaultdict(list)
-        self._output_indices = collections.defaultdict(list)
+        self._max_cache_size = max_cache_size
+        self._relax_shapes_after = relax_shapes_after
+        self._function_cache = collections.OrderedDict()
+        self._relaxed_keys = dict()
+        self._shape_history = collections.defaultdict(list)
+        self._last_functions = dict()
+        self._num_traces = collections.defaultdict(int)
+        self._hits, self._misses, self._retraces = 0, 0, 0
         self._descriptor_cache = weakref.WeakKeyDictionary()
 
     @property
-    def graphs(self):
-        """Return the graphs."""
-        return self._graphs.get(id(workspace.get_workspace()), None)
+    def cache_options(self):
+        """Return the options of function cache."""
+        return {'max_cache_size': self._max_cache_size,
+                'relax_shapes_after': self._relax_shapes_after}
 
-    @graphs.setter
-    def graphs(self, value):
-        """Set the graphs."""
-        self._graphs[id(workspace.get_workspace())] = value
+    @property
+    def graphs(self):
+        """Return the graphs of last called function."""
+        function = self._last_functions.get(id(workspace.get_workspace()))
+        return function.graphs if function else None
 
     @property
     def inputs(self):
-        """Return the inputs."""
-        return self._inputs.get(id(workspace.get_workspace()), None)
-
-    @inputs.setter
-    def inputs(self, value):
-        """Set the inputs."""
-        self._inputs[id(workspace.get_workspace())] = value
+        """Return the inputs of last called function."""
+        function = self._last_functions.get(id(workspace.get_workspace()))
+        return function.inputs if function else None
 
     @property
     def input_signature(self):
@@ -199,73 +235,143 @@ class FunctionGuard(object):
 
     @property
     def outputs(self):
-        """Return the outputs."""
-        return self._outputs.get(id(workspace.get_workspace()), None)
-
-    @outputs.setter
-    def outputs(self, value):
-        """Set the outputs."""
-        self._outputs[id(workspace.get_workspace())] = value
+        """Return the outputs of last called function."""
+        function = self._last_functions.get(id(workspace.get_workspace()))
+        return function.outputs if function else None
 
     @property
     def python_function(self):
         """Return the python function."""
         return self._python_function
 
+    def cache_info(self):
+        """Return the statistics of function cache.
+
+        Returns
+        -------
+        CacheInfo
+            The number of hits, misses, retraces and cached functions.
+
+        """
+        return self.CacheInfo(self._hits, self._misses, self._retraces,
+                              self._max_cache_size, len(self._function_cache))
+
+    def clear_cache(self):
+        """Clear the cached functions and statistics."""
+        self._function_cache.clear()
+        self._relaxed_keys.clear()
+        self._shape_history.clear()
+        self._last_functions.clear()
+        self._num_traces.clear()
+        self._hits, self._misses, self._retraces = 0, 0, 0
+
     def __call__(self, *args, **kwargs):
         """Call the compiled graphs."""
-        if self.graphs is None:
-            # Graphs are not created on the first call.
-            # Compile from the python function.
-            inputs = []
-            input_signature = self.input_signature
-            for i in range(self._spec.num_inputs):
-                name, shape, dtype = 'Input:%d' % i, None, None
-                if input_signature is not None:
-                    if i >= len(input_signature):
-                        raise ValueError(
-                            'When <input_signature> is provided, '
-                            'only define arguments covered by it.\n'
-                            'Got %d signature(s) and %d argument(s).'
-                            % (len(input_signature), self._spec.num_inputs))
-                    shape = input_signature[i].shape
-                    dtype = input_signature[i].dtype
-                inputs.append(Tensor(shape, dtype, name, symbolic=True))
-            _, kwargs = self._spec.separate_inputs(*args, **kwargs)
-            with eager_context.graph_mode():
-                returns = nest.flatten(self._python_function(*inputs, **kwargs))
-            outputs, dummies, graphs = [], [], []
-            for obj in returns:
-                if isinstance(obj, Tensor):
-                    outputs.append(obj)
-                else:
-                    dummies.append(obj)
-            if len(outputs) > 0:
-                graphs.append(GraphLib.from_outputs(outputs))
-            for obj in dummies:
-                if isinstance(obj, GraphExecutionContext):
-                    graphs.append(obj)
-            self.inputs = inputs
-            self.outputs = returns
-            self.graphs = graphs
-        # In this case, we have compiled graphs.
-        inputs, _ = self._spec.separate_inputs(*args, **kwargs)
-        for input, value in zip(self.inputs, inputs):
+        inputs, extra_kwargs = self._spec.separate_inputs(*args, **kwargs)
+        values = []
+        for value in inputs[:self._spec.num_inputs]:
             if hasattr(value, 'numpy'):
                 value = value.numpy()
             else:
                 value = numpy.array(value, copy=False)
-            input._impl.FromNumpy(value)
-        for graph in self.graphs:
-            graph.run()
-        outputs = []
-        for output in self.outputs:
-            if isinstance(output, Tensor):
-                device = device_spec.DeviceSpec(*output._impl.device)
-                outputs.append(Tensor(impl=output._impl, device=device))
+            values.append(value)
+        ws_id = id(workspace.get_workspace())
+        kwargs_key = _make_hashable(extra_kwargs)
+        if self.input_signature is not None:
+            shapes = dtypes = None
+        else:
+            shapes = tuple(value.shape for value in values)
+            dtypes = tuple(str(value.dtype) for value in values)
+        key = (ws_id, kwargs_key, shapes, dtypes)
+        function = self._lookup(key)
+        if function is None:
+            self._misses += 1
+            if self._num_traces[ws_id] > 0:
+                self._retraces += 1
+            self._num_traces[ws_id] += 1
+            if shapes is not None:
+                key = self._maybe_relax(key)
+            function = self._trace(key[2], key[3], extra_kwargs)
+            self._insert(key, function)
+        else:
+            self._hits += 1
+        self._last_functions[ws_id] = function
+        return function(values)
+
+    def _insert(self, key, function):
+        """Insert a function and evict the least recently used."""
+        self._function_cache[key] = function
+        while len(self._function_cache) > self._max_cache_size:
+            self._function_cache.popitem(last=False)
+
+    def _lookup(self, key):
+        """Return the cached function that is compatible with key."""
+        function = self._function_cache.get(key, None)
+        if function is not None:
+            self._function_cache.move_to_end(key)
+            return function
+        if key[2] is None:
+            return None
+        relaxed_key = self._relaxed_keys.get(_family_key(key), None)
+        if relaxed_key is None or relaxed_key not in self._function_cache:
+            return None
+        for shape, relaxed_shape in zip(key[2], relaxed_key[2]):
+            if len(shape) != len(relaxed_shape):
+                return None
+            for dim, relaxed_dim in zip(shape, relaxed_shape):
+                if relaxed_dim is not None and dim != relaxed_dim:
+                    return None
+        self._function_cache.move_to_end(relaxed_key)
+        return self._function_cache[relaxed_key]
+
+    def _maybe_relax(self, key):
+        """Return a key with relaxed shapes if retraced too many times."""
+        family_key = _family_key(key)
+        history = self._shape_history[family_key]
+        history.append(key[2])
+        if len(history) <= self._relax_shapes_after:
+            return key
+        relaxed_shapes = []
+        for i, shape in enumerate(key[2]):
+            relaxed_shapes.append(tuple(
+                dim if all(shapes[i][j] == dim for shapes in history) else None
+                for j, dim in enumerate(shape)))
+        key = (key[0], key[1], tuple(relaxed_shapes), key[3])
+        self._relaxed_keys[family_key] = key
+        return key
+
+    def _trace(self, shapes, dtypes, kwargs):
+        """Trace the python function into graphs."""
+        inputs = []
+        input_signature = self.input_signature
+        for i in range(self._spec.num_inputs):
+            name, shape, dtype = 'Input:%d' % i, None, None
+            if input_signature is not None:
+                if i >= len(input_signature):
+                    raise ValueError(
+                        'When <input_signature> is provided, '
+                        'only define arguments covered by it.\n'
+                        'Got %d signature(s) and %d argument(s).'
+                        % (len(input_signature), self._spec.num_inputs))
+                shape = input_signature[i].shape
+                dtype = input_signature[i].dtype
+            elif shapes is not None:
+                shape, dtype = shapes[i], dtypes[i]
+            inputs.append(Tensor(shape, dtype, name, symbolic=True))
+        with eager_context.graph_mode():
+            returns = nest.flatten(self._python_function(*inputs, **kwargs))
+        outputs, dummies, graphs = [], [], []
+        for obj in returns:
+            if isinstance(obj, Tensor):
+                outputs.append(obj)
             else:
-                outputs.append(output)
-        return outputs[0] if len(outputs) == 1 else outputs
+                dummies.append(obj)
+        if len(outputs) > 0:
+            graphs.append(GraphLib.from_outputs(outputs))
+        for obj in dummies:
+            if isinstance(obj, GraphExecutionContext):
+                graphs.append(obj)
+        return ConcreteFunction(inputs, returns, graphs)
 
     def __get__(self, instance, owner):
         """Override to patch the instance methods."""
@@ -278,7 +384,12 @@ class FunctionGuard(object):
         return self._descriptor_cache[instance]
 
 
-def function(func=None, input_signature=None):
+def function(
+    func=None,
+    input_signature=None,
+    max_cache_size=32,
+    relax_shapes_after=3,
+):
     """Compile a function into the callable graph.
 
     Only the tensor operations could be compiled:
@@ -313,12 +424,31 @@ def function(func=None, input_signature=None):
     print(foo(1, 2))
     ```
 
+    Without ``input_signature``, graphs are traced and cached
+    for each distinct shape and dtype of inputs:
+
+    ```python
+    @dragon.function(max_cache_size=8, relax_shapes_after=2)
+    def foo(x):
+        return x + 1
+
+    foo(numpy.ones((1, 3)))
+    foo(numpy.ones((2, 3)))  # Retrace for a new batch size
+    foo(numpy.ones((3, 3)))  # Retrace with the relaxed shape (None, 3)
+    foo(numpy.ones((4, 3)))  # Reuse the relaxed graph
+    print(foo.cache_info())
+    ```
+
     Parameters
     ----------
     func : callable, optional
         The function to be compiled.
     input_signature : Sequence[dragon.Tensor], optional
         The tensors to hint the input.
+    max_cache_size : int, optional, default=32
+        The max number of cached graphs.
+    relax_shapes_after : int, optional, default=3
+        The number of retraces before relaxing the varying dimensions.
 
     Returns
     -------
@@ -329,7 +459,32 @@ def function(func=None, input_signature=None):
     def decorated(inner_function):
         return decorator.make_decorator(
             inner_function,
-            FunctionGuard(inner_function, input_signature))
+            FunctionGuard(inner_function, input_signature,
+                          max_cache_size, relax_shapes_after))
     if func is not None:
         return decorated(func)
     return decorated
+
+
+def _family_key(key):
+    """Return the key ignoring the dimensions of shapes."""
+    return key[:2] + (tuple(len(shape) for shape in key[2]), key[3])
+
+
+def _make_hashable(obj):
+    """Return a hashable object to key the non-tensor arguments."""
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _make_hashable(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_make_hashable(v) for v in obj)
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(_make_hashable(v) for v in obj)
+    if isinstance(obj, numpy.ndarray):
+        # Key the array by contents as the id could be recycled.
+        return str(obj.dtype), obj.shape, obj.tobytes()
+    try:
+        hash(obj)
+        return obj
+    except TypeError:
+        raise TypeError('Unhashable argument to key the function: {}.'
+                        .format(type(obj).__name__))
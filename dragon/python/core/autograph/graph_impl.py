@@ -46,7 +46,7 @@ class GraphLib(object):
     """Library class to build graphs from various targets."""
 
     @staticmethod
-    def from_onnx(model, name=None):
+    def from_onnx(model, name=None, optimization=None):
         """Create a graph from the onnx model."""
         execute_ws = workspace.get_workspace()
         graph_str = execute_ws._impl.PrepareONNXModel(model)
@@ -54,7 +54,7 @@ class GraphLib(object):
         graph_def.ParseFromString(graph_str)
         graph_def.name = 'Graph' if name is None else name
         GraphLib._add_device(graph_def)
-        GraphLib._add_optimization(graph_def)
+        GraphLib._add_optimization(graph_def, optimization)
         for input in graph_def.input:
             execute_ws.create_tensor(input)
         graph_def.name = execute_ws.create_graph(graph_def)
@@ -89,9 +89,9 @@ class GraphLib(object):
     def _add_outputs(graph_def, outputs):
         """Add outputs."""
         op_tape = tape.OrderedTape()
-        inputs = list(outputs)
+        inputs = collections.deque(outputs)
         while len(inputs) > 0:
-            input = inputs.pop(0)
+            input = inputs.popleft()
             if input._tape:
                 op_tape.merge_from(input._tape)
                 inputs.extend(input._tape.get_sources())
@@ -151,6 +151,9 @@ class GraphLib(object):
         graph_def.arg.add().CopyFrom(
             proto_util.make_argument('optimization', level))
         graph_def.type = cfg.graph_type
+        if graph_def.type == 'DAG':
+            graph_def.arg.add().CopyFrom(proto_util.make_argument(
+                'num_threads', config.get_num_threads()))
 
     @staticmethod
     def _add_updates(graph_def, grads_and_vars, optimizer):
@@ -181,5 +184,6 @@ class GraphLib(object):
                 inputs=grads,
                 outputs=vars,
                 name=optimizer._name,
-                weight_decay=weight_decay))
+                weight_decay=weight_decay,
+                flat=optimizer._flat))
         graph_def.op.extend(op_defs)
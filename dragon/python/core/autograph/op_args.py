@@ -635,4 +635,8 @@ def unsqueeze_args(**kwargs):
            'SGDUpdate',
            'NesterovUpdate'])
 def update_args(**kwargs):
-    return {'no_grad': True, 'weight_decay': kwargs.get('weight_decay', None)}
+    return {
+        'no_grad': True,
+        'weight_decay': kwargs.get('weight_decay', None),
+        'flat': kwargs.get('flat', False),
+    }
@@ -92,25 +92,67 @@ class Tape(object):
 
 
 class OrderedTape(Tape):
-    """Record operators in an ordered container."""
+    """Record operators in an ordered container.
+
+    Merging a tape links it as a parent instead of copying its operators,
+    which are collected and sorted once in ``get_op_defs``.
+
+    """
 
     _op_index = _new_incrementer()
 
     def __init__(self):
         super(OrderedTape, self).__init__()
-        self._op_defs = dict()
+        self._parents = []
 
     def add_op_def(self, value):
         """Add a new operator def."""
-        self._op_defs[next(self._op_index)] = value
+        self._op_defs.append((next(self._op_index), value))
 
     def get_op_defs(self):
         """Return the recorded operator defs."""
-        return [v for k, v in sorted(self._op_defs.items())]
+        op_defs = []
+        for tape in self._get_tapes():
+            op_defs.extend(tape._op_defs)
+        op_defs.sort(key=lambda item: item[0])
+        return [v for k, v in op_defs]
+
+    def get_sources(self):
+        """Return the sources."""
+        return list(set().union(*[t._sources for t in self._get_tapes()]))
+
+    def get_targets(self):
+        """Return the targets."""
+        return list(set().union(*[t._targets for t in self._get_tapes()]))
+
+    def is_source(self, value):
+        """Return if value is a source."""
+        return any(value in t._sources for t in self._get_tapes())
+
+    def is_target(self, value):
+        """Return if value is a target."""
+        return any(value in t._targets for t in self._get_tapes())
 
     def merge_op_defs(self, op_defs):
         """Merge the operator defs."""
-        self._op_defs = {**self._op_defs, **op_defs}
+        self._op_defs.extend(op_defs)
+
+    def merge_from(self, other):
+        """Merge from the given tape."""
+        if other is not None and other is not self:
+            self._parents.append(other)
+
+    def _get_tapes(self):
+        """Return this tape and the linked parents."""
+        tapes, stack, memo = [], [self], set()
+        while len(stack) > 0:
+            tape = stack.pop()
+            if id(tape) in memo:
+                continue
+            memo.add(id(tape))
+            tapes.append(tape)
+            stack.extend(tape._parents)
+        return tapes
 
 
 class GraphTape(Tape):
@@ -49,9 +49,10 @@ class Backend(object):
 class ProcessGroup(object):
     """A group that stores a set of ranks."""
 
-    def __init__(self, ranks, comm, handle, backend):
+    def __init__(self, ranks, comm, handle, backend, bucket_size=0):
         self._handle = handle
         self._ranks, self._comm = ranks, comm
+        self._bucket_size = bucket_size
         if backend is None:
             self._backend = Backend('AUTO')
         else:
@@ -88,6 +89,18 @@ class ProcessGroup(object):
         """
         return self._backend
 
+    @property
+    def bucket_size(self):
+        """Return the max bytes of a gradient bucket.
+
+        Returns
+        -------
+        int
+            The bucket size.
+
+        """
+        return self._bucket_size
+
     @property
     def ranks(self):
         """Return the ranks of this group.
@@ -237,7 +250,7 @@ def get_world_size():
     return _b.mpiWorldSize()
 
 
-def new_group(ranks=None, backend=None, verbose=False):
+def new_group(ranks=None, backend=None, verbose=False, bucket_size=0):
     """Create a new communication group.
 
     The ``ranks`` can be set to **None** to create
@@ -245,6 +258,16 @@ def new_group(ranks=None, backend=None, verbose=False):
 
     If ``backend`` is **None**, select as: **NCCL** > **MPI**.
 
+    If ``bucket_size`` is positive, the grads of ``torch.nn.Parameter``
+    are reduced in coalesced buckets during the ``torch`` backward:
+
+    ```python
+    group = dragon.distributed.new_group(ranks, bucket_size=25 << 20)
+    ```
+
+    A bucket is reduced after the last operator using its grads,
+    and the backward waits until the reduction is finished.
+
     Note that this function should be called from all processes,
     even if they are not going to be included in this group.
 
@@ -256,6 +279,8 @@ def new_group(ranks=None, backend=None, verbose=False):
         The optional backend.
     verbose : bool, optional, default=False
         ``True`` to log the group info.
+    bucket_size : int, optional, default=0
+        The max bytes of a gradient bucket.
 
     """
     if ranks is None:
@@ -264,7 +289,7 @@ def new_group(ranks=None, backend=None, verbose=False):
         _maybe_initialize()
         ranks = nest.flatten(ranks)
         comm, handle = _b.mpiCreateGroup(ranks, verbose)
-        return ProcessGroup(ranks, comm, handle, backend)
+        return ProcessGroup(ranks, comm, handle, backend, bucket_size)
 
 
 def _maybe_initialize():
@@ -66,6 +66,25 @@ def get_num_threads():
     return backend.GetNumThreads()
 
 
+def set_cpu_memory_cache_limit(limit):
+    """Set the max size of memory cached by cpu memory pools.
+
+    The limit applies to the pool of each workspace.
+    The freed blocks will not be cached if ``limit`` is zero:
+
+    ```python
+    dragon.set_cpu_memory_cache_limit(0)
+    ```
+
+    Parameters
+    ----------
+    limit : int
+        The max number of cached bytes.
+
+    """
+    backend.SetCPUMemoryCacheLimit(limit)
+
+
 def set_num_threads(num):
     """Set the number of threads for cpu parallelism.
 
@@ -21,6 +21,7 @@ import weakref
 
 from dragon.core.framework import backend
 from dragon.core.framework import config
+from dragon.core.framework import proto_util
 from dragon.core.proto import dragon_pb2
 from dragon.core.util import logging
 from dragon.core.util import serialization
@@ -114,6 +115,27 @@ class Workspace(object):
         """
         return self._impl.MemoryAllocated(device_type, device_index)
 
+    def memory_cached(self, device_type='cpu', device_index=0):
+        """Return the size of memory cached by pool on given device.
+
+        Each workspace owns a cpu memory pool for its operators and graphs.
+        Cached memory is released when the workspace is cleared.
+
+        Parameters
+        ----------
+        device_type : str, optional
+            The device type.
+        device_index : int, optional
+            The device index.
+
+        Returns
+        -------
+        int
+            The total number of cached bytes.
+
+        """
+        return self._impl.MemoryCached(device_type, device_index)
+
     def merge_from(self, other):
         """Merge resources from the other.
 
@@ -133,14 +155,36 @@ class Workspace(object):
         self._impl.MergeFrom(other._impl)
         return self
 
-    def run_backward(self, op_defs, targets, grad_targets=None, sources=None):
+    def run_backward(
+        self,
+        op_defs,
+        targets,
+        grad_targets=None,
+        sources=None,
+        reduce_sources=None,
+        process_group=None,
+    ):
         """Compute the gradients of operators."""
         cfg = config.config()
+        reduce_def, bucket_size = None, 0
+        if (reduce_sources and process_group is not None and
+                process_group.bucket_size > 0):
+            bucket_size = process_group.bucket_size
+            reduce_def = proto_util.make_operator_def(
+                op_type='Collective',
+                communication='ALLREDUCE',
+                operation='MEAN',
+                coalesce=True,
+                to_impl=True,
+                **process_group.arguments)
         self._impl.RunBackward(
             op_defs,
             targets,
             grad_targets if grad_targets else [],
             sources if sources else [],
+            reduce_sources if reduce_def else [],
+            reduce_def,
+            bucket_size,
             cfg.graph_optimization > 2,
             cfg.graph_verbosity > 0,
         )
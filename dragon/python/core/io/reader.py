@@ -45,6 +45,27 @@ class DataReader(multiprocessing.Process):
     )
     ```
 
+    Global shuffle samples a permutation over the whole dataset for each
+    epoch, and reads a window of examples in the order of offsets:
+
+    ```python
+    global_shuffle_reader = DataReader(
+        dataset=dataset,
+        source=path,
+        global_shuffle=True,
+        # Examples in a window are read sequentially if adjacent.
+        read_ahead=64,
+    )
+    ```
+
+    Examples could be routed to a list of queues by index,
+    and the read is left to consumers if ``index_only`` is set:
+
+    ```python
+    index_reader = DataReader(dataset=dataset, source=path, index_only=True)
+    index_reader.q_out = [queue1, queue2]  # index -> queue[index % 2]
+    ```
+
     Partition are available over distributed nodes:
 
     ```python
@@ -81,6 +102,14 @@ class DataReader(multiprocessing.Process):
             Whether to shuffle the data.
         initial_fill : int, optional, default=1024
             The length of sampling sequence for shuffle.
+        global_shuffle : bool, optional, default=False
+            Whether to shuffle with a permutation of dataset per epoch.
+        read_ahead : int, optional, default=64
+            The number of examples to read at once for global shuffle.
+        with_index : bool, optional, default=False
+            Whether to put examples as ``(index, example)``.
+        index_only : bool, optional, default=False
+            Whether to put ``(index, None)`` without reading the example.
         seed : int, optional
             The random seed to use instead.
 
@@ -92,8 +121,16 @@ class DataReader(multiprocessing.Process):
         self._num_parts = kwargs.get('num_parts', 1)
         self._shuffle = kwargs.get('shuffle', False)
         self._initial_fill = kwargs.get('initial_fill', 1024) if self._shuffle else 1
+        self._global_shuffle = kwargs.get('global_shuffle', False)
+        self._read_ahead = kwargs.get('read_ahead', 64)
+        self._index_only = kwargs.get('index_only', False)
+        self._with_index = kwargs.get('with_index', False) or self._index_only
         self._seed = kwargs.get('seed', config.config().random_seed)
+        # Permutations should be identical for all parts.
+        self._shuffle_seed = self._seed
         self._first, self._cursor, self._last = 0, 0, 0
+        self._epoch = -1
+        self._permutation = []
         self._part_size = 0
         self._num_examples = 0
         self._example_buffer = []
@@ -111,6 +148,36 @@ class DataReader(multiprocessing.Process):
         self._cursor += 1
         return self._dataset.get()
 
+    def next_permutation(self):
+        """Sample the permutation of current part for the next epoch."""
+        self._epoch += 1
+        rng = numpy.random.RandomState(self._shuffle_seed + self._epoch)
+        permutation = rng.permutation(self._num_examples)
+        self._first = self._part_idx * self._part_size
+        self._last = min(self._first + self._part_size, self._num_examples)
+        self._permutation = permutation[self._first:self._last]
+        self._cursor = 0
+
+    def next_window(self):
+        """Return the next window of examples for global shuffle."""
+        if self._cursor >= len(self._permutation):
+            self.next_permutation()
+        indices = self._permutation[self._cursor:self._cursor + self._read_ahead]
+        self._cursor += len(indices)
+        if self._index_only:
+            return [(index, None) for index in indices.tolist()]
+        # Read examples in the order of offsets.
+        # Redirection is skipped for the adjacent examples.
+        examples, last_index = {}, -2
+        for index in numpy.sort(indices).tolist():
+            if index != last_index + 1:
+                self._dataset.redirect(index)
+            examples[index] = self._dataset.get()
+            last_index = index
+        if self._with_index:
+            return [(index, examples[index]) for index in indices.tolist()]
+        return [examples[index] for index in indices.tolist()]
+
     def reset(self, stick_to_part=False):
         """Reset the environment of dataset."""
         # Redirect to the adjacent part if available.
@@ -127,6 +194,10 @@ class DataReader(multiprocessing.Process):
     def run(self):
         """Start the process."""
         self._init_dataset()
+        # Persist a loop to read the shuffled windows.
+        while self._global_shuffle:
+            for example in self.next_window():
+                self._put_item(example)
         # Persist a loop to read examples.
         while True:
             # Pop the depleted part if necessary.
@@ -140,11 +211,11 @@ class DataReader(multiprocessing.Process):
             # Choose a loaded example from the buffer.
             i = self._parts[0].start % len(self._example_buffer)
             j = (self._parts[0].start + offset) % len(self._example_buffer)
-            self.q_out.put(self._example_buffer[j])
+            self._put_item(self._example_buffer[j])
             self._example_buffer[j] = self._example_buffer[i]
             # Load and push back a new example into the buffer.
             k = self._parts[-1].end % len(self._example_buffer)
-            self._example_buffer[k] = self.next_example()
+            self._example_buffer[k] = self._next_item()
             # Increase the part boundaries.
             self._parts[-1].end += 1
             self._parts[0].start += 1
@@ -152,6 +223,23 @@ class DataReader(multiprocessing.Process):
             if self._cursor >= self._last:
                 self.reset()
 
+    def _next_item(self):
+        """Return the next example with index if necessary."""
+        index = self._cursor
+        if self._index_only:
+            self._cursor += 1
+            return index, None
+        example = self.next_example()
+        return (index, example) if self._with_index else example
+
+    def _put_item(self, item):
+        """Put an item into the output queue."""
+        if isinstance(self.q_out, (list, tuple)):
+            # Route to a fixed queue by index.
+            self.q_out[item[0] % len(self.q_out)].put(item)
+        else:
+            self.q_out.put(item)
+
     def _init_dataset(self):
         """Initialize the dataset."""
         numpy.random.seed(self._seed)
@@ -163,12 +251,18 @@ class DataReader(multiprocessing.Process):
         # Determine the part specification.
         self._num_examples = self._dataset.size
         self._part_size = (self._num_examples + self._num_parts - 1) // self._num_parts
+        if self._global_shuffle:
+            if self._part_size * self._part_idx >= self._num_examples:
+                raise ValueError('Part %d of %d is empty for %d examples.'
+                                 % (self._part_idx, self._num_parts,
+                                    self._num_examples))
+            return
         self._parts.append(DataReader.PartBoundaries(0, 0))
 
         # Fill the initial buffer to support random sampling.
         self.reset(stick_to_part=True)
         for i in range(self._initial_fill):
-            self._example_buffer.append(self.next_example())
+            self._example_buffer.append(self._next_item())
             self._parts[-1].end += 1
             if self._cursor >= self._last:
                 self.reset()
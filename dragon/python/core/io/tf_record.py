@@ -15,9 +15,17 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+import glob
+import json
+import mmap
+import multiprocessing
 import numpy
 import os
+import queue
+import re
 import struct
+import sys
+import traceback
 import zlib
 
 from dragon.core.proto import tf_example_pb2
@@ -105,14 +113,6 @@ class TFRecordExample(object):
             The serialized message bytes.
 
         """
-
-        def mask_crc32(value):
-            crc = zlib.crc32(bytes(value))
-            crc = crc & 0xffffffff if crc < 0 else crc
-            crc = numpy.array(crc, 'uint32')
-            crc = (crc >> 15) | (crc << 17).astype('uint32')
-            return int((crc + 0xa282ead8).astype('uint32'))
-
         bytes_seq = []
         proto_bytes = self.proto.SerializeToString()
 
@@ -120,21 +120,17 @@ class TFRecordExample(object):
             length = len(proto_bytes)
             bytes_seq.append(struct.pack('q', length))
             if pack_crc32:
-                length_crc = mask_crc32(length)
+                length_crc = _mask_crc32(bytes_seq[-1])
                 bytes_seq.append(struct.pack('I', length_crc))
 
         bytes_seq.append(proto_bytes)
         if pack_crc32:
-            proto_crc = mask_crc32(proto_bytes)
+            proto_crc = _mask_crc32(proto_bytes)
             bytes_seq.append(struct.pack('I', proto_crc))
 
         if len(bytes_seq) == 1:
             return bytes_seq[0]
-
-        bytes_all = bytes()
-        for b in bytes_seq:
-            bytes_all += b
-        return bytes_all
+        return b''.join(bytes_seq)
 
 
 class TFRecordWriter(object):
@@ -259,3 +255,444 @@ class TFRecordWriter(object):
     def __del__(self):
         """Delete writer and close the file."""
         self.close()
+
+
+class ParallelRecordWriter(object):
+    """Write examples into the TFRecord with multiple processes.
+
+    Examples are dispatched to ``num_workers`` processes in chunks,
+    and each process serializes and writes its own shards:
+
+    ```python
+    with dragon.io.ParallelRecordWriter(
+            path, features, num_workers=8) as writer:
+        for example in examples:
+            writer.write(example)
+    ```
+
+    Besides ``dragon.io.TFRecordExample``, a dict of feature lists
+    could be written to move the serialization into processes:
+
+    ```python
+    writer.write({'data': [img_bytes], 'label': [1]})
+    ```
+
+    The order of examples is not preserved across shards.
+    A ``MANIFEST`` file is written to describe the shards on closing.
+
+    """
+
+    def __init__(
+        self,
+        path,
+        features,
+        num_workers=4,
+        max_examples=2**63 - 1,
+        zfill_width=5,
+        chunk_size=64,
+    ):
+        """Create a ``ParallelRecordWriter``.
+
+        Parameters
+        ----------
+        path : str
+            The path to write the record files.
+        features : str
+            The descriptor for reading.
+        num_workers : int, optional, default=4
+            The number of processes to write.
+        max_examples : int, optional
+            The max examples of a single record file.
+        zfill_width : int, optional, default=5
+            The width of zfill for naming record files.
+        chunk_size : int, optional, default=64
+            The number of examples to dispatch at once.
+
+        """
+        self._path = path
+        self._chunk_size = chunk_size
+        self._chunk, self._num_chunks = [], 0
+        if not os.path.exists(path):
+            os.makedirs(path)
+        with open(os.path.join(path, 'FEATURES'), 'w') as f:
+            f.write(features)
+        self._q_out = multiprocessing.Queue()
+        self._workers = []
+        for i in range(num_workers):
+            worker = _RecordWorker(path, i, max_examples, zfill_width)
+            worker.q_out = self._q_out
+            worker.start()
+            self._workers.append(worker)
+        self._writing = True
+
+    def write(self, example):
+        """Write a example to the file.
+
+        Parameters
+        ----------
+        example : Union[dragon.io.TFRecordExample, Dict]
+            The data example.
+
+        """
+        if not self._writing:
+            raise RuntimeError('Writer has been closed.')
+        if isinstance(example, TFRecordExample):
+            example = example.proto.SerializeToString()
+        self._chunk.append(example)
+        if len(self._chunk) >= self._chunk_size:
+            self._dispatch()
+
+    def close(self):
+        """Wait for the processes and write the manifest."""
+        if self._writing:
+            self._dispatch()
+            for worker in self._workers:
+                self._put(worker, None)
+            shards = []
+            for _ in self._workers:
+                shards.extend(self._get())
+            for worker in self._workers:
+                worker.join()
+            shards.sort(key=lambda shard: shard['data'])
+            with open(os.path.join(self._path, 'MANIFEST'), 'w') as f:
+                json.dump({
+                    'num_examples': sum(e['num_examples'] for e in shards),
+                    'shards': shards,
+                }, f, indent=2)
+            self._writing = False
+
+    def _check_workers(self):
+        """Raise if any worker exited with an error."""
+        for worker in self._workers:
+            if worker.exitcode not in (None, 0):
+                error = 'Worker {} exited with code {}.'.format(
+                    worker.name, worker.exitcode)
+                try:
+                    # Find the reported error if available.
+                    while True:
+                        result = self._q_out.get(timeout=0.1)
+                        if isinstance(result, str):
+                            error = result
+                            break
+                except queue.Empty:
+                    pass
+                self._terminate()
+                raise RuntimeError('Failed to write records:\n' + error)
+
+    def _dispatch(self):
+        """Dispatch the current chunk to the next worker."""
+        if len(self._chunk) > 0:
+            worker = self._workers[self._num_chunks % len(self._workers)]
+            self._put(worker, self._chunk)
+            self._chunk, self._num_chunks = [], self._num_chunks + 1
+
+    def _get(self):
+        """Return the shards of a finished worker."""
+        while True:
+            try:
+                result = self._q_out.get(timeout=1.)
+                break
+            except queue.Empty:
+                self._check_workers()
+        if isinstance(result, str):
+            self._terminate()
+            raise RuntimeError('Failed to write records:\n' + result)
+        return result
+
+    def _put(self, worker, chunk):
+        """Put a chunk into the queue of worker."""
+        while True:
+            try:
+                return worker.q_in.put(chunk, timeout=1.)
+            except queue.Full:
+                self._check_workers()
+
+    def _terminate(self):
+        """Terminate the workers and stop writing."""
+        self._writing = False
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+    def __enter__(self):
+        """Enter a **with** block."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Exit a **with** block and close the file."""
+        self.close()
+
+    def __del__(self):
+        """Delete writer and close the file."""
+        if getattr(self, '_writing', False):
+            self.close()
+
+
+class _RecordWorker(multiprocessing.Process):
+    """Process to serialize and write the chunks of examples."""
+
+    def __init__(self, path, worker_id, max_examples, zfill_width):
+        super(_RecordWorker, self).__init__()
+        self._path = path
+        self._max_examples = max_examples
+        self._template = ('{0:0%d}-' % zfill_width).format(worker_id)
+        self._template += '{0:0%d}' % zfill_width
+        self._shards = []
+        self._data_writer = self._index_writer = None
+        self.q_in = multiprocessing.Queue(4)
+        self.q_out = None
+        self.daemon = True
+
+    def new_shard(self):
+        """Close the current shard and open a new one."""
+        self.close_shard()
+        name = self._template.format(len(self._shards))
+        self._shards.append({'data': name + '.data',
+                             'index': name + '.index',
+                             'num_examples': 0})
+        self._data_writer = open(os.path.join(
+            self._path, self._shards[-1]['data']), 'wb')
+        self._index_writer = open(os.path.join(
+            self._path, self._shards[-1]['index']), 'w')
+
+    def close_shard(self):
+        """Close the current shard."""
+        if self._data_writer is not None:
+            self._data_writer.close()
+            self._index_writer.close()
+            self._data_writer = self._index_writer = None
+
+    def write_chunk(self, chunk):
+        """Serialize and write a chunk of examples."""
+        data = [_make_example(e).proto.SerializeToString()
+                if isinstance(e, dict) else e for e in chunk]
+        lengths = numpy.array([len(e) for e in data], 'int64')
+        length_bytes = [e.tobytes() for e in lengths]
+        length_crcs = _mask_crc32_array(length_bytes)
+        data_crcs = _mask_crc32_array(data)
+        offset = 0
+        while offset < len(data):
+            shard = self._shards[-1]
+            if shard['num_examples'] >= self._max_examples:
+                self.new_shard()
+                shard = self._shards[-1]
+            num = min(len(data) - offset,
+                      self._max_examples - shard['num_examples'])
+            records, index = [], []
+            current = self._data_writer.tell()
+            for i in range(offset, offset + num):
+                records.extend((length_bytes[i], length_crcs[i].tobytes(),
+                                data[i], data_crcs[i].tobytes()))
+                index.append('%d %d\n' % (current, lengths[i] + 16))
+                current += int(lengths[i]) + 16
+            self._data_writer.write(b''.join(records))
+            self._index_writer.write(''.join(index))
+            shard['num_examples'] += num
+            offset += num
+
+    def run(self):
+        """Start the process to write chunks."""
+        try:
+            self.new_shard()
+            while True:
+                chunk = self.q_in.get()
+                if chunk is None:
+                    break
+                self.write_chunk(chunk)
+            self.close_shard()
+            if self._shards[-1]['num_examples'] == 0:
+                for key in ('data', 'index'):
+                    os.remove(os.path.join(self._path, self._shards[-1][key]))
+                self._shards.pop()
+        except Exception:
+            # Report the error instead of the shards.
+            self.q_out.put(traceback.format_exc())
+            sys.exit(1)
+        self.q_out.put(self._shards)
+
+
+class TFRecordDataset(object):
+    """Dataset to load the TFRecord.
+
+    Shards written by ``dragon.io.TFRecordWriter`` are memory-mapped,
+    and the index files are used to seek any example directly:
+
+    ```python
+    reader = dragon.io.DataReader(
+        dataset=dragon.io.TFRecordDataset,
+        source=path,
+    )
+    ```
+
+    Each example is returned as a dict of feature values.
+    Features described by ``tf.FixedLenFeature([], ...)`` are
+    returned as scalars, while others are returned as lists.
+
+    Verification of crc32 could be skipped to read faster:
+
+    ```python
+    reader = dragon.io.DataReader(
+        dataset=functools.partial(
+            dragon.io.TFRecordDataset, verify_crc=False),
+        source=path,
+    )
+    ```
+
+    For the detailed reading procedure, see ``DataReader``.
+
+    """
+
+    def __init__(self, path, verify_crc=True):
+        """Create a ``TFRecordDataset``.
+
+        Parameters
+        ----------
+        path : str
+            The path of record files.
+        verify_crc : bool, optional, default=True
+            ``True`` to verify the crc32 of each example.
+
+        """
+        self._verify_crc = verify_crc
+        self._features = ''
+        features_file = os.path.join(path, 'FEATURES')
+        if os.path.exists(features_file):
+            with open(features_file, 'r') as f:
+                self._features = f.read()
+        self._scalar_keys = set(re.findall(
+            r"""['"](\w+)['"]\s*:\s*tf\.FixedLenFeature\(\s*\[\s*\]""",
+            self._features))
+        self._files, self._shards = [], []
+        indices, shard_ids = [], []
+        for data_file in sorted(glob.glob(os.path.join(path, '*.data'))):
+            index_file = data_file[:-5] + '.index'
+            if os.path.getsize(index_file) == 0:
+                continue
+            index = numpy.loadtxt(index_file, 'int64', ndmin=2)
+            f = open(data_file, 'rb')
+            self._files.append(f)
+            self._shards.append(mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ))
+            indices.append(index)
+            shard_ids.append(numpy.full(
+                (index.shape[0],), len(self._shards) - 1, 'int64'))
+        if len(indices) > 0:
+            indices = numpy.concatenate(indices)
+            self._offsets, self._lengths = indices[:, 0], indices[:, 1]
+            self._shard_ids = numpy.concatenate(shard_ids)
+        else:
+            self._offsets = self._lengths = self._shard_ids = \
+                numpy.zeros((0,), 'int64')
+        self._cursor = 0
+
+    @property
+    def features(self):
+        """Return the descriptor of features.
+
+        Returns
+        -------
+        str
+            The feature descriptor.
+
+        """
+        return self._features
+
+    @property
+    def size(self):
+        """Return the total number of examples.
+
+        Returns
+        -------
+        int
+            The number of examples.
+
+        """
+        return self._offsets.shape[0]
+
+    def get(self):
+        """Pop a example starting from cursor.
+
+        Returns
+        -------
+        dict
+            The example.
+
+        """
+        index = self._cursor
+        self._cursor += 1
+        shard = self._shards[self._shard_ids[index]]
+        offset = int(self._offsets[index])
+        record = shard[offset:offset + int(self._lengths[index])]
+        length, = struct.unpack('q', record[:8])
+        data = record[12:12 + length]
+        if self._verify_crc:
+            length_crc, = struct.unpack('I', record[8:12])
+            data_crc, = struct.unpack('I', record[12 + length:16 + length])
+            # Earlier writers hashed ``length`` zero bytes as the length.
+            if length_crc != _mask_crc32(record[:8]) and \
+                    length_crc != _mask_crc32(bytes(length)):
+                raise IOError('Corrupted example at index %d.' % index)
+            if data_crc != _mask_crc32(data):
+                raise IOError('Corrupted example at index %d.' % index)
+        proto = tf_example_pb2.Example()
+        proto.ParseFromString(data)
+        example = {}
+        for key, feature in proto.features.feature.items():
+            kind = feature.WhichOneof('kind')
+            value = list(getattr(feature, kind).value) if kind else []
+            if key in self._scalar_keys and len(value) == 1:
+                value = value[0]
+            example[key] = value
+        return example
+
+    def redirect(self, index):
+        """Move the cursor to the specified index.
+
+        Parameters
+        ----------
+        index : int
+            The index to move.
+
+        """
+        self._cursor = index
+
+    def __len__(self):
+        """Return the total number of examples."""
+        return self.size
+
+    def __del__(self):
+        """Close the memory-mapped files."""
+        for shard in self._shards:
+            shard.close()
+        for f in self._files:
+            f.close()
+        self._shards, self._files = [], []
+
+
+def _make_example(features):
+    """Return an example from the dict of feature lists."""
+    example = TFRecordExample()
+    for key, value in features.items():
+        if len(value) > 0 and isinstance(value[0], bytes):
+            example.add_strings(key, value)
+        elif len(value) > 0 and isinstance(value[0], (float, numpy.floating)):
+            example.add_floats(key, value)
+        else:
+            example.add_ints(key, value)
+    return example
+
+
+def _mask_crc32(value):
+    """Return the masked crc32 of value."""
+    crc = zlib.crc32(bytes(value)) & 0xffffffff
+    crc = ((crc >> 15) | (crc << 17)) & 0xffffffff
+    return (crc + 0xa282ead8) & 0xffffffff
+
+
+def _mask_crc32_array(values):
+    """Return the masked crc32 of a sequence of values."""
+    # Iterate in C with map, which is faster than a table lookup in numpy.
+    crc = numpy.fromiter(map(zlib.crc32, values), 'uint64', len(values))
+    crc = ((crc >> 15) | (crc << 17)) & 0xffffffff
+    return ((crc + 0xa282ead8) & 0xffffffff).astype('uint32')
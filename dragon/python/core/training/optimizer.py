@@ -29,7 +29,7 @@ from dragon.core.framework import workspace
 class Optimizer(object):
     """The base class of optimizers."""
 
-    def __init__(self, scale=1, clip_norm=0, weight_decay=0):
+    def __init__(self, scale=1, clip_norm=0, weight_decay=0, flat=False):
         """Create a ``Optimizer``.
 
         Parameters
@@ -40,11 +40,14 @@ class Optimizer(object):
             The maximum L2 norm to clip gradient.
         weight_decay : float, optional, default=0
             The L2 penalty factor to weight.
+        flat : bool, optional, default=False
+            ``True`` to keep the float32 variables as views of a flat buffer.
 
         """
         self._name = workspace.get_workspace()._handle_pool.create('Optimizer')
         self._op_type = self.__class__.__name__ + 'Update'
         self._process_group = distributed.get_group()
+        self._flat = flat
         self._hyper = {}
         self._set_hyper('scale', scale)
         self._set_hyper('clip_norm', clip_norm)
@@ -89,7 +92,8 @@ class Optimizer(object):
             if len(grads) == 0:
                 continue
             OpLib.execute(self._op_type, grads, outputs=vars,
-                          handle=self._name, weight_decay=weight_decay)
+                          handle=self._name, weight_decay=weight_decay,
+                          flat=self._flat)
 
     def _set_hyper(self, name, value):
         """Set value to a hyper parameter."""
@@ -55,12 +55,29 @@ class DataIterator(object):
     )
     ```
 
+    Transformers could be spawned or retired to match the consumer:
+
+    ```python
+    iterator = dragon.vision.DataIterator(
+        dataset=dragon.io.KPLRecordDataset,
+        source=path,
+        batch_size=32,
+        autoscale=True,
+        max_transformers=8,
+    )
+    print(iterator.metrics())  # throughput, stall ratio, queue depths
+    ```
+
     Then, you can get a batch of data by ``Iterator.next()``:
 
     ```python
     images, labels = iterator.next()
     ```
 
+    If the size of cropping is given, batches are collated into a ring of
+    shared memory slots. Set ``zero_copy`` to return ``images`` as a view
+    of slot, which is valid until the next call.
+
     """
 
     def __init__(self, **kwargs):
@@ -76,6 +93,10 @@ class DataIterator(object):
             Whether to shuffle the data.
         initial_fill : int, optional, default=1024
             The length of sampling sequence for shuffle.
+        global_shuffle : bool, optional, default=False
+            Whether to shuffle with a permutation of dataset per epoch.
+        read_ahead : int, optional, default=64
+            The number of examples to read at once for global shuffle.
         resize : int, optional, default=0
             The size for the shortest edge.
         padding : int, optional, default=0
@@ -98,6 +119,15 @@ class DataIterator(object):
             Whether to apply color distortion.
         inverse_color : bool, option, default=False
             Whether to inverse channels for color images.
+        draft_decode : bool, optional, default=False
+            Whether to decode JPEG at the smallest sufficient scale.
+        cache_size : int, optional, default=0
+            The max bytes to cache the decoded images in each transformer.
+            Indices are routed to fixed transformers, and autoscale is disabled.
+        cache_spill_size : int, optional, default=0
+            The max bytes to spill the evicted images into a file.
+        cache_dir : str, optional
+            The directory to create the spill file.
         phase : {'TRAIN', 'TEST'}, optional
             The optional running phase.
         batch_size : int, optional, default=128
@@ -106,6 +136,16 @@ class DataIterator(object):
             The prefetch count.
         num_transformers : int, optional, default=-1
             The number of transformers to process image.
+        autoscale : bool, optional, default=False
+            Whether to spawn or retire transformers by the stall time.
+        min_transformers : int, optional, default=1
+            The min number of transformers for autoscale.
+        max_transformers : int, optional
+            The max number of transformers for autoscale.
+        autoscale_interval : int, optional, default=50
+            The number of batches between autoscale decisions.
+        zero_copy : bool, optional, default=False
+            ``True`` to return a view of the shared slot instead of a copy.
         seed : int, optional
             The random seed to use instead.
 
@@ -124,6 +164,7 @@ class DataIterator(object):
         self._num_readers = kwargs.get('num_readers', 1)
         self._num_transformers = kwargs.get('num_transformers', -1)
         self._batch_size = kwargs.get('batch_size', 128)
+        self._zero_copy = kwargs.get('zero_copy', False)
         self.daemon = True
 
         # Io-Aware Policy.
@@ -136,10 +177,45 @@ class DataIterator(object):
             if kwargs.get('distort_color', False):
                 self._num_transformers += 1
 
+        # Autoscale Policy.
+        # Cache requires the fixed transformers to route indices.
+        cache_size = kwargs.get('cache_size', 0)
+        self._autoscale = kwargs.get('autoscale', False) and cache_size == 0
+        self._min_transformers = kwargs.get('min_transformers', 1)
+        self._max_transformers = kwargs.get('max_transformers', mp.cpu_count())
+        self._autoscale_interval = kwargs.get('autoscale_interval', 50)
+        if not self._autoscale:
+            self._max_transformers = self._num_transformers
+        self._max_transformers = max(self._max_transformers,
+                                     self._num_transformers)
+
         # Initialize queues.
         num_batches = self._prefetch * self._num_readers
-        self.q_in = mp.Queue(num_batches * self._batch_size)
-        self.q_out = mp.Queue(num_batches * self._batch_size)
+        num_slots = max(num_batches, self._max_transformers + 1)
+        if cache_size > 0:
+            # Route each index to a transformer with its own cache.
+            self.q_in = [mp.Queue(num_batches * self._batch_size)
+                         for _ in range(self._num_transformers)]
+        else:
+            self.q_in = mp.Queue(num_batches * self._batch_size)
+        self.q_out = mp.Queue(num_slots)
+        self.q_free = mp.Queue()
+        for i in range(num_slots):
+            self.q_free.put(i)
+
+        # Initialize the shared slots if image size is fixed.
+        self._slots, self._buffers, self._slot = None, None, None
+        crop_size = kwargs.get('random_crop_size', 0)
+        crop_size = crop_size or kwargs.get('crop_size', 0)
+        if crop_size > 0:
+            slot_size = self._batch_size * crop_size * crop_size * 3
+            self._slots = [mp.RawArray('B', slot_size)
+                           for _ in range(num_slots)]
+            self._buffers = [numpy.frombuffer(slot, 'uint8')
+                             for slot in self._slots]
+
+        # Leave the read to transformers for cache.
+        kwargs['index_only'] = cache_size > 0
 
         # Initialize readers.
         self._readers = []
@@ -155,15 +231,16 @@ class DataIterator(object):
             time.sleep(0.1)
 
         # Initialize transformers.
-        self._transformers = []
+        self._rank, self._kwargs = rank, kwargs
+        self._transformers, self._num_spawned = [], 0
         for i in range(self._num_transformers):
-            p = data_transformer.DataTransformer(**kwargs)
-            p._seed += (i + rank * self._num_transformers)
-            p.q_in, p.q_out = self.q_in, self.q_out
-            p.start()
-            self._transformers.append(p)
+            self._spawn_transformer()
             time.sleep(0.1)
 
+        # Initialize metrics.
+        self._num_batches, self._num_retiring = 0, 0
+        self._window = [time.time(), 0, 0.]
+
         # Register cleanup callbacks.
         def cleanup():
             def terminate(processes):
@@ -179,6 +256,26 @@ class DataIterator(object):
         import atexit
         atexit.register(cleanup)
 
+    def metrics(self):
+        """Return the metrics since the last autoscale decision.
+
+        Returns
+        -------
+        dict
+            The throughput, stall ratio, queue depths and transformers.
+
+        """
+        start_time, num_batches, wait_time = self._window
+        elapsed = max(time.time() - start_time, 1e-6)
+        return {
+            'throughput': num_batches * self._batch_size / elapsed,
+            'stall_ratio': wait_time / elapsed,
+            'wait_time': wait_time / max(num_batches, 1),
+            'q_in_size': _qsize(self.q_in),
+            'q_out_size': _qsize(self.q_out),
+            'num_transformers': len(self._transformers) - self._num_retiring,
+        }
+
     def next(self):
         """Return the next batch of data."""
         return self.__next__()
@@ -189,11 +286,72 @@ class DataIterator(object):
 
     def __next__(self):
         """Return the next batch of data."""
-        image, label = self.q_out.get()
-        images = numpy.zeros([self._batch_size] + list(image.shape), image.dtype)
-        labels = numpy.zeros([self._batch_size, len(label)], 'int64')
-        for i in range(self._batch_size):
-            images[i], labels[i] = image, label
-            if i != self._batch_size - 1:
-                image, label = self.q_out.get()
+        # Recycle the slot of last batch.
+        if self._slot is not None:
+            self.q_free.put(self._slot)
+            self._slot = None
+        tic = time.time()
+        slot, shape, dtype, labels, images = self.q_out.get()
+        self._window[1] += 1
+        self._window[2] += time.time() - tic
+        if images is None:
+            # Return a view or copy of batch in the shared slot.
+            nbytes = int(numpy.prod(shape)) * dtype.itemsize
+            images = self._buffers[slot][:nbytes]
+            images = images.view(dtype).reshape(shape)
+            if self._zero_copy:
+                self._slot = slot
+            else:
+                images = images.copy()
+                self.q_free.put(slot)
+        else:
+            self.q_free.put(slot)
+        self._num_batches += 1
+        if self._autoscale and \
+                self._num_batches % self._autoscale_interval == 0:
+            self._rescale()
         return images, labels
+
+    def _rescale(self):
+        """Spawn or retire a transformer by the metrics."""
+        metrics = self.metrics()
+        self._window = [time.time(), 0, 0.]
+        # Join the retired transformers.
+        for p in [p for p in self._transformers if not p.is_alive()]:
+            p.join()
+            self._transformers.remove(p)
+            self._num_retiring -= 1
+        num_transformers = metrics['num_transformers']
+        if metrics['stall_ratio'] > 0.1:
+            # Spawn if examples are waiting for transformers.
+            if metrics['q_in_size'] >= self._batch_size and \
+                    num_transformers < self._max_transformers:
+                self._spawn_transformer()
+        elif metrics['stall_ratio'] < 0.01:
+            # Retire if batches are waiting for the consumer.
+            if metrics['q_out_size'] > 1 and \
+                    num_transformers > self._min_transformers:
+                self.q_free.put(None)
+                self._num_retiring += 1
+
+    def _spawn_transformer(self):
+        """Spawn a new transformer."""
+        p = data_transformer.DataTransformer(**self._kwargs)
+        p._seed += (self._num_spawned + self._rank * self._max_transformers)
+        p.q_in, p.q_out = self.q_in, self.q_out
+        if isinstance(self.q_in, list):
+            p.q_in = self.q_in[self._num_spawned]
+        p.q_free, p.slots = self.q_free, self._slots
+        p.start()
+        self._transformers.append(p)
+        self._num_spawned += 1
+
+
+def _qsize(queue):
+    """Return the approximate size of a queue."""
+    if isinstance(queue, list):
+        return sum(_qsize(q) for q in queue)
+    try:
+        return queue.qsize()
+    except NotImplementedError:
+        return -1
@@ -22,6 +22,7 @@ import PIL.Image
 import PIL.ImageEnhance
 
 from dragon.core.framework import config
+from dragon.utils.vision import sample_cache
 
 
 class DataTransformer(multiprocessing.Process):
@@ -54,8 +55,22 @@ class DataTransformer(multiprocessing.Process):
             Whether to apply color distortion.
         inverse_color : bool, option, default=False
             Whether to inverse channels for color images.
+        draft_decode : bool, optional, default=False
+            Whether to decode JPEG at the smallest sufficient scale.
+        dataset : class, optional
+            The dataset class to read the examples missed in cache.
+        source : str, optional
+            The path of data source.
+        cache_size : int, optional, default=0
+            The max bytes to cache the decoded images by index.
+        cache_spill_size : int, optional, default=0
+            The max bytes to spill the evicted images into a file.
+        cache_dir : str, optional
+            The directory to create the spill file.
         phase : {'TRAIN', 'TEST'}, optional
             The optional running phase.
+        batch_size : int, optional, default=128
+            The size of a mini-batch to collate.
         seed : int, optional
             The random seed to use instead.
 
@@ -73,12 +88,31 @@ class DataTransformer(multiprocessing.Process):
         self._distort_color = kwargs.get('distort_color', False)
         self._inverse_color = kwargs.get('inverse_color', False)
         self._phase = kwargs.get('phase', 'TRAIN')
+        self._draft_size = 0
+        if kwargs.get('draft_decode', False):
+            if self._resize > 0:
+                self._draft_size = self._resize
+            elif self._random_crop_size > 0 and \
+                    self._crop_size == 0 and self._padding == 0:
+                # Keep the smallest crop not less than the output.
+                self._draft_size = int(math.ceil(
+                    self._random_crop_size * math.sqrt(
+                        max(self._random_ratios) / min(self._random_scales))))
+        self._cache_args = (kwargs.get('cache_size', 0),
+                            kwargs.get('cache_spill_size', 0),
+                            kwargs.get('cache_dir', None))
+        self._cache, self._labels = None, {}
+        self._dataset = kwargs.get('dataset', None)
+        self._source = kwargs.get('source', '')
+        self._batch_size = kwargs.get('batch_size', 128)
         self._seed = kwargs.get('seed', config.config().random_seed)
         self.q_in = self.q_out = None
+        self.q_free, self.slots = None, None
+        self._buffers = None
         self.daemon = True
 
-    def get(self, example):
-        """Return image and labels from a serialized str.
+    def decode(self, example):
+        """Return the decoded image from example.
 
         Parameters
         ----------
@@ -88,14 +122,19 @@ class DataTransformer(multiprocessing.Process):
         Returns
         -------
         numpy.ndarray
-            The images.
-        Sequence[int]
-            The labels.
+            The image.
 
         """
         # Decode.
         if example['encoded'] > 0:
             img = PIL.Image.open(io.BytesIO(example['data']))
+            if self._draft_size > 0:
+                # Reduce the scale of JPEG in the DCT domain.
+                (w, h), size = img.size, self._draft_size
+                scale = float(size) / min(w, h)
+                if scale < 1:
+                    img.draft(img.mode, (int(math.ceil(w * scale)),
+                                         int(math.ceil(h * scale))))
         else:
             img = numpy.frombuffer(example['data'], numpy.uint8)
             img = img.reshape(example['shape'])
@@ -126,6 +165,31 @@ class DataTransformer(multiprocessing.Process):
                     self._padding:self._padding + img.shape[1], :] = img
             img = pad_img
 
+        return img
+
+    def get(self, example, index=None):
+        """Return image and labels from a serialized str.
+
+        Parameters
+        ----------
+        example : dict
+            The input example, ``None`` to read by index if not cached.
+        index : int, optional
+            The index of example to lookup the cache.
+
+        Returns
+        -------
+        numpy.ndarray
+            The images.
+        Sequence[int]
+            The labels.
+
+        """
+        if self._cache is not None and index is not None:
+            img, label = self._lookup(example, index)
+        else:
+            img, label = self.decode(example), example['label']
+
         # Random crop (AlexNet-Style).
         if self._crop_size > 0:
             h = w = self._crop_size
@@ -173,6 +237,8 @@ class DataTransformer(multiprocessing.Process):
 
         # CutOut.
         if self._cutout_size > 0:
+            if not img.flags.writeable:
+                img = img.copy()
             h, w = img.shape[:2]
             y = numpy.random.randint(h)
             x = numpy.random.randint(w)
@@ -203,12 +269,218 @@ class DataTransformer(multiprocessing.Process):
         if self._inverse_color:
             img = img[:, :, ::-1]
 
-        return img, example['label']
+        return img, label
+
+    def get_batch(self, examples, indices=None, buffer=None):
+        """Return a batch of images and labels from examples.
+
+        Random parameters are sampled for the whole batch in one draw,
+        and the pixel-wise transformations run over the stacked images.
+
+        Parameters
+        ----------
+        examples : Sequence[dict]
+            The input examples, ``None`` to read by index if not cached.
+        indices : Sequence[int], optional
+            The index of examples to lookup the cache.
+        buffer : numpy.ndarray, optional
+            The uint8 buffer to write images if it fits.
+
+        Returns
+        -------
+        numpy.ndarray
+            The images.
+        numpy.ndarray
+            The labels.
+
+        """
+        num_images = len(examples)
+        indices = indices or [None] * num_images
+        images, labels = [], []
+        for example, index in zip(examples, indices):
+            if self._cache is not None and index is not None:
+                img, label = self._lookup(example, index)
+            else:
+                img, label = self.decode(example), example['label']
+            images.append(img)
+            labels.append(label)
+        labels = numpy.array(labels, 'int64').reshape((num_images, -1))
+        sizes = numpy.array([img.shape[:2] for img in images], 'int64')
+
+        # Random crop (AlexNet-Style).
+        if self._crop_size > 0:
+            h = w = self._crop_size
+            if self._phase == 'TRAIN':
+                scale = numpy.random.uniform(size=(num_images, 2))
+                offsets = (scale * (sizes - (h - 1, w - 1))).astype('int64')
+            else:
+                offsets = (sizes - (h, w)) // 2
+            images = [img[i:i + h, j:j + w, :]
+                      for img, (i, j) in zip(images, offsets.tolist())]
+            sizes[:] = h, w
+
+        # Random crop (Inception-Style).
+        if self._random_crop_size > 0:
+            new_size = (self._random_crop_size, self._random_crop_size)
+            boxes = self._sample_crop_boxes(sizes).tolist()
+            images = [numpy.asarray(PIL.Image.fromarray(
+                img[i:i + h, j:j + w, :]).resize(new_size, PIL.Image.BILINEAR))
+                for img, (i, j, h, w) in zip(images, boxes)]
+
+        # Stack.
+        shape = (num_images,) + images[0].shape
+        nbytes = images[0].nbytes * num_images
+        if buffer is not None and nbytes <= buffer.size:
+            output = buffer[:nbytes].view(images[0].dtype).reshape(shape)
+        else:
+            output = numpy.empty(shape, images[0].dtype)
+        for i, img in enumerate(images):
+            output[i] = img
+        height, width = shape[1:3]
+
+        # CutOut.
+        if self._cutout_size > 0:
+            y = numpy.random.randint(height, size=(num_images, 1))
+            x = numpy.random.randint(width, size=(num_images, 1))
+            rows, cols = numpy.arange(height), numpy.arange(width)
+            rows = ((rows >= y - self._cutout_size // 2) &
+                    (rows < y + self._cutout_size // 2))
+            cols = ((cols >= x - self._cutout_size // 2) &
+                    (cols < x + self._cutout_size // 2))
+            output[rows[:, :, None] & cols[:, None, :]] = self._fill_value
+
+        # Random mirror.
+        if self._mirror:
+            flip = numpy.random.randint(0, 2, size=num_images) > 0
+            output[flip] = output[flip, :, ::-1]
+
+        # Color distortion.
+        if self._distort_color:
+            factors = 1. + numpy.random.uniform(-.4, .4, (num_images, 3))
+            orders = numpy.argsort(numpy.random.uniform(
+                size=(num_images, 3)), axis=1)
+            self._distort_colors(output, factors, orders)
+
+        # Color transformation.
+        if self._inverse_color:
+            output[...] = output[..., ::-1]
+
+        return output, labels
+
+    def collate(self, slot):
+        """Return a batch of images and labels for the given slot.
+
+        Images are written into the shared buffer of slot if it fits,
+        otherwise they are collated and returned as an array.
+
+        Parameters
+        ----------
+        slot : int
+            The index of batch slot.
+
+        Returns
+        -------
+        Tuple
+            The (slot, shape, dtype, labels, images) message.
+
+        """
+        buffer = self._buffers[slot] if self._buffers else None
+        examples = [self.q_in.get() for _ in range(self._batch_size)]
+        indices = None
+        if self._cache is not None:
+            indices, examples = zip(*examples)
+        images, labels = self.get_batch(examples, indices, buffer)
+        shared = buffer is not None and numpy.may_share_memory(images, buffer)
+        return (slot, images.shape, images.dtype,
+                labels, None if shared else images)
 
     def run(self):
         """Start the process to produce images."""
         numpy.random.seed(self._seed)
 
+        if self._cache_args[0] > 0:
+            self._cache = sample_cache.SampleCache(*self._cache_args)
+            if self._dataset is not None:
+                self._dataset = self._dataset(self._source)
+
+        if self.q_free is None:
+            while True:
+                # example -> (image, label)
+                if self._cache is not None:
+                    index, example = self.q_in.get()
+                    self.q_out.put(self.get(example, index))
+                else:
+                    self.q_out.put(self.get(self.q_in.get()))
+
+        # Attach the shared slots in this process.
+        if self.slots is not None:
+            self._buffers = [numpy.frombuffer(slot, 'uint8')
+                             for slot in self.slots]
         while True:
-            # example -> (image, label)
-            self.q_out.put(self.get(self.q_in.get()))
+            # slot -> (slot, shape, dtype, labels, images)
+            slot = self.q_free.get()
+            if slot is None:
+                break  # Retired by the iterator.
+            self.q_out.put(self.collate(slot))
+
+    def _distort_colors(self, images, factors, orders):
+        """Apply the brightness, contrast and color jitter in place."""
+        # The blends of PIL run faster than the float math over batch.
+        transforms = [PIL.ImageEnhance.Brightness,
+                      PIL.ImageEnhance.Contrast,
+                      PIL.ImageEnhance.Color]
+        for img, factor, order in zip(images, factors.tolist(), orders.tolist()):
+            enhanced = PIL.Image.fromarray(img)
+            for k, f in zip(order, factor):
+                enhanced = transforms[k](enhanced).enhance(f)
+            img[...] = numpy.asarray(enhanced)
+        return images
+
+    def _sample_crop_boxes(self, sizes):
+        """Sample the inception-style crop boxes for images."""
+        num_images, num_attempts = sizes.shape[0], 10
+        height, width = sizes[:, :1], sizes[:, 1:]
+        log_ratio = (math.log(self._random_ratios[0]),
+                     math.log(self._random_ratios[1]))
+        target_area = numpy.random.uniform(
+            *self._random_scales, size=(num_images, num_attempts))
+        target_area *= (height * width).astype('float64')
+        aspect_ratio = numpy.exp(numpy.random.uniform(
+            *log_ratio, size=(num_images, num_attempts)))
+        w = numpy.round(numpy.sqrt(target_area * aspect_ratio)).astype('int64')
+        h = numpy.round(numpy.sqrt(target_area / aspect_ratio)).astype('int64')
+        valid = (w > 0) & (w <= width) & (h > 0) & (h <= height)
+        # Select the first valid attempt.
+        index = numpy.argmax(valid, axis=1)[:, None]
+        w = numpy.take_along_axis(w, index, 1)
+        h = numpy.take_along_axis(h, index, 1)
+        scale = numpy.random.uniform(size=(num_images, 2))
+        i = (scale[:, :1] * (height - h + 1)).astype('int64')
+        j = (scale[:, 1:] * (width - w + 1)).astype('int64')
+        # Fallback to the center crop.
+        fallback = ~valid.any(axis=1, keepdims=True)
+        if fallback.any():
+            min_ratio = min(self._random_ratios)
+            max_ratio = max(self._random_ratios)
+            in_ratio = width / height
+            w2 = numpy.where(in_ratio > max_ratio,
+                             numpy.round(height * max_ratio), width)
+            h2 = numpy.where(in_ratio < min_ratio,
+                             numpy.round(width / min_ratio), height)
+            w = numpy.where(fallback, w2.astype('int64'), w)
+            h = numpy.where(fallback, h2.astype('int64'), h)
+            i = numpy.where(fallback, (height - h) // 2, i)
+            j = numpy.where(fallback, (width - w) // 2, j)
+        return numpy.concatenate([i, j, h, w], axis=1)
+
+    def _lookup(self, example, index):
+        """Return the cached image and label, or decode the example."""
+        img = self._cache.get(index)
+        if img is None:
+            if example is None:
+                # Read the example missed in cache.
+                self._dataset.redirect(index)
+                example = self._dataset.get()
+            img = self._cache.put(index, self.decode(example))
+            self._labels[index] = example['label']
+        return img, self._labels[index]
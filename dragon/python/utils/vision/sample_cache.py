@@ -0,0 +1,144 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Cache of the decoded samples."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import tempfile
+
+import numpy
+
+
+class SampleCache(object):
+    """Cache the decoded samples by index within a byte budget.
+
+    Samples are kept in memory in the LRU order.
+    Evicted samples are spilled into a memory-mapped file if given:
+
+    ```python
+    cache = SampleCache(max_bytes=2 << 30, spill_bytes=16 << 30)
+    cache.put(index, img)
+    img = cache.get(index)
+    ```
+
+    Returned samples are read-only and shared with the cache.
+
+    """
+
+    def __init__(self, max_bytes, spill_bytes=0, spill_dir=None):
+        """Create a ``SampleCache``.
+
+        Parameters
+        ----------
+        max_bytes : int
+            The max bytes of samples in memory.
+        spill_bytes : int, optional, default=0
+            The max bytes of samples in the spill file.
+        spill_dir : str, optional
+            The directory to create the spill file.
+
+        """
+        self._max_bytes = max_bytes
+        self._nbytes = 0
+        self._entries = collections.OrderedDict()
+        self._spill, self._spill_cursor = None, 0
+        self._spill_entries = {}
+        if spill_bytes > 0:
+            self._spill_file = tempfile.TemporaryFile(dir=spill_dir)
+            self._spill = numpy.memmap(
+                self._spill_file, 'uint8', 'w+', shape=(spill_bytes,))
+        self.hits = self.misses = 0
+
+    @property
+    def nbytes(self):
+        """Return the bytes of samples in memory.
+
+        Returns
+        -------
+        int
+            The number of bytes.
+
+        """
+        return self._nbytes
+
+    def get(self, index):
+        """Return the sample of given index.
+
+        Parameters
+        ----------
+        index : int
+            The index of sample.
+
+        Returns
+        -------
+        numpy.ndarray
+            The sample if cached, otherwise ``None``.
+
+        """
+        value = self._entries.get(index, None)
+        if value is not None:
+            self._entries.move_to_end(index)
+        elif index in self._spill_entries:
+            offset, shape, dtype = self._spill_entries[index]
+            nbytes = int(numpy.prod(shape)) * dtype.itemsize
+            value = self._spill[offset:offset + nbytes]
+            value = value.view(dtype).reshape(shape)
+            value.flags.writeable = False
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, index, value):
+        """Put a sample into the cache.
+
+        Parameters
+        ----------
+        index : int
+            The index of sample.
+        value : numpy.ndarray
+            The sample.
+
+        Returns
+        -------
+        numpy.ndarray
+            The read-only sample in the cache.
+
+        """
+        if index in self._entries or index in self._spill_entries:
+            return self.get(index)
+        value = numpy.ascontiguousarray(value)
+        value.flags.writeable = False
+        if value.nbytes > self._max_bytes:
+            self._spill_sample(index, value)
+            return value
+        while self._nbytes + value.nbytes > self._max_bytes:
+            evicted_index, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+            self._spill_sample(evicted_index, evicted)
+        self._entries[index] = value
+        self._nbytes += value.nbytes
+        return value
+
+    def _spill_sample(self, index, value):
+        """Write a sample into the spill file if available."""
+        if self._spill is None:
+            return
+        if self._spill_cursor + value.nbytes > self._spill.size:
+            return
+        offset = self._spill_cursor
+        self._spill[offset:offset + value.nbytes] = value.reshape(-1).view('uint8')
+        self._spill_entries[index] = (offset, value.shape, value.dtype)
+        self._spill_cursor += value.nbytes
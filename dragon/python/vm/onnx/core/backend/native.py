@@ -53,6 +53,8 @@ class BackendRep(ONNXBackendRep):
             The path of onnx model file.
         device : onnx.Device
             The executing device.
+        optimization : int, optional
+            The optimization level of graph. Defaults to the global config.
 
         """
         if not isinstance(device, Device):
@@ -65,7 +67,8 @@ class BackendRep(ONNXBackendRep):
         else:
             raise ValueError('Unsupported device type: ' + device.type)
         with context.device(device_type, device_index):
-            self._context = GraphLib.from_onnx(model)
+            self._context = GraphLib.from_onnx(
+                model, optimization=kwargs.get('optimization', None))
         self._input_dict = collections.OrderedDict()
         self._output_dict = collections.OrderedDict()
         for input in self._context._def.input:
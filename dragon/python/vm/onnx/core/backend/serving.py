@@ -0,0 +1,307 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Serving backend with the dynamic batching."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import concurrent.futures
+import queue
+import threading
+import time
+
+import numpy
+
+from dragon.core.framework import workspace
+from dragon.core.util import nest
+from dragon.vm.onnx.core.backend.native import BackendRep
+
+
+class ServingRep(object):
+    """ONNX-Dragon backend to serve the concurrent requests.
+
+    Requests are queued and executed by the workers:
+
+    ```python
+    with dragon.onnx.ServingRep('model.onnx', num_workers=2) as rep:
+        future = rep.submit([x])
+        y = future.result()[0]
+    ```
+
+    If all outputs are given in ``batch_outputs``, requests are batched
+    along the first axis when their inputs have the same dtype and trailing
+    shape. A batch whose outputs are not batch-major is executed again
+    per request, so that results of requests are never mixed:
+
+    ```python
+    rep = dragon.onnx.ServingRep('model.onnx', batch_outputs=['y'])
+    ```
+
+    Each worker executes the model in its own workspace,
+    and returns the copied outputs of each request.
+
+    """
+
+    def __init__(
+        self,
+        model,
+        device='CPU:0',
+        num_workers=1,
+        max_batch_size=32,
+        max_latency=0.005,
+        batch_outputs=None,
+        **kwargs
+    ):
+        """Create a ``ServingRep``.
+
+        Parameters
+        ----------
+        model : str
+            The path of onnx model file.
+        device : str, optional, default='CPU:0'
+            The executing device.
+        num_workers : int, optional, default=1
+            The number of workers to execute in parallel.
+        max_batch_size : int, optional, default=32
+            The max number of samples in a batch.
+        max_latency : float, optional, default=0.005
+            The max seconds to wait for a batch.
+        batch_outputs : Sequence[str], optional
+            The outputs to split along the first axis for a batch.
+
+        """
+        if num_workers < 1:
+            raise ValueError('Excepted at least 1 worker, got {}.'.format(num_workers))
+        self._batching = False
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency
+        self._queue = queue.Queue()
+        self._input_names = self._output_names = None
+        self._workers = []
+        ready_events = []
+        for _ in range(num_workers):
+            ready_event = threading.Event()
+            worker = threading.Thread(
+                target=self._worker_loop,
+                args=(model, device, ready_event),
+                kwargs=kwargs)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+            ready_events.append(ready_event)
+        for ready_event in ready_events:
+            ready_event.wait()
+        if self._input_names is None:
+            self.close()
+            raise RuntimeError('Failed to create the workers.')
+        batch_outputs = set(batch_outputs or [])
+        unknown_outputs = batch_outputs.difference(self._output_names)
+        if len(unknown_outputs) > 0:
+            self.close()
+            raise ValueError('Unknown batch outputs: {}.'.format(', '.join(sorted(unknown_outputs))))
+        # Batch only if every output is opted in.
+        self._batching = batch_outputs == set(self._output_names)
+
+    @property
+    def input_names(self):
+        """Return the name of model inputs.
+
+        Returns
+        -------
+        Sequence[str]
+            The input names.
+
+        """
+        return self._input_names
+
+    @property
+    def output_names(self):
+        """Return the name of model outputs.
+
+        Returns
+        -------
+        Sequence[str]
+            The output names.
+
+        """
+        return self._output_names
+
+    def close(self):
+        """Stop the workers after the queued requests are done."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def run(self, inputs, **kwargs):
+        """Run the model and wait for the outputs.
+
+        Parameters
+        ----------
+        inputs : Union[Sequence, Dict]
+            The input arrays.
+
+        Returns
+        -------
+        namedtuple
+            The model outputs.
+
+        """
+        return self.submit(inputs).result()
+
+    def submit(self, inputs):
+        """Submit a request to run the model.
+
+        Parameters
+        ----------
+        inputs : Union[Sequence, Dict]
+            The input arrays.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of model outputs.
+
+        """
+        if not self._workers:
+            raise RuntimeError('Submit to a closed ServingRep.')
+        if isinstance(inputs, numpy.ndarray):
+            inputs = [inputs]
+        if isinstance(inputs, dict):
+            inputs = [inputs[name] for name in self._input_names]
+        elif not nest.is_sequence(inputs):
+            raise ValueError('Excepted sequence or dict inputs.')
+        if len(inputs) != len(self._input_names):
+            raise ValueError('Excepted {} inputs, got {}.'
+                             .format(len(self._input_names), len(inputs)))
+        inputs = [numpy.asarray(value) for value in inputs]
+        future = concurrent.futures.Future()
+        self._queue.put(_Request(inputs, future))
+        return future
+
+    def _get_batch(self, pending):
+        """Return a batch of compatible requests."""
+        if pending:
+            head = pending.popleft()
+        else:
+            head = self._queue.get()
+            if head is None:
+                return None
+        batch, batch_size = [head], head.batch_size
+        deadline = time.time() + self._max_latency
+        if head.signature is None or not self._batching:
+            return batch
+        for _ in range(len(pending)):
+            request = pending.popleft()
+            if (request.signature == head.signature and
+                    batch_size + request.batch_size <= self._max_batch_size):
+                batch.append(request)
+                batch_size += request.batch_size
+            else:
+                pending.append(request)
+        while batch_size < self._max_batch_size:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            if (request.signature == head.signature and
+                    batch_size + request.batch_size <= self._max_batch_size):
+                batch.append(request)
+                batch_size += request.batch_size
+            else:
+                pending.append(request)
+        return batch
+
+    def _run_batch(self, rep, batch):
+        """Run a batch of requests and set the results."""
+        try:
+            if self._run_batch_impl(rep, batch):
+                return
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        # Rerun the requests to keep their outputs apart.
+        for request in batch:
+            self._run_batch(rep, [request])
+
+    @staticmethod
+    def _run_batch_impl(rep, batch):
+        """Run a batch of requests and return if the results are set."""
+        if len(batch) == 1:
+            outputs = rep.run(batch[0].inputs)
+            results = [output.numpy(copy=True) for output in outputs]
+            batch[0].future.set_result(rep._output_tuple(*results))
+            return True
+        inputs = [numpy.concatenate(values) for values in
+                  zip(*[request.inputs for request in batch])]
+        outputs = [output.numpy() for output in rep.run(inputs)]
+        batch_size, start = sum(request.batch_size for request in batch), 0
+        for value in outputs:
+            if value.ndim == 0 or value.shape[0] != batch_size:
+                return False
+        for request in batch:
+            end = start + request.batch_size
+            results = [value[start:end].copy() for value in outputs]
+            request.future.set_result(rep._output_tuple(*results))
+            start = end
+        return True
+
+    def _worker_loop(self, model, device, ready_event, **kwargs):
+        """Loop to execute the requests in a standalone workspace."""
+        execute_ws = workspace.Workspace()
+        try:
+            with execute_ws.as_default():
+                rep = BackendRep(model, device, **kwargs)
+                self._input_names = list(rep._input_dict.keys())
+                self._output_names = list(rep._output_dict.keys())
+        except Exception:
+            ready_event.set()
+            raise
+        ready_event.set()
+        pending = collections.deque()
+        while True:
+            batch = self._get_batch(pending)
+            if batch is None:
+                break
+            self._run_batch(rep, batch)
+        while pending:
+            self._run_batch(rep, [pending.popleft()])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _Request(object):
+    """The request to run the model."""
+
+    def __init__(self, inputs, future):
+        self.inputs = inputs
+        self.future = future
+        self.batch_size, self.signature = 1, None
+        batch_sizes = set(value.shape[0] if value.ndim > 0 else None for value in inputs)
+        if len(batch_sizes) == 1 and None not in batch_sizes:
+            # Batch along the first axis of all inputs.
+            self.batch_size = batch_sizes.pop()
+            self.signature = tuple((value.dtype, value.shape[1:]) for value in inputs)
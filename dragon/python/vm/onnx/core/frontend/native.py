@@ -29,9 +29,11 @@ from dragon.core.autograph.graph_impl import GraphLib
 from dragon.core.framework import types
 from dragon.core.framework import workspace as workspace_util
 from dragon.core.proto import dragon_pb2
+from dragon.core.util import logging
 from dragon.core.util import nest
 from dragon.core.util import serialization
 from dragon.vm.onnx.core import helper
+from dragon.vm.onnx.core import optimizer
 from dragon.vm.onnx.core.exporters import utils as export_util
 
 
@@ -64,6 +66,8 @@ class DragonFrontend(object):
         opset_version=None,
         workspace=None,
         verbose=True,
+        external_data=None,
+        optimize=False,
     ):
         input_names = [] if input_names is None else input_names
         output_names = [] if output_names is None else output_names
@@ -113,6 +117,15 @@ class DragonFrontend(object):
             int, **dict((blob_aliases.get(k, k), 1)
                         for k in helper.collect_inputs(graph_def)))
         initializers, seen_initializers = [], set()
+        graph_inputs, graph_outputs = collections.OrderedDict(), {''}
+        translators = {}
+
+        def add_initializer(tensor):
+            # Move the large data out as soon as the tensor is made.
+            if external_data is not None and not optimize:
+                external_data.write(tensor)
+            initializers.append(tensor)
+            seen_initializers.add(tensor.name)
 
         # Build translator context.
         context = export_util.TranslatorContext(
@@ -126,15 +139,20 @@ class DragonFrontend(object):
         # Add nodes.
         for op in graph_def.op:
             # Get the shape of inputs and outputs.
+            # Each tensor is looked up only once.
             for name in itertools.chain(op.input, op.output):
-                impl = workspace.get_tensor(name)
-                if impl is not None:
-                    blob_shapes[name] = impl.dims
-                else:
-                    blob_shapes[name] = value_info[name][1]
+                if name not in blob_shapes:
+                    impl = workspace.get_tensor(name)
+                    if impl is not None:
+                        blob_shapes[name] = impl.dims
+                    else:
+                        blob_shapes[name] = value_info[name][1]
 
             # Translate definition.
-            nodes, const_tensors = cls._make_node(op, context)
+            if op.type not in translators:
+                translators[op.type] = cls._get_translator(op.type, opset_version)
+            nodes, const_tensors = translators[op.type](op, context)
+            nodes = nest.flatten(nodes)
 
             # Rewritten for names.
             for node in nodes:
@@ -148,24 +166,26 @@ class DragonFrontend(object):
                                  for name in op.output]
             else:
                 onnx_graph.node.extend(nodes)
+                for node in nodes:
+                    for name in node.input:
+                        if name not in graph_outputs:
+                            graph_inputs[name] = True
+                    graph_outputs.update(node.output)
 
             # Merge constant tensors.
             if const_tensors is not None:
-                value_info = {**value_info,
-                              **dict((e.name, (e.data_type, e.dims))
-                                     for e in const_tensors)}
                 for tensor in const_tensors:
+                    value_info[tensor.name] = (tensor.data_type, tensor.dims)
                     if tensor.name not in seen_initializers:
-                        initializers.append(tensor)
-                        seen_initializers.add(tensor.name)
+                        add_initializer(tensor)
 
         # Add constants.
         if constants is not None:
             for k, v in constants.items():
-                initializers.append(helper.from_array(v, name=k))
+                add_initializer(helper.from_array(v, name=k))
 
         # Add inputs.
-        for name in helper.collect_inputs(onnx_graph):
+        for name in graph_inputs.keys():
             try:
                 onnx_graph.input.extend([
                     helper.make_tensor_value_info(
@@ -182,8 +202,7 @@ class DragonFrontend(object):
                             elem_type=initializer.data_type,
                             shape=initializer.dims)])
                     if name not in seen_initializers:
-                        initializers.append(initializer)
-                        seen_initializers.add(initializer.name)
+                        add_initializer(initializer)
                 else:
                     raise ValueError(
                         'Info of tensor `{}` is missing, '
@@ -201,6 +220,18 @@ class DragonFrontend(object):
             for name_v2 in [blob_aliases.get(name, name)
                             for name in set(graph_def.output)])
 
+        # Simplify the graph.
+        if optimize:
+            report = optimizer.GraphOptimizer().optimize(onnx_graph)
+            logging.info(
+                'Optimize graph, nodes: {} -> {}, initializers: {:.2f} MB -> {:.2f} MB'
+                .format(report['nodes'][0], report['nodes'][1],
+                        report['initializer_bytes'][0] / 1e6,
+                        report['initializer_bytes'][1] / 1e6))
+            if external_data is not None:
+                for tensor in onnx_graph.initializer:
+                    external_data.write(tensor)
+
         if verbose:
             print(helper.printable_graph(onnx_graph))
 
@@ -219,6 +250,8 @@ class DragonFrontend(object):
         workspace=None,
         verbose=True,
         enable_onnx_checker=True,
+        external_data=None,
+        optimize=False,
     ):
         opset_id = onnx.OperatorSetIdProto()
         opset_id.domain = ''  # ONNX default domain
@@ -234,6 +267,8 @@ class DragonFrontend(object):
                 opset_id.version,
                 workspace,
                 verbose,
+                external_data,
+                optimize,
             ),
             opset_imports=[opset_id],  # Current supported opset version
             producer_name='onnx-dragon',  # Producer name
@@ -254,7 +289,7 @@ class DragonFrontend(object):
                     detail_msg += '  * Opset = %d, ONNX >= %s,\n' % (k, v)
                 raise ValueError(detail_msg + '}')
         onnx_version = cls.OPSET_VERSIONS[opset_version]
-        if onnx.__version__ < onnx_version:
+        if helper.version_tuple(onnx.__version__) < helper.version_tuple(onnx_version):
             raise RuntimeError(
                 'OpSet {} requires ONNX version >= {}. '
                 '({} currently installed.)'
@@ -280,26 +315,20 @@ class DragonFrontend(object):
         op_def.input.extend(inputs)
         op_def.output.extend(outputs)
 
-    @classmethod
-    def _make_node(cls, op_def, context):
-        """Return a NodeProto from the OpDef."""
-        translate_fn = None
+    @staticmethod
+    def _get_translator(op_type, opset_version):
+        """Return the translate function of an operator type."""
         getter = export_util._GLOBAL_REGISTERED_EXPORTERS.try_get
         # Select the last versioned exporter if necessary.
-        for i in range(context.opset_version, 0, -1):
-            versioned_op_type = op_def.type + '-%d' % i
+        for i in range(opset_version, 0, -1):
+            versioned_op_type = op_type + '-%d' % i
             if getter(versioned_op_type) is not None:
-                translate_fn = getter(versioned_op_type)
-                break
-        if translate_fn is None:
-            if getter(op_def.type) is not None:
-                # Use the non-versioned exporter.
-                translate_fn = getter(op_def.type)
-            else:
-                # Fallback to the generic exporter.
-                translate_fn = export_util.translate
-        nodes, const_tensors = translate_fn(op_def, context)
-        return nest.flatten(nodes), const_tensors
+                return getter(versioned_op_type)
+        if getter(op_type) is not None:
+            # Use the non-versioned exporter.
+            return getter(op_type)
+        # Fallback to the generic exporter.
+        return export_util.translate
 
 
 def record():
@@ -330,6 +359,8 @@ def export(
     opset_version=None,
     verbose=False,
     enable_onnx_checker=True,
+    external_data=False,
+    optimize=False,
 ):
     """Export the recorded graph to an onnx model.
 
@@ -362,6 +393,11 @@ def export(
         Whether to print the debug string of graph.
     enable_onnx_checker : bool, optional, default=True
         Whether to check if model is valid.
+    external_data : bool, optional, default=False
+        Whether to write the large weights into ``f + '.data'``.
+        ``f`` should be a filename if ``True``.
+    optimize : bool, optional, default=False
+        Whether to simplify the graph before saving.
 
     """
     # Process the inputs.
@@ -428,19 +464,29 @@ def export(
             constants[k] = v
 
     # Export.
-    model = graph_def_to_onnx_model(
-        graph_def=graph_def,
-        input_names=input_names,
-        output_names=output_names,
-        input_shapes=input_shapes,
-        constants=constants,
-        value_info=value_info,
-        opset_version=opset_version,
-        workspace=workspace_util.get_workspace(),
-        verbose=verbose,
-        enable_onnx_checker=enable_onnx_checker,
-    )
+    external_data = helper.ExternalDataWriter(f) if external_data else None
+    try:
+        model = graph_def_to_onnx_model(
+            graph_def=graph_def,
+            input_names=input_names,
+            output_names=output_names,
+            input_shapes=input_shapes,
+            constants=constants,
+            value_info=value_info,
+            opset_version=opset_version,
+            workspace=workspace_util.get_workspace(),
+            verbose=verbose,
+            enable_onnx_checker=enable_onnx_checker and external_data is None,
+            external_data=external_data,
+            optimize=optimize,
+        )
+    finally:
+        if external_data is not None:
+            external_data.close()
     serialization.save_bytes(serialization.serialize_proto(model), f)
+    if external_data is not None and enable_onnx_checker:
+        # Check the saved file to locate the external data.
+        onnx.checker.check_model(f)
 
 
 graph_def_to_onnx_graph = DragonFrontend.graph_def_to_onnx_graph
@@ -15,7 +15,12 @@ from __future__ import division
 from __future__ import print_function
 
 import collections
+
 import numpy
+try:
+    import onnx
+except ImportError:
+    onnx = None
 
 from dragon.core.autograph import tape
 from dragon.core.framework import workspace
@@ -36,6 +41,8 @@ def export(
     opset_version=None,
     verbose=False,
     enable_onnx_checker=True,
+    external_data=False,
+    optimize=False,
 ):
     """Export the recorded graph to an onnx model.
 
@@ -110,6 +117,11 @@ def export(
         Whether to print the debug string of graph.
     enable_onnx_checker : bool, optional, default=True
         Whether to check if model is valid.
+    external_data : bool, optional, default=False
+        Whether to write the large weights into ``f + '.data'``.
+        ``f`` should be a filename if ``True``.
+    optimize : bool, optional, default=False
+        Whether to simplify the graph before saving.
 
     """
     # Process the inputs.
@@ -176,16 +188,26 @@ def export(
 
     # Export.
     with execute_ws.as_default():
-        model = graph_def_to_onnx_model(
-            graph_def=graph_def,
-            input_names=input_names,
-            output_names=output_names,
-            input_shapes=input_shapes,
-            constants=constants,
-            value_info=value_info,
-            opset_version=opset_version,
-            workspace=execute_ws,
-            verbose=verbose,
-            enable_onnx_checker=enable_onnx_checker,
-        )
+        external_data = helper.ExternalDataWriter(f) if external_data else None
+        try:
+            model = graph_def_to_onnx_model(
+                graph_def=graph_def,
+                input_names=input_names,
+                output_names=output_names,
+                input_shapes=input_shapes,
+                constants=constants,
+                value_info=value_info,
+                opset_version=opset_version,
+                workspace=execute_ws,
+                verbose=verbose,
+                enable_onnx_checker=enable_onnx_checker and external_data is None,
+                external_data=external_data,
+                optimize=optimize,
+            )
+        finally:
+            if external_data is not None:
+                external_data.close()
         serialization.save_bytes(serialization.serialize_proto(model), f)
+        if external_data is not None and enable_onnx_checker:
+            # Check the saved file to locate the external data.
+            onnx.checker.check_model(f)
@@ -17,32 +17,81 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import re
 import sys
 
 import numpy
 try:
     from onnx import mapping
+    from onnx import TensorProto
     from onnx.backend.base import namedtupledict
     from onnx.helper import make_attribute
     from onnx.helper import make_graph
     from onnx.helper import make_model
     from onnx.helper import make_node
+    from onnx.helper import make_opsetid
     from onnx.helper import make_tensor
     from onnx.helper import make_tensor_value_info
     from onnx.helper import printable_graph
     from onnx.numpy_helper import from_array
+    from onnx.numpy_helper import to_array
+    from onnx.shape_inference import infer_shapes
 except ImportError:
     from dragon.core.util import deprecation
     mapping = deprecation.NotInstalled('onnx')
+    TensorProto = deprecation.NotInstalled('onnx')
     namedtupledict = deprecation.not_installed('onnx')
     make_attribute = deprecation.not_installed('onnx')
     make_graph = deprecation.not_installed('onnx')
     make_model = deprecation.not_installed('onnx')
     make_node = deprecation.not_installed('onnx')
+    make_opsetid = deprecation.not_installed('onnx')
     make_tensor = deprecation.not_installed('onnx')
     make_tensor_value_info = deprecation.not_installed('onnx')
     printable_graph = deprecation.not_installed('onnx')
     from_array = deprecation.not_installed('onnx')
+    to_array = deprecation.not_installed('onnx')
+    infer_shapes = deprecation.not_installed('onnx')
+
+
+class ExternalDataWriter(object):
+    """Write the data of large tensors into an external file."""
+
+    def __init__(self, filename, size_threshold=1024, alignment=64):
+        if not isinstance(filename, str):
+            raise TypeError(
+                'Excepted a filename to write the external data, got {}.\n'
+                'File-like object is not supported with <external_data>.'
+                .format(type(filename).__name__))
+        self.location = os.path.basename(filename) + '.data'
+        self._file = open(os.path.join(
+            os.path.dirname(filename), self.location), 'wb')
+        self._size_threshold = size_threshold
+        self._alignment = alignment
+        self._offset = 0
+
+    def write(self, tensor):
+        """Move the raw data of a tensor proto into the file."""
+        nbytes = len(tensor.raw_data)
+        if nbytes < self._size_threshold:
+            return tensor
+        padding = -self._offset % self._alignment
+        self._file.write(b'\0' * padding)
+        self._file.write(tensor.raw_data)
+        self._offset += padding
+        for key, value in (('location', self.location),
+                           ('offset', str(self._offset)),
+                           ('length', str(nbytes))):
+            tensor.external_data.add(key=key, value=value)
+        tensor.data_location = TensorProto.EXTERNAL
+        tensor.ClearField('raw_data')
+        self._offset += nbytes
+        return tensor
+
+    def close(self):
+        """Close the file."""
+        self._file.close()
 
 
 def add_attribute(node_proto, name, value):
@@ -137,3 +186,8 @@ def make_model_from_node(node_proto, inputs, use_weights=True):
 def tensor_type(type_str):
     """Return the tensor type from a string descriptor."""
     return mapping.NP_TYPE_TO_TENSOR_TYPE[numpy.dtype(type_str.lower())]
+
+
+def version_tuple(version):
+    """Return the comparable tuple of a version string."""
+    return tuple(int(v) for v in re.findall(r'\d+', version)[:3])
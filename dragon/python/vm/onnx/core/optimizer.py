@@ -0,0 +1,362 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Simplification passes of the onnx graph."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import os
+import shutil
+import tempfile
+
+import numpy
+
+from dragon.core.framework import workspace
+from dragon.vm.onnx.core import helper
+
+
+class GraphOptimizer(object):
+    """Simplify the onnx graph for the inference runtimes.
+
+    The passes are applied in place and in the following order:
+
+    * ``fold_constants``: Compute the nodes of constant inputs on CPU.
+    * ``eliminate_identity``: Remove the ``Identity`` and ``Dropout`` nodes.
+    * ``fuse_conv_bn``: Fold ``BatchNormalization`` into the prior ``Conv``.
+    * ``fuse_gemm_bias``: Fold the constant ``Add`` into the prior ``Gemm``.
+    * ``dedupe_initializers``: Share the initializers of same value.
+    * ``eliminate_dead_nodes``: Remove the nodes and initializers not used.
+
+    """
+
+    PASSES = (
+        'fold_constants',
+        'eliminate_identity',
+        'fuse_conv_bn',
+        'fuse_gemm_bias',
+        'dedupe_initializers',
+        'eliminate_dead_nodes',
+    )
+
+    # The node types that could be computed by the dragon backend.
+    FOLDABLE_TYPES = {
+        'Abs', 'Add', 'Cast', 'Concat', 'Div', 'Exp', 'Log', 'Mul', 'Neg',
+        'Pow', 'Reciprocal', 'Reshape', 'Sqrt', 'Sub', 'Transpose',
+    }
+
+    # The opset version targeted by the dragon importer.
+    FOLDING_OPSET_VERSION = 11
+
+    def __init__(self, passes=None):
+        """Create a ``GraphOptimizer``.
+
+        Parameters
+        ----------
+        passes : Sequence[str], optional
+            The passes to apply. Defaults to all passes.
+
+        """
+        passes = self.PASSES if passes is None else passes
+        for name in passes:
+            if name not in self.PASSES:
+                raise ValueError('Unknown pass: ' + name)
+        self._passes = [name for name in self.PASSES if name in passes]
+
+    def optimize(self, graph):
+        """Apply the passes to the graph.
+
+        Parameters
+        ----------
+        graph : onnx.GraphProto
+            The graph to optimize.
+
+        Returns
+        -------
+        Dict
+            The report of node and initializer reductions.
+
+        """
+        report = collections.OrderedDict()
+        report['nodes'] = [len(graph.node)]
+        report['initializer_bytes'] = [_initializer_bytes(graph)]
+        for name in self._passes:
+            report[name] = getattr(self, '_' + name)(graph)
+        report['nodes'].append(len(graph.node))
+        report['initializer_bytes'].append(_initializer_bytes(graph))
+        return report
+
+    def _fold_constants(self, graph):
+        """Compute the nodes whose inputs are all constants."""
+        constants = set(e.name for e in graph.initializer)
+        constants.add('')
+        const_nodes, folded_nodes, folded_outputs = [], [], []
+        for node in graph.node:
+            if node.op_type == 'Constant':
+                # Lift the constant value into an initializer.
+                if len(node.attribute) == 1 and node.attribute[0].name == 'value':
+                    tensor = graph.initializer.add()
+                    tensor.CopyFrom(node.attribute[0].t)
+                    tensor.name = node.output[0]
+                    const_nodes.append(node)
+                    constants.add(node.output[0])
+                continue
+            if node.op_type not in self.FOLDABLE_TYPES:
+                continue
+            if not all(name in constants for name in node.input):
+                continue
+            folded_nodes.append(node)
+            folded_outputs.extend(node.output)
+            constants.update(node.output)
+        if len(folded_nodes) > 0:
+            values = self._run_nodes(graph, folded_nodes, folded_outputs)
+            graph.initializer.extend(helper.from_array(v, name=k)
+                                     for k, v in zip(folded_outputs, values))
+        _remove_nodes(graph, const_nodes + folded_nodes)
+        return len(const_nodes) + len(folded_nodes)
+
+    def _run_nodes(self, graph, nodes, outputs):
+        """Run the nodes with the dragon backend."""
+        from dragon.vm.onnx.core.backend.native import BackendRep
+        inputs = set(name for node in nodes for name in node.input)
+        initializers = [e for e in graph.initializer if e.name in inputs]
+        opset_imports = [helper.make_opsetid('', self.FOLDING_OPSET_VERSION)]
+        # Infer the output types, e.g. ``Cast`` and ``Reshape`` to int64.
+        model = helper.infer_shapes(helper.make_model(helper.make_graph(
+            nodes, 'fold-constants', [], [], initializer=initializers),
+            opset_imports=opset_imports))
+        output_types = dict((e.name, e.type.tensor_type.elem_type)
+                            for e in model.graph.value_info)
+        sub_graph = helper.make_graph(
+            nodes, 'fold-constants', [],
+            [helper.make_tensor_value_info(
+                name, output_types.get(name, helper.TensorProto.UNDEFINED), None)
+             for name in outputs],
+            initializer=initializers)
+        model = helper.make_model(sub_graph, opset_imports=opset_imports)
+        model_dir = tempfile.mkdtemp()
+        try:
+            model_file = os.path.join(model_dir, 'model.onnx')
+            with open(model_file, 'wb') as f:
+                f.write(model.SerializeToString())
+            with workspace.Workspace().as_default():
+                # Disable the inplace to keep all outputs.
+                outputs = BackendRep(model_file, 'CPU:0', optimization=1).run([])
+                return [x.numpy(copy=True) for x in outputs]
+        finally:
+            shutil.rmtree(model_dir)
+
+    @staticmethod
+    def _eliminate_identity(graph):
+        """Remove the identity nodes."""
+        graph_outputs = set(e.name for e in graph.output)
+        consumers = _get_consumers(graph)
+        aliases, removed_nodes = {}, []
+        for node in graph.node:
+            for i, name in enumerate(node.input):
+                node.input[i] = aliases.get(name, name)
+            if node.op_type not in ('Identity', 'Dropout'):
+                continue
+            if node.output[0] in graph_outputs:
+                continue
+            if len(node.output) > 1 and len(consumers[node.output[1]]) > 0:
+                continue  # The dropout mask is required.
+            aliases[node.output[0]] = node.input[0]
+            removed_nodes.append(node)
+        _remove_nodes(graph, removed_nodes)
+        return len(removed_nodes)
+
+    @staticmethod
+    def _fuse_conv_bn(graph):
+        """Fold the batch normalization into the convolution."""
+        graph_outputs = set(e.name for e in graph.output)
+        consumers = _get_consumers(graph)
+        producers = _get_producers(graph)
+        initializers = _get_initializers(graph)
+        removed_nodes = []
+        for bn in graph.node:
+            if bn.op_type != 'BatchNormalization':
+                continue
+            conv = producers.get(bn.input[0], None)
+            if conv is None or conv.op_type != 'Conv':
+                continue
+            if bn.input[0] in graph_outputs or len(consumers[bn.input[0]]) > 1:
+                continue
+            if len([name for name in bn.output if name]) > 1:
+                continue
+            if not all(name in initializers for name in
+                       list(bn.input[1:]) + list(conv.input[1:])):
+                continue
+            scale, bias, mean, var = [helper.to_array(initializers[name])
+                                      for name in bn.input[1:5]]
+            weight = helper.to_array(initializers[conv.input[1]])
+            conv_bias = numpy.zeros_like(mean)
+            if len(conv.input) > 2:
+                conv_bias = helper.to_array(initializers[conv.input[2]])
+            epsilon = 1e-5
+            for attr in bn.attribute:
+                if attr.name == 'epsilon':
+                    epsilon = attr.f
+            alpha = scale / numpy.sqrt(var + epsilon)
+            weight = weight * alpha.reshape([-1] + [1] * (weight.ndim - 1))
+            conv_bias = (conv_bias - mean) * alpha + bias
+            new_inputs = []
+            for name, value in ((conv.input[1], weight), (bn.input[2], conv_bias)):
+                new_inputs.append(_unique_name(name + '/fused', initializers))
+                initializers[new_inputs[-1]] = helper.from_array(
+                    value.astype(weight.dtype), new_inputs[-1])
+                graph.initializer.extend([initializers[new_inputs[-1]]])
+            del conv.input[1:]
+            conv.input.extend(new_inputs)
+            conv.output[0] = bn.output[0]
+            producers[bn.output[0]] = conv
+            removed_nodes.append(bn)
+        _remove_nodes(graph, removed_nodes)
+        return len(removed_nodes)
+
+    @staticmethod
+    def _fuse_gemm_bias(graph):
+        """Fold the constant bias into the general matmul."""
+        graph_outputs = set(e.name for e in graph.output)
+        consumers = _get_consumers(graph)
+        producers = _get_producers(graph)
+        initializers = _get_initializers(graph)
+        removed_nodes = []
+        for add in graph.node:
+            if add.op_type != 'Add':
+                continue
+            for i in range(2):
+                gemm = producers.get(add.input[i], None)
+                bias_name = add.input[1 - i]
+                if gemm is None or gemm.op_type != 'Gemm' or len(gemm.input) > 2:
+                    continue
+                if add.input[i] in graph_outputs or len(consumers[add.input[i]]) > 1:
+                    continue
+                if bias_name not in initializers:
+                    continue
+                bias = helper.to_array(initializers[bias_name])
+                if bias.ndim > 2 or (bias.ndim == 2 and bias.shape[0] != 1):
+                    continue
+                beta = 1.
+                for attr in gemm.attribute:
+                    if attr.name == 'beta':
+                        beta = attr.f
+                if beta != 1.:
+                    if beta == 0.:
+                        continue
+                    bias_name = _unique_name(bias_name + '/fused', initializers)
+                    initializers[bias_name] = helper.from_array(
+                        (bias / beta).astype(bias.dtype), bias_name)
+                    graph.initializer.extend([initializers[bias_name]])
+                gemm.input.extend([bias_name])
+                gemm.output[0] = add.output[0]
+                producers[add.output[0]] = gemm
+                removed_nodes.append(add)
+                break
+        _remove_nodes(graph, removed_nodes)
+        return len(removed_nodes)
+
+    @staticmethod
+    def _dedupe_initializers(graph):
+        """Share the initializers of same value."""
+        graph_outputs = set(e.name for e in graph.output)
+        aliases, seen_values = {}, {}
+        for tensor in graph.initializer:
+            if tensor.name in graph_outputs:
+                continue
+            value = helper.to_array(tensor)
+            key = (tensor.data_type, tuple(tensor.dims), value.tobytes())
+            if key in seen_values:
+                aliases[tensor.name] = seen_values[key]
+            else:
+                seen_values[key] = tensor.name
+        for node in graph.node:
+            for i, name in enumerate(node.input):
+                node.input[i] = aliases.get(name, name)
+        _remove_initializers(graph, aliases)
+        return len(aliases)
+
+    @staticmethod
+    def _eliminate_dead_nodes(graph):
+        """Remove the nodes and initializers not used."""
+        used_names = set(e.name for e in graph.output)
+        removed_nodes = []
+        for node in reversed(graph.node):
+            if any(name in used_names for name in node.output):
+                used_names.update(node.input)
+            else:
+                removed_nodes.append(node)
+        _remove_nodes(graph, removed_nodes)
+        _remove_initializers(graph, set(e.name for e in graph.initializer
+                                        if e.name not in used_names))
+        return len(removed_nodes)
+
+
+def _get_consumers(graph):
+    """Return the consumer nodes of each tensor."""
+    consumers = collections.defaultdict(list)
+    for node in graph.node:
+        for name in node.input:
+            consumers[name].append(node)
+    return consumers
+
+
+def _get_initializers(graph):
+    """Return the initializer of each name."""
+    return dict((e.name, e) for e in graph.initializer)
+
+
+def _get_producers(graph):
+    """Return the producer node of each tensor."""
+    producers = {}
+    for node in graph.node:
+        for name in node.output:
+            producers[name] = node
+    return producers
+
+
+def _initializer_bytes(graph):
+    """Return the total bytes of initializers."""
+    total_bytes = 0
+    for tensor in graph.initializer:
+        dtype = numpy.dtype(helper.mapping.TENSOR_TYPE_TO_NP_TYPE[tensor.data_type])
+        total_bytes += dtype.itemsize * int(numpy.prod(tensor.dims))
+    return total_bytes
+
+
+def _remove_initializers(graph, names):
+    """Remove the initializers and their inputs."""
+    if len(names) == 0:
+        return
+    for field in ('initializer', 'input'):
+        kept = [e for e in getattr(graph, field) if e.name not in names]
+        graph.ClearField(field)
+        getattr(graph, field).extend(kept)
+
+
+def _remove_nodes(graph, nodes):
+    """Remove the nodes from graph."""
+    if len(nodes) == 0:
+        return
+    removed_ids = set(id(node) for node in nodes)
+    kept = [node for node in graph.node if id(node) not in removed_ids]
+    graph.ClearField('node')
+    graph.node.extend(kept)
+
+
+def _unique_name(name, names):
+    """Return a name not in the given names."""
+    index, unique_name = 0, name
+    while unique_name in names:
+        index += 1
+        unique_name = name + '_%d' % index
+    return unique_name
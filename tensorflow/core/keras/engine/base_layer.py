@@ -19,6 +19,11 @@ from __future__ import print_function
 
 import itertools
 
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
 from dragon.core.framework import context
 from dragon.core.util import nest
 from dragon.vm.tensorflow.core.framework import dtypes
@@ -303,6 +308,9 @@ class Layer(module.Module):
     def load_weights(self, filepath, verbose=False):
         """Load the value of weights from a binary file.
 
+        Weights are matched by name, and only the matched values are read.
+        For HDF5 format, values are memory-mapped from the file if possible.
+
         Parameters
         ----------
         filepath : str, required
@@ -312,7 +320,10 @@ class Layer(module.Module):
 
         """
         if _is_hdf5_filepath(filepath):
-            raise ValueError('HDF5 format will be supported in the future.')
+            if h5py is None:
+                raise ImportError('Package <h5py> is required to load weights.')
+            with h5py.File(filepath, 'r') as f:
+                saving.load_weights_from_hdf5_group(f, self, verbose)
         elif _is_pkl_filepath(filepath):
             with open(filepath, 'rb') as f:
                 saving.load_weights_from_pickle(f, self, verbose)
@@ -352,7 +363,11 @@ class Layer(module.Module):
         if save_format == 'tf':
             raise ValueError('TensorFlow format will never be supported.')
         if save_format == 'h5':
-            raise ValueError('HDF5 format will be supported in the future.')
+            if h5py is None:
+                raise ImportError('Package <h5py> is required to save weights.')
+            with h5py.File(filepath, 'w') as f:
+                saving.save_weights_to_hdf5_group(f, self)
+            return
         with open(filepath, 'wb') as f:
             saving.save_weights_to_pickle(f, self)
 
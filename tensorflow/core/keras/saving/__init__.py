@@ -13,5 +13,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from dragon.vm.tensorflow.core.keras.saving.hdf5_format import load_weights_from_hdf5_group
+from dragon.vm.tensorflow.core.keras.saving.hdf5_format import save_weights_to_hdf5_group
 from dragon.vm.tensorflow.core.keras.saving.pickle_format import load_weights_from_pickle
 from dragon.vm.tensorflow.core.keras.saving.pickle_format import save_weights_to_pickle
@@ -0,0 +1,83 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# Codes are based on:
+#
+#     <https://github.com/tensorflow/tensorflow/blob/master/tensorflow/python/keras/saving/hdf5_format.py>
+#
+# ------------------------------------------------------------
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+import numpy
+
+from dragon.core.framework import workspace
+from dragon.core.util import logging
+
+
+def load_weights_from_hdf5_group(f, layer, verbose=False):
+    if h5py is None:
+        raise ImportError('Package <h5py> is required to load weights.')
+    default_ws = workspace.get_workspace()
+    weight_names = set(n.decode('utf8') for n in f.attrs['weight_names'])
+    for weight in layer.weights:
+        name = weight.name
+        if name in weight_names:
+            dataset = f[name]
+            value_shape = list(dataset.shape)
+            weight_shape = list(weight.shape)
+            if value_shape != weight_shape:
+                raise ValueError(
+                    'Shape of weight({}) is ({}), \n'
+                    'While load from shape of ({}).'
+                    .format(name, ', '.join(
+                        [str(d) for d in weight_shape]),
+                        ', '.join([str(d) for d in value_shape]))
+                )
+            weight_impl = default_ws.get_tensor(weight.id)
+            if weight_impl is not None:
+                weight_impl.FromNumpy(_read_dataset(dataset), True)
+                if verbose:
+                    logging.info(
+                        'Weight({}) loaded, Size: ({})'
+                        .format(name, ', '.join([str(d) for d in value_shape])))
+            else:
+                logging.warning(
+                    'Weight({}) is not created '
+                    'in current workspace. Skip.'.format(name))
+
+
+def save_weights_to_hdf5_group(f, layer):
+    if h5py is None:
+        raise ImportError('Package <h5py> is required to save weights.')
+    default_ws = workspace.get_workspace()
+    weight_names = []
+    for weight in layer.weights:
+        weight_impl = default_ws.get_tensor(weight.id)
+        if weight_impl is not None:
+            # Use the contiguous layout to map the data when loading.
+            value = weight_impl.ToNumpy()
+            f.create_dataset(weight.name, data=value)
+            weight_names.append(weight.name.encode('utf8'))
+    f.attrs['weight_names'] = weight_names
+
+
+def _read_dataset(dataset):
+    """Return the dataset value mapping the file if possible."""
+    offset = dataset.id.get_offset()
+    if offset is None or dataset.chunks is not None or dataset.size == 0:
+        return dataset[()]
+    return numpy.memmap(dataset.file.filename, dataset.dtype,
+                        'r', offset, dataset.shape)
@@ -45,7 +45,7 @@ def load_weights_from_pickle(f, layer, verbose=False):
                 )
             weight_impl = default_ws.get_tensor(weight.id)
             if weight_impl is not None:
-                weight_impl.FromNumpy(value.copy(), True)
+                weight_impl.FromNumpy(value, True)
                 if verbose:
                     logging.info(
                         'Weight({}) loaded, Size: ({})'
@@ -0,0 +1,87 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Test the solver module."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.vm import caffe
+
+
+NET_PROTO = """
+name: "net"
+layer { name: "data" type: "Input" top: "data" input_param { shape { dim: 2 dim: 3 } } }
+layer {
+  name: "fc" type: "InnerProduct" bottom: "data" top: "fc"
+  inner_product_param { num_output: 4 weight_filler { type: "gaussian" std: 0.1 } }
+}
+"""
+
+SOLVER_PROTO = """
+net: "{}"
+base_lr: 0.01
+lr_policy: "fixed"
+snapshot_prefix: "{}"
+"""
+
+
+class TestSolver(unittest.TestCase):
+    """Test the solver class."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.net_file = os.path.join(self.path, 'net.prototxt')
+        with open(self.net_file, 'w') as f:
+            f.write(NET_PROTO)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def new_solver(self, prefix, max_async_snapshots):
+        solver_file = os.path.join(self.path, 'solver.prototxt')
+        with open(solver_file, 'w') as f:
+            f.write(SOLVER_PROTO.format(self.net_file, prefix))
+        return caffe.SGDSolver(solver_file, max_async_snapshots=max_async_snapshots)
+
+    def test_async_snapshot(self):
+        solver = self.new_solver(os.path.join(self.path, 'async'), 2)
+        weight = solver.net.params['fc'][0].data.numpy().copy()
+        for i in range(5):
+            solver.iter = i
+            solver.snapshot()
+            self.assertLessEqual(len(solver._snapshot_threads), 2)
+        solver.wait_snapshots()
+        self.assertEqual(len(solver._snapshot_threads), 0)
+        files = sorted(os.listdir(self.path))
+        self.assertFalse([name for name in files if name.endswith('.tmp')])
+        self.assertEqual(files.count('async_iter_4.caffemodel'), 1)
+        self.assertEqual(len([name for name in files if name.endswith('.caffemodel')]), 5)
+        net = caffe.Net(self.net_file, 'TEST', weights=os.path.join(
+            self.path, 'async_iter_4.caffemodel'))
+        self.assertEqual(net.params['fc'][0].data.numpy().tolist(), weight.tolist())
+
+    def test_async_snapshot_error(self):
+        solver = self.new_solver(os.path.join(self.path, 'missing', 'async'), 1)
+        solver.snapshot()
+        with self.assertRaises(IOError):
+            solver.wait_snapshots()
+        solver.wait_snapshots()
+
+
+if __name__ == '__main__':
+    run_tests()
@@ -18,6 +18,8 @@ import functools
 import unittest
 
 import dragon
+import numpy as np
+from dragon.core.autograph import function_impl
 from dragon.core.framework import config
 from dragon.core.testing.unittest.common_utils import run_tests
 
@@ -78,6 +80,153 @@ class TestFunction(unittest.TestCase):
         except ValueError:
             pass
 
+    def test_function_cache(self):
+        @dragon.function(max_cache_size=2, relax_shapes_after=2)
+        def func3(a, **kwargs):
+            _ = kwargs
+            return a * 1
+        self.assertEqual(func3([1, 2]).numpy().tolist(), [1, 2])
+        self.assertEqual(func3([3, 4]).numpy().tolist(), [3, 4])
+        self.assertEqual(func3.cache_info()[:3], (1, 1, 0))
+        self.assertEqual(func3([[1, 2]]).numpy().tolist(), [[1, 2]])
+        self.assertEqual(func3([1., 2.]).numpy().tolist(), [1., 2.])
+        self.assertEqual(func3.cache_info()[:3], (1, 3, 2))
+        self.assertEqual(func3.cache_info()[-1], 2)
+        self.assertEqual(func3([1, 2], flag=True).numpy().tolist(), [1, 2])
+        self.assertEqual(func3.cache_info()[:3], (1, 4, 3))
+        for shape in ((2, 3), (3, 3), (4, 3), (5, 3)):
+            x = np.ones(shape, 'float32')
+            self.assertEqual(func3(x).shape, shape)
+        self.assertEqual(func3.cache_info()[:3], (2, 7, 6))
+        func3.clear_cache()
+        self.assertEqual(func3.cache_info()[:3], (0, 0, 0))
+
+    def test_function_kwargs_key(self):
+        make_hashable = function_impl._make_hashable
+        x1, x2 = np.ones((2, 3), 'float32'), np.ones((3, 2), 'float32')
+        self.assertEqual(make_hashable({'x': x1}), make_hashable({'x': x1.copy()}))
+        self.assertNotEqual(make_hashable({'x': x1}), make_hashable({'x': x2}))
+        self.assertNotEqual(make_hashable({'x': x1}), make_hashable({'x': x1 * 2}))
+        self.assertEqual(make_hashable({'y': {1, 2}}), make_hashable({'y': {2, 1}}))
+        with self.assertRaises(TypeError):
+            make_hashable({'z': bytearray(1)})
+
+    def test_dag_function(self):
+        def func4(x):
+            branches = [dragon.nn.relu(x * float(i)) for i in range(4)]
+            return functools.reduce(lambda a, b: a + b, branches, x)
+        x = np.random.randn(2, 3).astype('float32')
+        expected = x + sum(np.maximum(x * float(i), 0) for i in range(4))
+        dragon.autograph.set_scheduler('DAG')
+        try:
+            f = dragon.function(func4)
+            for _ in range(3):
+                self.assertEqual(f(x).shape, (2, 3))
+                np.testing.assert_allclose(f(x).numpy(), expected, rtol=1e-5)
+        finally:
+            dragon.autograph.set_scheduler('SIMPLE')
+
+    def test_dag_conv_function(self):
+        rng = np.random.RandomState(1337)
+        weights = [dragon.constant(rng.randn(4, 3, k, k).astype('float32')) for k in (1, 3, 5, 3)]
+
+        def func7(x):
+            branches = []
+            for i, w in enumerate(weights):
+                kernel_shape = int(w.shape[-1])
+                y = dragon.nn.conv2d([x, w], kernel_shape=kernel_shape, pads=kernel_shape // 2)
+                y = dragon.transpose(y * float(i + 1), (0, 2, 3, 1))
+                branches.append(dragon.math.matmul([y, dragon.constant(np.eye(4, dtype='float32'))]))
+            return dragon.concat(branches, axis=-1)
+        inputs = [rng.randn(2, 3, size, size).astype('float32') for size in (8, 16, 8)]
+        results, num_threads = [], dragon.get_num_threads()
+        try:
+            dragon.set_num_threads(4)
+            for scheduler in ('SIMPLE', 'DAG'):
+                dragon.autograph.set_scheduler(scheduler)
+                f = dragon.function(func7)
+                results.append([f(x).numpy().copy() for x in inputs for _ in range(3)])
+        finally:
+            dragon.autograph.set_scheduler('SIMPLE')
+            dragon.set_num_threads(num_threads)
+        for y1, y2 in zip(*results):
+            np.testing.assert_allclose(y1, y2, rtol=1e-5, atol=1e-5)
+
+    def test_inference_optimization(self):
+        rng = np.random.RandomState(1337)
+        w1 = dragon.constant(rng.randn(4, 3, 3, 3).astype('float32'))
+        w2 = dragon.constant(rng.randn(36, 6).astype('float32'))
+        b1, b2 = [dragon.constant(rng.randn(dim).astype('float32')) for dim in (4, 6)]
+        bn1, bn2 = [[dragon.constant(rng.randn(dim).astype('float32')) for _ in range(3)] +
+                    [dragon.constant(rng.rand(dim).astype('float32') + 0.5)] for dim in (4, 6)]
+
+        def func5(x):
+            y = dragon.nn.conv2d([x, w1], kernel_shape=3)
+            y = dragon.nn.bias_add([y, b1], 'NCHW')
+            y = dragon.nn.relu(dragon.nn.batch_norm([y] + bn1, axis=1))
+            y = dragon.reshape(dragon.nn.dropout(dragon.identity(y)), (2, -1))
+            z = dragon.nn.bias_add([dragon.math.gemm([y, w2]), b2], 'NHWC')
+            return dragon.nn.relu(dragon.nn.batch_norm([z] + bn2, axis=-1)), y
+        x = rng.randn(2, 3, 5, 5).astype('float32')
+        results = []
+        try:
+            for level in (3, 4):
+                dragon.autograph.set_optimization(level)
+                f = dragon.function(func5)
+                results.append([y.numpy().copy() for y in f(x)])
+        finally:
+            dragon.autograph.set_optimization(3)
+        for y1, y2 in zip(*results):
+            np.testing.assert_allclose(y1, y2, rtol=1e-4, atol=1e-4)
+
+    def test_refold_parameters(self):
+        rng = np.random.RandomState(1337)
+        w = dragon.constant(rng.randn(4, 3, 3, 3).astype('float32'))
+        bn = [dragon.constant(rng.randn(4).astype('float32')) for _ in range(3)] + \
+            [dragon.constant(rng.rand(4).astype('float32') + 0.5)]
+
+        def func7(x):
+            y = dragon.nn.conv2d([x, w], kernel_shape=3)
+            return dragon.nn.batch_norm([y] + bn, axis=1)
+        x = rng.randn(2, 3, 5, 5).astype('float32')
+        results = []
+        try:
+            dragon.autograph.set_optimization(4)
+            f = dragon.function(func7)
+            results.append(f(x).numpy().copy())
+            with dragon.eager_mode():
+                dragon.assign([w, dragon.constant(rng.randn(4, 3, 3, 3).astype('float32'))])
+                dragon.assign([bn[2], dragon.constant(rng.randn(4).astype('float32'))])
+            results.append(f(x).numpy().copy())
+            dragon.autograph.set_optimization(3)
+            results.append(dragon.function(func7)(x).numpy().copy())
+        finally:
+            dragon.autograph.set_optimization(3)
+        self.assertFalse(np.allclose(results[0], results[1]))
+        np.testing.assert_allclose(results[1], results[2], rtol=1e-4, atol=1e-4)
+
+    def test_memory_planning(self):
+        rng = np.random.RandomState(1337)
+        w = dragon.constant(rng.randn(4, 3, 3, 3).astype('float32'))
+
+        def func6(x):
+            y = dragon.nn.relu(dragon.nn.conv2d([x, w], kernel_shape=3, pads=1))
+            z = dragon.math.sigmoid(y) * dragon.math.tanh(y) + y
+            return dragon.math.sum(z * z, axis=1), dragon.math.exp(dragon.math.negative(z))
+        inputs = [rng.randn(*shape).astype('float32') for shape in
+                  [(2, 3, 5, 5), (2, 3, 5, 5), (4, 3, 7, 7), (1, 3, 5, 5)]]
+        results = []
+        try:
+            for level in (3, 5):
+                dragon.autograph.set_optimization(level)
+                f = dragon.function(func6, input_signature=[dragon.Tensor(None, symbolic=True)])
+                results.append([[y.numpy().copy() for y in f(x)] for x in inputs])
+        finally:
+            dragon.autograph.set_optimization(3)
+        for ys1, ys2 in zip(*results):
+            for y1, y2 in zip(ys1, ys2):
+                np.testing.assert_allclose(y1, y2, rtol=1e-5, atol=1e-5)
+
     def test_update_function(self):
         optimizer = dragon.optimizers.SGD(lr=1, momentum=0)
         try:
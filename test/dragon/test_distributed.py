@@ -14,11 +14,19 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
 
+import numpy
+
 import dragon
 from dragon.core.testing.unittest.common_utils import run_tests
 from dragon.core.testing.unittest.common_utils import TEST_MPI
+from dragon.vm import torch
 
 
 class TestBackend(unittest.TestCase):
@@ -47,5 +55,55 @@ class TestBackend(unittest.TestCase):
             self.assertEqual(dragon.distributed.get_rank(group), 0)
 
 
+class TestReducer(unittest.TestCase):
+    """Test the gradient reducer."""
+
+    @unittest.skipIf(not TEST_MPI, 'MPI unavailable')
+    def test_bucket_single_process(self):
+        group = dragon.distributed.new_group(ranks=[0], backend='MPI', bucket_size=32)
+        with group.as_default():
+            w = torch.nn.Parameter(torch.ones(2))
+            b = torch.ones(2, requires_grad=True)
+            h = w * 2
+            h.retain_grad()
+            (h * b).sum().backward()
+            self.assertEqual(h.grad.numpy().tolist(), [1., 1.])
+            self.assertEqual(w.grad.numpy().tolist(), [2., 2.])
+            torch.optim.SGD([w, b], lr=1).step()
+            self.assertEqual(w.numpy().tolist(), [-1., -1.])
+            self.assertEqual(b.numpy().tolist(), [-1., -1.])
+
+    @unittest.skipIf(not TEST_MPI or shutil.which('mpirun') is None, 'MPI unavailable')
+    def test_bucket_multi_process(self):
+        script = '\n'.join([
+            'import dragon',
+            'from dragon.vm import torch',
+            'rank = dragon.distributed.get_rank()',
+            "group = dragon.distributed.new_group([0, 1], 'MPI', bucket_size=32)",
+            'with group.as_default():',
+            '    weights = [torch.nn.Parameter(torch.ones(2, 3)) for _ in range(3)]',
+            '    hidden = weights[0] * 1',
+            '    hidden.retain_grad()',
+            '    loss = hidden.sum() * (rank + 1)',
+            '    for i, w in enumerate(weights[1:]):',
+            '        loss = loss + w.sum() * (rank + 1) * (i + 2)',
+            '    loss.backward()',
+            '    print(rank, float(hidden.grad.numpy().mean()),',
+            '          [float(w.grad.numpy().mean()) for w in weights])',
+        ])
+        with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
+            f.write(script)
+        try:
+            # Use the environment before the MPI initialization.
+            output = subprocess.check_output(
+                ['mpirun', '-n', '2', sys.executable, f.name],
+                env=dict(os.environ))
+        finally:
+            os.remove(f.name)
+        # The retained grad of intermediate is not reduced.
+        self.assertIn('0 1.0 [1.5, 3.0, 4.5]', output.decode())
+        self.assertIn('1 2.0 [1.5, 3.0, 4.5]', output.decode())
+
+
 if __name__ == '__main__':
     run_tests()
@@ -190,6 +190,25 @@ class TestWorkspace(unittest.TestCase):
             _ = w.memory_allocated()
             _ = dragon.cuda.memory_allocated()
 
+    def test_memory_cached(self):
+        w = dragon.Workspace()
+        with w.as_default():
+            x = dragon.ones((1024, 1024), 'float32')
+            self.assertGreaterEqual(w.memory_allocated(), 4 * 1024 * 1024)
+            x._impl.Reset()
+            self.assertGreaterEqual(w.memory_cached(), 4 * 1024 * 1024)
+            dragon.set_cpu_memory_cache_limit(0)
+            self.assertEqual(w.memory_cached(), 0)
+            dragon.set_cpu_memory_cache_limit(1 << 30)
+            y = dragon.ones((1024, 1024), 'float32')
+            y._impl.Reset()
+            w2 = dragon.Workspace()
+            self.assertEqual(w2.memory_cached(), 0)
+            w2.clear()
+            self.assertGreaterEqual(w.memory_cached(), 4 * 1024 * 1024)
+            w.clear()
+            self.assertEqual(w.memory_cached(), 0)
+
 
 if __name__ == '__main__':
     run_tests()
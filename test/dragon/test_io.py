@@ -14,7 +14,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import os
+import queue
 import shutil
 import unittest
 
@@ -90,6 +92,124 @@ class TestTFRecord(unittest.TestCase):
         except (OSError, PermissionError):
             pass
 
+    def test_dataset(self):
+        path = '/tmp/test_dragon_io_tf_record_dataset'
+        features = "{'a': tf.FixedLenFeature([], tf.int64, -1)}"
+        try:
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            with dragon.io.TFRecordWriter(
+                    path, features=features, max_examples=2) as writer:
+                for i in range(5):
+                    example = dragon.io.TFRecordExample()
+                    example.add_ints('a', [i])
+                    example.add_strings('b', [b'7', b'8'])
+                    writer.write(example)
+            for verify_crc in (False, True):
+                dataset = dragon.io.TFRecordDataset(path, verify_crc)
+                self.assertEqual(dataset.features, features)
+                self.assertEqual(dataset.size, 5)
+                self.assertEqual(len(dataset), 5)
+                dataset.redirect(3)
+                self.assertEqual(dataset.get(), {'a': 3, 'b': [b'7', b'8']})
+                self.assertEqual(dataset.get()['a'], 4)
+        except (OSError, PermissionError):
+            pass
+
+    def test_global_shuffle(self):
+        path = '/tmp/test_dragon_io_tf_record_global_shuffle'
+        features = "{'a': tf.FixedLenFeature([], tf.int64, -1)}"
+        try:
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            with dragon.io.TFRecordWriter(
+                    path, features=features, max_examples=2) as writer:
+                for i in range(5):
+                    example = dragon.io.TFRecordExample()
+                    example.add_ints('a', [i])
+                    writer.write(example)
+            for epoch in range(2):
+                values = []
+                for part_idx, num_windows in enumerate((2, 1)):
+                    reader = dragon.io.DataReader(
+                        dataset=dragon.io.TFRecordDataset, source=path,
+                        part_idx=part_idx, num_parts=2,
+                        global_shuffle=True, read_ahead=2)
+                    reader._init_dataset()
+                    for _ in range(epoch * num_windows):
+                        reader.next_window()
+                    for _ in range(num_windows):
+                        values += [e['a'] for e in reader.next_window()]
+                    self.assertEqual(reader._epoch, epoch)
+                self.assertEqual(sorted(values), [0, 1, 2, 3, 4])
+        except (OSError, PermissionError):
+            pass
+
+    def test_index_only(self):
+        path = '/tmp/test_dragon_io_tf_record_index_only'
+        features = "{'a': tf.FixedLenFeature([], tf.int64, -1)}"
+        try:
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            with dragon.io.TFRecordWriter(path, features=features) as writer:
+                for i in range(5):
+                    example = dragon.io.TFRecordExample()
+                    example.add_ints('a', [i])
+                    writer.write(example)
+            for global_shuffle in (False, True):
+                reader = dragon.io.DataReader(
+                    dataset=dragon.io.TFRecordDataset, source=path,
+                    global_shuffle=global_shuffle, index_only=True)
+                reader._init_dataset()
+                reader.q_out = [queue.Queue(), queue.Queue()]
+                if global_shuffle:
+                    items = reader.next_window()
+                else:
+                    items = reader._example_buffer + [reader._next_item() for _ in range(3)]
+                for item in items:
+                    reader._put_item(item)
+                self.assertEqual(sorted(index for index, _ in items),
+                                 [0, 1, 2, 3, 4][:len(items)])
+                for i, q in enumerate(reader.q_out):
+                    while not q.empty():
+                        index, example = q.get()
+                        self.assertEqual((index % 2, example), (i, None))
+        except (OSError, PermissionError):
+            pass
+
+    def test_parallel_writer(self):
+        path = '/tmp/test_dragon_io_tf_record_parallel'
+        try:
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            with dragon.io.ParallelRecordWriter(
+                    path, features='', num_workers=2,
+                    max_examples=3, chunk_size=2) as writer:
+                for i in range(10):
+                    if i % 2 == 0:
+                        example = dragon.io.TFRecordExample()
+                        example.add_ints('a', [i])
+                        writer.write(example)
+                    else:
+                        writer.write({'a': [i], 'b': [b'7']})
+            with self.assertRaises(RuntimeError):
+                writer.write({'a': [0]})
+            with open(os.path.join(path, 'MANIFEST')) as f:
+                self.assertEqual(json.load(f)['num_examples'], 10)
+            dataset = dragon.io.TFRecordDataset(path)
+            values = []
+            for i in range(dataset.size):
+                dataset.redirect(i)
+                values += dataset.get()['a']
+            self.assertEqual(sorted(values), list(range(10)))
+            shutil.rmtree(path)
+            writer = dragon.io.ParallelRecordWriter(path, features='', num_workers=2)
+            writer.write({'a': [object()]})
+            with self.assertRaisesRegex(RuntimeError, 'Failed to write records'):
+                writer.close()
+        except (OSError, PermissionError):
+            pass
+
 
 if __name__ == '__main__':
     run_tests()
@@ -0,0 +1,176 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Test the vision module."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import unittest
+
+import numpy
+import PIL.Image
+import PIL.ImageEnhance
+
+from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.utils.vision.data_transformer import DataTransformer
+from dragon.utils.vision.sample_cache import SampleCache
+
+
+class CountingDataset(object):
+    """Dataset of raw images that counts the reads."""
+
+    def __init__(self, source):
+        self.size, self.cursor, self.num_reads = source, 0, 0
+
+    def redirect(self, index):
+        self.cursor = index
+
+    def get(self):
+        index, self.cursor = self.cursor, self.cursor + 1
+        self.num_reads += 1
+        data = numpy.full((2, 2, 3), index, 'uint8').tobytes()
+        return {'data': data, 'shape': (2, 2, 3), 'encoded': 0, 'label': [index]}
+
+
+def make_examples(sizes, seed=1337):
+    """Return the png-encoded examples of random images."""
+    rng, examples = numpy.random.RandomState(seed), []
+    for i, (h, w) in enumerate(sizes):
+        f = io.BytesIO()
+        PIL.Image.fromarray(rng.randint(0, 256, (h, w, 3)).astype('uint8')).save(f, 'PNG')
+        examples.append({'data': f.getvalue(), 'encoded': 1, 'label': [i]})
+    return examples
+
+
+class TestSampleCache(unittest.TestCase):
+    """Test the sample cache."""
+
+    def test_lru(self):
+        cache = SampleCache(max_bytes=30)
+        values = [numpy.full((10,), i, 'uint8') for i in range(4)]
+        for i in range(3):
+            cache.put(i, values[i])
+        self.assertEqual(cache.get(0).tolist(), values[0].tolist())
+        cache.put(3, values[3])  # Evict 1 as 0 is used recently.
+        self.assertIsNone(cache.get(1))
+        for i in (0, 2, 3):
+            self.assertEqual(cache.get(i).tolist(), values[i].tolist())
+        self.assertEqual((cache.hits, cache.misses), (4, 1))
+
+    def test_byte_budget(self):
+        cache = SampleCache(max_bytes=100)
+        for i in range(10):
+            cache.put(i, numpy.zeros((i + 1) * 4, 'uint8'))
+            self.assertLessEqual(cache.nbytes, 100)
+        self.assertEqual(cache.nbytes, 40 + 36)
+        self.assertIsNone(cache.get(7))
+        value = cache.put(10, numpy.zeros(101, 'uint8'))
+        self.assertEqual(value.size, 101)
+        self.assertIsNone(cache.get(10))
+        with self.assertRaises(ValueError):
+            cache.get(9)[0] = 1
+
+    def test_spill(self):
+        cache = SampleCache(max_bytes=24, spill_bytes=48)
+        values = [numpy.arange(i, i + 6, dtype='float32').reshape((2, 3)) for i in range(5)]
+        for i, value in enumerate(values):
+            cache.put(i, value)
+        self.assertEqual(cache.nbytes, 24)
+        # 0, 1 and 2 are evicted, but only 0 and 1 are spilled.
+        for i in (0, 1, 4):
+            value = cache.get(i)
+            self.assertIsInstance(value, numpy.ndarray)
+            self.assertEqual(value.dtype, values[i].dtype)
+            self.assertEqual(value.tolist(), values[i].tolist())
+            self.assertFalse(value.flags.writeable)
+        for i in (2, 3):
+            self.assertIsNone(cache.get(i))
+
+
+class TestDataTransformer(unittest.TestCase):
+    """Test the data transformer."""
+
+    def test_cache(self):
+        transformer = DataTransformer(dataset=CountingDataset, source=4, cache_size=1024)
+        transformer._cache = SampleCache(1024)
+        transformer._dataset = CountingDataset(4)
+        example = transformer._dataset.get()
+        for _ in range(2):
+            for index in range(4):
+                img, label = transformer.get(example if index == 0 else None, index)
+                self.assertEqual(img.tolist(), numpy.full((2, 2, 3), index).tolist())
+                self.assertEqual(label, [index])
+        # The cached examples are not read again.
+        self.assertEqual(transformer._dataset.num_reads, 4)
+        self.assertEqual(transformer._cache.hits, 4)
+
+    def test_get_batch(self):
+        examples = make_examples([(24, 32), (40, 30), (20, 20), (33, 21)])
+        kwargs = {'resize': 20, 'padding': 2, 'crop_size': 16, 'inverse_color': True, 'phase': 'TEST'}
+        transformer = DataTransformer(**kwargs)
+        images, labels = transformer.get_batch(examples)
+        expected = [transformer.get(example) for example in examples]
+        self.assertEqual(images.tolist(), numpy.stack([x[0] for x in expected]).tolist())
+        self.assertEqual(labels.tolist(), [x[1] for x in expected])
+        # Write into the buffer if it fits.
+        buffer = numpy.zeros((images.nbytes,), 'uint8')
+        images2, _ = transformer.get_batch(examples, buffer=buffer)
+        self.assertTrue(numpy.shares_memory(images2, buffer))
+        self.assertEqual(images2.tolist(), images.tolist())
+        # Random mirror flips the whole image or keeps it.
+        transformer = DataTransformer(mirror=True, **kwargs)
+        flips = set()
+        for _ in range(4):
+            images2, _ = transformer.get_batch(examples)
+            for img, img2 in zip(images, images2):
+                flips.add(img2.tolist() != img.tolist())
+                self.assertIn(img2.tolist(), (img.tolist(), img[:, ::-1].tolist()))
+        self.assertEqual(flips, {False, True})
+        # CutOut fills one square, and keeps the others.
+        transformer = DataTransformer(cutout_size=4, fill_value=0, **kwargs)
+        images2, _ = transformer.get_batch(examples)
+        for img, img2 in zip(images, images2):
+            rows, cols = numpy.where((img2 != img).any(-1))
+            self.assertTrue((img2[rows, cols] == 0).all())
+            if rows.size > 0:
+                self.assertLessEqual(rows.max() - rows.min(), 3)
+                self.assertLessEqual(cols.max() - cols.min(), 3)
+
+    def test_random_crop_boxes(self):
+        transformer = DataTransformer(random_crop_size=8)
+        sizes = numpy.array([[24, 32], [40, 30], [20, 20], [100, 1]] * 16, 'int64')
+        for i, j, h, w in transformer._sample_crop_boxes(sizes).tolist():
+            self.assertTrue(0 < h and 0 <= i and 0 < w and 0 <= j)
+        for (height, width), (i, j, h, w) in zip(sizes, transformer._sample_crop_boxes(sizes)):
+            self.assertLessEqual(i + h, height)
+            self.assertLessEqual(j + w, width)
+        images, _ = transformer.get_batch(make_examples([(24, 32), (40, 30)]))
+        self.assertEqual(images.shape, (2, 8, 8, 3))
+
+    def test_distort_colors(self):
+        rng = numpy.random.RandomState(1337)
+        images = rng.randint(0, 256, (12, 9, 7, 3)).astype('uint8')
+        factors = 1. + rng.uniform(-.4, .4, (12, 3))
+        orders = numpy.argsort(rng.uniform(size=(12, 3)), axis=1)
+        results = DataTransformer()._distort_colors(images.copy(), factors, orders)
+        # Same as the enhancements of per-image path.
+        transforms = [PIL.ImageEnhance.Brightness, PIL.ImageEnhance.Contrast, PIL.ImageEnhance.Color]
+        for img, result, factor, order in zip(images, results, factors, orders):
+            img = PIL.Image.fromarray(img)
+            for k, f in zip(order, factor):
+                img = transforms[k](img).enhance(f)
+            self.assertEqual(result.tolist(), numpy.asarray(img).tolist())
+
+
+if __name__ == '__main__':
+    run_tests()
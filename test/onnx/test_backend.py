@@ -0,0 +1,130 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Test the backend module."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.vm.onnx.core import helper
+from dragon.vm.onnx.core.backend.serving import ServingRep
+
+try:
+    import onnx
+except ImportError:
+    onnx = None
+
+
+def save_model(f, node, initializers=None):
+    """Save a model of single node."""
+    initializers = initializers or {}
+    graph = helper.make_graph(
+        [node], 'test',
+        [helper.make_tensor_value_info('x', onnx.TensorProto.FLOAT, None)],
+        [helper.make_tensor_value_info('y', onnx.TensorProto.FLOAT, None)],
+        initializer=[helper.from_array(v, k) for k, v in initializers.items()])
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 11)])
+    with open(f, 'wb') as f:
+        f.write(model.SerializeToString())
+
+
+@unittest.skipIf(onnx is None, 'ONNX is not installed.')
+class TestServingRep(unittest.TestCase):
+    """Test the serving backend."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.mul_model = os.path.join(self.path, 'mul.onnx')
+        self.flatten_model = os.path.join(self.path, 'flatten.onnx')
+        self.sum_model = os.path.join(self.path, 'sum.onnx')
+        save_model(self.mul_model, helper.make_node('Mul', ['x', 'w'], ['y']),
+                   {'w': numpy.array([1, 2, 3], 'float32')})
+        save_model(self.flatten_model, helper.make_node('Reshape', ['x', 'shape'], ['y']),
+                   {'shape': numpy.array([-1], 'int64')})
+        save_model(self.sum_model, helper.make_node('ReduceSum', ['x'], ['y'], keepdims=0))
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    @staticmethod
+    def record_batches(rep):
+        """Record the size of batches executed by the workers."""
+        batch_sizes = []
+
+        def run_batch_impl(backend_rep, batch):
+            batch_sizes.append(len(batch))
+            return ServingRep._run_batch_impl(backend_rep, batch)
+        rep._run_batch_impl = run_batch_impl
+        return batch_sizes
+
+    def test_batching(self):
+        for batch_outputs, batched in ((None, False), (['y'], True)):
+            with ServingRep(self.mul_model, max_latency=0.5, batch_outputs=batch_outputs) as rep:
+                batch_sizes = self.record_batches(rep)
+                inputs = [numpy.full((n, 3), n, 'float32') for n in (1, 2, 3, 1)]
+                futures = [rep.submit([x]) for x in inputs]
+                for x, future in zip(inputs, futures):
+                    y = future.result(timeout=10)[0]
+                    self.assertEqual(y.tolist(), (x * [1, 2, 3]).tolist())
+            self.assertEqual(max(batch_sizes) > 1, batched)
+            self.assertEqual(rep.output_names, ['y'])
+
+    def test_split(self):
+        for model in (self.flatten_model, self.sum_model):
+            with ServingRep(model, max_latency=0.5, batch_outputs=['y']) as rep:
+                batch_sizes = self.record_batches(rep)
+                inputs = [numpy.full((2, 3), i, 'float32') for i in range(4)]
+                futures = [rep.submit([x]) for x in inputs]
+                for x, future in zip(inputs, futures):
+                    y = future.result(timeout=10)[0]
+                    expected = x.flatten() if model == self.flatten_model else x.sum()
+                    self.assertEqual(y.tolist(), expected.tolist())
+            # The batch is executed again per request.
+            self.assertEqual(batch_sizes[-4:], [1, 1, 1, 1])
+            self.assertGreater(max(batch_sizes), 1)
+
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            ServingRep(self.mul_model, batch_outputs=['z'])
+        with ServingRep(self.mul_model, max_latency=0.5, batch_outputs=['y']) as rep:
+            with self.assertRaises(ValueError):
+                rep.submit([numpy.ones((1, 3), 'float32')] * 2)
+
+            def run_batch_impl(backend_rep, batch):
+                if any(request.inputs[0].min() < 0 for request in batch):
+                    raise RuntimeError('Negative inputs.')
+                return ServingRep._run_batch_impl(backend_rep, batch)
+            rep._run_batch_impl = run_batch_impl
+            futures = [rep.submit([numpy.full((1, 3), i, 'float32')]) for i in (1, -1)]
+            for future in futures:
+                self.assertIsInstance(future.exception(timeout=10), RuntimeError)
+            y = rep.run([numpy.ones((2, 3), 'float32')])[0]
+            self.assertEqual(y.tolist(), [[1, 2, 3], [1, 2, 3]])
+
+    def test_close(self):
+        rep = ServingRep(self.mul_model, num_workers=2, batch_outputs=['y'])
+        futures = [rep.submit([numpy.ones((1, 3), 'float32')]) for _ in range(8)]
+        rep.close()
+        self.assertTrue(all(future.done() for future in futures))
+        with self.assertRaises(RuntimeError):
+            rep.submit([numpy.ones((1, 3), 'float32')])
+
+
+if __name__ == '__main__':
+    run_tests()
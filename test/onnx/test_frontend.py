@@ -0,0 +1,127 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Test the frontend module."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import dragon
+import numpy
+
+from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.vm.onnx.core import helper
+
+try:
+    import onnx
+except ImportError:
+    onnx = None
+
+
+@unittest.skipIf(onnx is None, 'ONNX is not installed.')
+class TestExternalData(unittest.TestCase):
+    """Test the external data writer."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.filename = os.path.join(self.path, 'model.onnx')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_layout(self):
+        arrays = [numpy.arange(n, dtype='float32') for n in (3, 5, 10, 17)]
+        tensors = [helper.from_array(x, 'x%d' % i) for i, x in enumerate(arrays)]
+        writer = helper.ExternalDataWriter(self.filename, size_threshold=20, alignment=16)
+        for tensor in tensors:
+            writer.write(tensor)
+        writer.close()
+        self.assertEqual(tensors[0].data_location, onnx.TensorProto.DEFAULT)
+        self.assertEqual(len(tensors[0].raw_data), 12)
+        with open(self.filename + '.data', 'rb') as f:
+            data = f.read()
+        expected_offsets = [None, 0, 32, 80]
+        for tensor, x, offset in zip(tensors[1:], arrays[1:], expected_offsets[1:]):
+            info = dict((e.key, e.value) for e in tensor.external_data)
+            self.assertEqual(tensor.data_location, onnx.TensorProto.EXTERNAL)
+            self.assertFalse(tensor.HasField('raw_data'))
+            self.assertEqual(info['location'], 'model.onnx.data')
+            self.assertEqual(int(info['offset']), offset)
+            self.assertEqual(int(info['length']), x.nbytes)
+            self.assertEqual(int(info['offset']) % 16, 0)
+            self.assertEqual(data[offset:offset + x.nbytes], x.tobytes())
+        self.assertEqual(len(data), 80 + arrays[-1].nbytes)
+
+    def test_file_like(self):
+        with self.assertRaises(TypeError):
+            helper.ExternalDataWriter(io.BytesIO())
+        x = dragon.constant(numpy.ones((2, 3), 'float32'))
+        with dragon.onnx.record():
+            y = x * x
+            with self.assertRaises(TypeError):
+                dragon.onnx.export(inputs=[x], outputs=[y], f=io.BytesIO(), external_data=True)
+
+
+@unittest.skipIf(onnx is None, 'ONNX is not installed.')
+class TestExport(unittest.TestCase):
+    """Test the export functions."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.filename = os.path.join(self.path, 'model.onnx')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_external_data(self):
+        x = dragon.constant(numpy.ones((2, 32), 'float32'))
+        w = dragon.constant(numpy.random.rand(32, 32).astype('float32'))
+        b = dragon.constant(numpy.random.rand(32).astype('float32'))
+        with dragon.onnx.record():
+            y = dragon.math.matmul([x, w]) + b
+            dragon.onnx.export(inputs=[x], outputs=[y], f=self.filename, external_data=True)
+        model = onnx.load(self.filename, load_external_data=False)
+        initializers = dict((e.name, e) for e in model.graph.initializer)
+        self.assertEqual(initializers[w.id].data_location, onnx.TensorProto.EXTERNAL)
+        self.assertEqual(initializers[b.id].data_location, onnx.TensorProto.DEFAULT)
+        self.assertEqual(os.path.getsize(self.filename + '.data'), w.size * 4)
+        model = onnx.load(self.filename)
+        initializers = dict((e.name, e) for e in model.graph.initializer)
+        self.assertEqual(onnx.numpy_helper.to_array(initializers[w.id]).tolist(), w.numpy().tolist())
+
+    def test_input_order(self):
+        x = dragon.constant(numpy.ones((2, 4), 'float32'))
+        weights = [dragon.constant(numpy.ones((4, 4), 'float32')) for _ in range(4)]
+        with dragon.onnx.record():
+            y = x
+            for weight in reversed(weights):
+                y = dragon.math.matmul([y, weight])
+            dragon.onnx.export(inputs=[x], outputs=[y], f=self.filename)
+        model = onnx.load(self.filename)
+        # Inputs are listed in the order of first use.
+        first_uses = []
+        for node in model.graph.node:
+            for name in node.input:
+                if name not in first_uses:
+                    first_uses.append(name)
+        input_names = [e.name for e in model.graph.input]
+        self.assertEqual(input_names, [name for name in first_uses if name in input_names])
+        self.assertEqual(input_names, [x.id] + [weight.id for weight in reversed(weights)])
+
+
+if __name__ == '__main__':
+    run_tests()
@@ -0,0 +1,131 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Test the optimizer module."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import unittest
+
+import numpy
+
+from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.vm.onnx.core import helper
+from dragon.vm.onnx.core.optimizer import GraphOptimizer
+
+try:
+    import onnx
+    from onnx.reference import ReferenceEvaluator
+except ImportError:
+    onnx = None
+
+
+def make_graph(nodes, inputs, outputs, initializers):
+    """Return a float32 graph of the given values."""
+    return helper.make_graph(
+        nodes, 'test',
+        [helper.make_tensor_value_info(k, onnx.TensorProto.FLOAT, v) for k, v in inputs],
+        [helper.make_tensor_value_info(k, onnx.TensorProto.FLOAT, None) for k in outputs],
+        initializer=[helper.from_array(v, k) for k, v in initializers.items()])
+
+
+def run_graph(graph, feeds):
+    """Run the graph with the reference evaluator."""
+    # The reference of BatchNormalization before opset 14 is inexact.
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 15)])
+    return ReferenceEvaluator(model).run(None, feeds)
+
+
+@unittest.skipIf(onnx is None, 'ONNX is not installed.')
+class TestGraphOptimizer(unittest.TestCase):
+    """Test the graph optimizer."""
+
+    def test_fold_constants(self):
+        graph = make_graph(
+            [helper.make_node('Cast', ['shape'], ['shape_int'], to=onnx.TensorProto.INT64),
+             helper.make_node('Reshape', ['x', 'shape_int'], ['y'])],
+            [('x', [6])], ['y'], {'shape': numpy.array([2, 3], 'float32')})
+        report = GraphOptimizer(['fold_constants']).optimize(graph)
+        self.assertEqual(report['fold_constants'], 1)
+        self.assertEqual([node.op_type for node in graph.node], ['Reshape'])
+        initializers = dict((e.name, e) for e in graph.initializer)
+        self.assertEqual(initializers['shape_int'].data_type, onnx.TensorProto.INT64)
+        self.assertEqual(helper.to_array(initializers['shape_int']).tolist(), [2, 3])
+
+    def test_fuse_conv_bn(self):
+        rng = numpy.random.RandomState(0)
+        values = {
+            'w': rng.rand(4, 3, 3, 3).astype('float32'),
+            'b': rng.rand(4).astype('float32'),
+            'scale': rng.rand(4).astype('float32'),
+            'bias': rng.rand(4).astype('float32'),
+            'mean': rng.rand(4).astype('float32'),
+            'var': rng.rand(4).astype('float32') + 0.5,
+        }
+        graph = make_graph(
+            [helper.make_node('Conv', ['x', 'w', 'b'], ['conv'], pads=[1, 1, 1, 1]),
+             helper.make_node('BatchNormalization', ['conv', 'scale', 'bias', 'mean', 'var'],
+                              ['y'], epsilon=1e-3)],
+            [('x', [2, 3, 5, 5])], ['y'], values)
+        feeds = {'x': rng.rand(2, 3, 5, 5).astype('float32')}
+        expected = run_graph(graph, feeds)[0]
+        report = GraphOptimizer(['fuse_conv_bn', 'eliminate_dead_nodes']).optimize(graph)
+        self.assertEqual(report['fuse_conv_bn'], 1)
+        self.assertEqual([node.op_type for node in graph.node], ['Conv'])
+        self.assertEqual(len(graph.initializer), 2)
+        numpy.testing.assert_allclose(run_graph(graph, feeds)[0], expected, rtol=1e-5, atol=1e-5)
+
+    def test_fuse_gemm_bias(self):
+        rng = numpy.random.RandomState(0)
+        graph = make_graph(
+            [helper.make_node('Gemm', ['x', 'w'], ['gemm'], beta=0.5, transB=1),
+             helper.make_node('Add', ['gemm', 'b'], ['y'])],
+            [('x', [2, 3])], ['y'],
+            {'w': rng.rand(4, 3).astype('float32'), 'b': rng.rand(4).astype('float32')})
+        feeds = {'x': rng.rand(2, 3).astype('float32')}
+        expected = run_graph(graph, feeds)[0]
+        report = GraphOptimizer(['fuse_gemm_bias']).optimize(graph)
+        self.assertEqual(report['fuse_gemm_bias'], 1)
+        self.assertEqual([node.op_type for node in graph.node], ['Gemm'])
+        numpy.testing.assert_allclose(run_graph(graph, feeds)[0], expected, rtol=1e-5, atol=1e-6)
+
+    def test_eliminate_identity(self):
+        graph = make_graph(
+            [helper.make_node('Dropout', ['x'], ['drop1']),
+             helper.make_node('Dropout', ['drop1'], ['drop2', 'mask']),
+             helper.make_node('Cast', ['mask'], ['mask_float'], to=onnx.TensorProto.FLOAT),
+             helper.make_node('Add', ['drop2', 'mask_float'], ['add']),
+             helper.make_node('Identity', ['add'], ['y'])],
+            [('x', [2, 3])], ['y'], {})
+        report = GraphOptimizer(['eliminate_identity']).optimize(graph)
+        self.assertEqual(report['eliminate_identity'], 1)
+        self.assertEqual([node.op_type for node in graph.node], ['Dropout', 'Cast', 'Add', 'Identity'])
+        self.assertEqual(list(graph.node[0].input), ['x'])
+        self.assertEqual([e.name for e in graph.output], ['y'])
+
+    def test_dedupe_initializers(self):
+        graph = make_graph(
+            [helper.make_node('Add', ['x', 'a'], ['add']),
+             helper.make_node('Mul', ['add', 'b'], ['mul']),
+             helper.make_node('Sub', ['mul', 'c'], ['y'])],
+            [('x', [3])], ['y'],
+            {'a': numpy.ones(3, 'float32'), 'b': numpy.ones(3, 'float32'),
+             'c': numpy.ones(3, 'int64')})
+        report = GraphOptimizer(['dedupe_initializers']).optimize(graph)
+        self.assertEqual(report['dedupe_initializers'], 1)
+        self.assertEqual([e.name for e in graph.initializer], ['a', 'c'])
+        self.assertEqual([list(node.input) for node in graph.node],
+                         [['x', 'a'], ['add', 'a'], ['mul', 'c']])
+
+
+if __name__ == '__main__':
+    run_tests()
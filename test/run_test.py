@@ -20,6 +20,7 @@ import subprocess
 import argparse
 
 TESTS_AND_SOURCES = [
+    ('caffe/test_solver', 'dragon.vm.caffe.core'),
     ('dragon/test_autograph', 'dragon.core'),
     ('dragon/test_device', 'dragon.core'),
     ('dragon/test_distributed', 'dragon.core'),
@@ -27,12 +28,17 @@ TESTS_AND_SOURCES = [
     ('dragon/test_io', 'dragon.core'),
     ('dragon/test_ops', 'dragon.core'),
     ('dragon/test_util', 'dragon.core'),
+    ('dragon/test_vision', 'dragon.utils'),
+    ('onnx/test_backend', 'dragon.vm.onnx.core'),
+    ('onnx/test_frontend', 'dragon.vm.onnx.core'),
+    ('onnx/test_optimizer', 'dragon.vm.onnx.core'),
     ('torch/test_autograd', 'dragon.vm.torch.core'),
     ('torch/test_jit', 'dragon.vm.torch.core'),
     ('torch/test_nn', 'dragon.vm.torch.core'),
     ('torch/test_ops', 'dragon.vm.torch.core'),
     ('torch/test_optim', 'dragon.vm.torch.core'),
     ('torch/test_torch', 'dragon.vm.torch.core'),
+    ('tensorflow/test_keras', 'dragon.vm.tensorflow.core'),
 ]
 
 DISTRIBUTED_BLOCKLIST = ['dragon/test_distributed']
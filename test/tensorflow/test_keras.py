@@ -0,0 +1,82 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#     <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Test the keras module."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import shutil
+import tempfile
+import unittest
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+import numpy as np
+
+from dragon.core.framework import workspace
+from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.vm import tensorflow as tf
+
+
+class TestSaving(unittest.TestCase):
+    """Test the saving utilities."""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.layer = tf.keras.layers.Dense(4)
+        self.layer(tf.ones((2, 3)))
+        self.values = [w.numpy().copy() for w in self.layer.weights]
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def reset_weights(self):
+        default_ws = workspace.get_workspace()
+        for weight, value in zip(self.layer.weights, self.values):
+            default_ws.get_tensor(weight.id).FromNumpy(np.zeros_like(value), True)
+
+    def check_weights(self):
+        for weight, value in zip(self.layer.weights, self.values):
+            np.testing.assert_equal(weight.numpy(), value)
+
+    @unittest.skipIf(h5py is None, 'Package <h5py> is not installed.')
+    def test_hdf5_contiguous(self):
+        filepath = os.path.join(self.path, 'weights.h5')
+        self.layer.save_weights(filepath)
+        with h5py.File(filepath, 'r') as f:
+            for weight in self.layer.weights:
+                self.assertIsNone(f[weight.name].chunks)
+                self.assertIsNotNone(f[weight.name].id.get_offset())
+        self.reset_weights()
+        self.layer.load_weights(filepath)
+        self.check_weights()
+
+    @unittest.skipIf(h5py is None, 'Package <h5py> is not installed.')
+    def test_hdf5_compressed(self):
+        filepath = os.path.join(self.path, 'weights.h5')
+        with h5py.File(filepath, 'w') as f:
+            for weight, value in zip(self.layer.weights, self.values):
+                f.create_dataset(weight.name, data=value, compression='gzip')
+            f.attrs['weight_names'] = [w.name.encode('utf8') for w in self.layer.weights]
+        with h5py.File(filepath, 'r') as f:
+            for weight in self.layer.weights:
+                self.assertIsNotNone(f[weight.name].chunks)
+        self.reset_weights()
+        self.layer.load_weights(filepath)
+        self.check_weights()
+
+
+if __name__ == '__main__':
+    run_tests()
@@ -62,6 +62,26 @@ class TestJit(unittest.TestCase):
         except ValueError:
             pass
 
+    def test_trace_cache(self):
+        @torch.jit.trace(max_cache_size=2)
+        def func1(a, b):
+            return a + b
+
+        a, b = torch.tensor([1, 2]), torch.tensor([3, 4])
+        c, d = torch.tensor([[1, 2]]), torch.tensor([[3, 4]])
+        self.assertEqual(func1(a, b).numpy().tolist(), [4, 6])
+        self.assertEqual(func1(c, d).numpy().tolist(), [[4, 6]])
+        self.assertEqual(func1(b, a).numpy().tolist(), [4, 6])
+        self.assertEqual(func1.cache_info()[:3], (1, 2, 1))
+        self.assertEqual(func1(a.float(), b.float()).numpy().tolist(), [4, 6])
+        self.assertEqual(func1.cache_info()[-1], 2)
+        self.assertEqual(func1(c, d).numpy().tolist(), [[4, 6]])
+        self.assertEqual(func1.cache_info()[:3], (1, 4, 3))
+        self.assertFalse({x.id for x in func1.inputs} & {a.id, b.id, c.id, d.id})
+        self.assertEqual(sorted(func1.call_counts().values()), [1, 2, 2])
+        func1.clear_cache()
+        self.assertEqual(func1.cache_info()[:3], (0, 0, 0))
+
 
 if __name__ == '__main__':
     run_tests()
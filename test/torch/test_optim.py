@@ -17,6 +17,7 @@ from __future__ import print_function
 import unittest
 
 from dragon.core.testing.unittest.common_utils import run_tests
+from dragon.core.testing.unittest.common_utils import TEST_CUDA
 from dragon.vm import torch
 
 
@@ -112,6 +113,47 @@ class TestOptimizer(unittest.TestCase):
         optimizer.step()
         self.assertLessEqual(float(weight1) - 0.6, 1e-5)
 
+    def test_flat_step(self):
+        shapes = [(2, 3), (4,), (1,), (3, 1, 2)]
+        entries = [(torch.optim.SGD, 'float32', 'cpu'), (torch.optim.Adam, 'float32', 'cpu')]
+        if TEST_CUDA:
+            entries.append((torch.optim.SGD, 'float16', 'cuda'))
+        for optimizer_type, dtype, device in entries:
+            results = []
+            for flat in (False, True):
+                params = [torch.ones(*shape, dtype=dtype, device=torch.device(device), requires_grad=True)
+                          for shape in shapes]
+                optimizer = optimizer_type(params, lr=0.1, weight_decay=0.01, clip_norm=1.0, flat=flat)
+                for step in range(3):
+                    for i, param in enumerate(params):
+                        y = param * (i + 1)
+                        y.backward(y)
+                    optimizer.step()
+                results.append([param.numpy().copy() for param in params])
+                optimizer.zero_grad(set_to_none=True)
+            for a, b in zip(*results):
+                self.assertEqual(a.shape, b.shape)
+                self.assertLessEqual(float(abs(a - b).max()), 1e-5)
+
+    def test_flat_views(self):
+        shapes = [(2, 3), (4,), (1,), (3, 1, 2)]
+        params = [torch.ones(*shape, requires_grad=True) for shape in shapes]
+        optimizer = torch.optim.SGD(params, lr=0.1, momentum=0.9, flat=True)
+        pointers = []
+        for step in range(3):
+            for i, param in enumerate(params):
+                y = param * (i + 1)
+                y.backward(y)
+            optimizer.step()
+            pointers.append([(param._impl.data('cpu'), param.grad._impl.data('cpu')) for param in params])
+        # Params and grads stay in the same segments of the flat buffers.
+        self.assertEqual(pointers[0], pointers[1])
+        self.assertEqual(pointers[0], pointers[2])
+        for i in range(len(params) - 1):
+            for j in range(2):
+                self.assertEqual(pointers[0][i + 1][j] - pointers[0][i][j], 256)
+        optimizer.zero_grad(set_to_none=True)
+
 
 if __name__ == '__main__':
     run_tests()
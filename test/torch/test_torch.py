@@ -166,6 +166,55 @@ class TestSerialization(unittest.TestCase):
         except (OSError, PermissionError):
             pass
 
+    def test_save_and_load_chunked_containers(self):
+        optimizer = {'state': {}, 'param_groups': [{'lr': 0.1, 'params': [0, 1]}]}
+        state_dict = {'optimizer': optimizer, 'empty': {},
+                      'nested': {'a': {}, 'b': (1, [2, (3, 4)], {'c': (5,)})}}
+        f = io.BytesIO()
+        torch.save(state_dict, f, chunked=True)
+        f.seek(0)
+        state_dict2 = torch.load(f)
+        self.assertEqual(state_dict2['empty'], {})
+        self.assertEqual(state_dict2['nested']['a'], {})
+        self.assertEqual(state_dict2['nested']['b'], (1, [2, (3, 4)], {'c': (5,)}))
+        self.assertEqual(state_dict2['optimizer']['state'], {})
+        self.assertEqual(state_dict2['optimizer']['param_groups'], optimizer['param_groups'])
+
+    def test_save_and_load_chunked(self):
+        m1, m2 = torch.nn.Linear(3, 4), torch.nn.Linear(3, 4)
+        state_dict = collections.OrderedDict([
+            ('model', m1.state_dict()),
+            ('step', 1),
+            ('c', {'d': [1, 2, 3], 'e': torch.ones(2, dtype=torch.int64)}),
+        ])
+        f1 = io.BytesIO()
+        torch.save(state_dict, f1, chunked=True)
+        f1.seek(0)
+        f2 = '/tmp/test_dragon_vm_torch_save_chunked'
+        try:
+            torch.save(state_dict, f2, chunked=True)
+        except (OSError, PermissionError):
+            f2 = None
+        for f in (f1, f2):
+            if f is None:
+                continue
+            state_dict2 = torch.load(f)
+            self.assertEqual(list(state_dict2.keys()), ['model', 'step', 'c'])
+            self.assertEqual(state_dict2['step'], 1)
+            self.assertEqual(state_dict2['c']['d'], [1, 2, 3])
+            self.assertEqual(state_dict2['c']['e'].tolist(), [1, 1])
+            m2.load_state_dict(state_dict2['model'])
+            for k, v in m1.state_dict().items():
+                self.assertEqual(v.numpy().tolist(), m2.state_dict()[k].numpy().tolist())
+        try:
+            torch.save([1, 2, 3], io.BytesIO(), chunked=True)
+        except TypeError:
+            pass
+        try:
+            torch.save({'a': object()}, io.BytesIO(), chunked=True)
+        except TypeError:
+            pass
+
 
 if __name__ == '__main__':
     run_tests()
@@ -0,0 +1,93 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the weights syncing from the train net to the test net."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import tempfile
+import time
+
+from dragon.vm import caffe
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the weights syncing of caffe test nets')
+    parser.add_argument(
+        '--net',
+        type=str,
+        default=None,
+        help='path of the net prototxt, e.g. ResNet-50')
+    parser.add_argument(
+        '--steps',
+        type=int,
+        default=5,
+        help='number of syncing steps')
+    return parser.parse_args()
+
+
+def make_resnet50_like():
+    """Return the prototxt of the ResNet-50 convolution stack."""
+    layers = ['layer { name: "data" type: "Input" top: "data" '
+              'input_param { shape { dim: 1 dim: 3 dim: 32 dim: 32 } } }']
+    conv = ('layer {{ name: "{}" type: "Convolution" bottom: "{}" top: "{}" '
+            'convolution_param {{ num_output: {} kernel_size: {} pad: {} '
+            'weight_filler {{ type: "msra" }} }} }}')
+    layers.append(conv.format('conv1', 'data', 'conv1', 64, 7, 3))
+    bottom = 'conv1'
+    for i, (dim, out_dim, depth) in enumerate(
+            [(64, 256, 3), (128, 512, 4), (256, 1024, 6), (512, 2048, 3)]):
+        for j in range(depth):
+            for k, (num_output, kernel_size) in enumerate(
+                    [(dim, 1), (dim, 3), (out_dim, 1)]):
+                name = 'res{}_{}_{}'.format(i + 2, j, k)
+                layers.append(conv.format(
+                    name, bottom, name, num_output, kernel_size, kernel_size // 2))
+                bottom = name
+    layers.append('layer { name: "fc" type: "InnerProduct" bottom: "%s" top: "fc" '
+                  'inner_product_param { num_output: 1000 '
+                  'weight_filler { type: "xavier" } } }' % bottom)
+    return '\n'.join(layers)
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    net_file = args.net
+    if net_file is None:
+        with tempfile.NamedTemporaryFile('w', suffix='.prototxt', delete=False) as f:
+            f.write(make_resnet50_like())
+            net_file = f.name
+    try:
+        train_net = caffe.Net(net_file, 'TRAIN')
+        test_net = caffe.Net(net_file, 'TEST')
+    finally:
+        if args.net is None:
+            os.remove(net_file)
+    num_params = sum(blob.count for blobs in train_net.params.values()
+                     for blob in blobs)
+    sync_times = []
+    for source in (lambda: train_net.to_proto(), lambda: train_net):
+        test_net.copy_from(source())  # Warmup.
+        tic = time.time()
+        for _ in range(args.steps):
+            test_net.copy_from(source())
+        sync_times.append((time.time() - tic) / args.steps)
+    print('Params: {:.2f}M, proto round trip: {:.1f} ms, direct copy: {:.1f} ms'
+          .format(num_params / 1e6, *[t * 1e3 for t in sync_times]))
+
+
+if __name__ == '__main__':
+    main()
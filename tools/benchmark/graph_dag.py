@@ -0,0 +1,85 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the DAG scheduler against the sequential graph."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+import dragon
+import numpy
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the multi-branch graph execution')
+    parser.add_argument(
+        '--branches',
+        type=int,
+        default=4,
+        help='number of independent branches')
+    parser.add_argument(
+        '--depth',
+        type=int,
+        default=8,
+        help='number of matmul operators in each branch')
+    parser.add_argument(
+        '--dim',
+        type=int,
+        default=256,
+        help='dimension of the square matrices')
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=4,
+        help='number of threads for the DAG scheduler')
+    parser.add_argument(
+        '--steps',
+        type=int,
+        default=50,
+        help='number of running steps')
+    return parser.parse_args()
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    x = numpy.random.rand(args.dim, args.dim).astype('float32')
+    weights = [dragon.constant(x * 0.01) for _ in range(args.branches)]
+
+    def multi_branch(inputs):
+        outputs = []
+        for w in weights:
+            y = inputs
+            for _ in range(args.depth):
+                y = dragon.nn.relu(dragon.math.matmul([y, w]))
+            outputs.append(y)
+        return dragon.concat(outputs)
+
+    dragon.set_num_threads(args.threads)
+    for scheduler in ('SIMPLE', 'DAG'):
+        dragon.autograph.set_scheduler(scheduler)
+        func = dragon.function(multi_branch)
+        func(x)
+        tic = time.time()
+        for _ in range(args.steps):
+            func(x)
+        cost = (time.time() - tic) / args.steps
+        print('Scheduler: {}, branches: {}, threads: {}, time: {:.3f} ms/step'
+              .format(scheduler, args.branches, args.threads, cost * 1e3))
+    dragon.autograph.set_scheduler('SIMPLE')
+
+
+if __name__ == '__main__':
+    main()
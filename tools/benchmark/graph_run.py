@@ -0,0 +1,65 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the per-step overhead of running a staged graph."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+import dragon
+import numpy
+from dragon.core.autograph.graph_impl import GraphLib
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the staged graph execution')
+    parser.add_argument(
+        '--num-ops',
+        type=int,
+        default=500,
+        help='number of operators in the graph')
+    parser.add_argument(
+        '--steps',
+        type=int,
+        default=1000,
+        help='number of running steps')
+    return parser.parse_args()
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    execute_ws = dragon.Workspace()
+    with execute_ws.as_default():
+        with dragon.graph_mode():
+            x = dragon.Tensor((1,), symbolic=True)
+            y = x
+            for _ in range(args.num_ops):
+                y = dragon.math.relu(y)
+        x._impl.FromNumpy(numpy.ones((1,), 'float32'))
+        graph = GraphLib.from_outputs(y)
+        graph_name = graph._def.name
+        for stage in (None, 'forward', 'backward'):
+            execute_ws.run_graph(graph_name, execution_stage=stage)
+            tic = time.time()
+            for _ in range(args.steps):
+                execute_ws.run_graph(graph_name, execution_stage=stage)
+            cost = (time.time() - tic) / args.steps
+            print('Stage: {}, ops: {}, time: {:.3f} us/step'.format(
+                stage or 'default', args.num_ops, cost * 1e6))
+
+
+if __name__ == '__main__':
+    main()
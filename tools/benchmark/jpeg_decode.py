@@ -0,0 +1,91 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the JPEG decoding of vision data transformer."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import io
+import time
+
+import numpy
+import PIL.Image
+
+from dragon.utils.vision import DataTransformer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the decoding with and without draft mode')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1024, 2048, 4096],
+        help='longest edges of source images')
+    parser.add_argument(
+        '--num-images',
+        type=int,
+        default=16,
+        help='number of images to decode')
+    parser.add_argument(
+        '--resize',
+        type=int,
+        default=256,
+        help='size of the shortest edge to train')
+    parser.add_argument(
+        '--crop-size',
+        type=int,
+        default=224,
+        help='size of the random crop to train')
+    return parser.parse_args()
+
+
+def make_examples(size, num_images):
+    """Return the examples of smooth synthetic JPEGs."""
+    examples = []
+    height, width = size * 3 // 4, size
+    for i in range(num_images):
+        img = numpy.random.randint(0, 256, (height // 32, width // 32, 3))
+        img = PIL.Image.fromarray(img.astype('uint8'))
+        img = img.resize((width, height), PIL.Image.BILINEAR)
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=90)
+        examples.append({'data': buffer.getvalue(),
+                         'encoded': 1, 'label': [i]})
+    return examples
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    configs = [('resize', {'resize': args.resize,
+                           'crop_size': args.crop_size}),
+               ('random_crop', {'random_crop_size': args.crop_size})]
+    for size in args.sizes:
+        examples = make_examples(size, args.num_images)
+        for name, kwargs in configs:
+            throughputs = []
+            for draft_decode in (False, True):
+                transformer = DataTransformer(
+                    draft_decode=draft_decode, **kwargs)
+                tic = time.time()
+                for example in examples:
+                    transformer.get(example)
+                throughputs.append(len(examples) / (time.time() - tic))
+            print('Size: {}, mode: {}, full: {:.1f} img/s, draft: {:.1f} img/s'
+                  .format(size, name, *throughputs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the ONNX export over synthetic graphs."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import dragon
+import numpy
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the onnx export of increasing graph sizes')
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[500, 1000, 2000, 4000],
+        help='number of blocks of each graph')
+    parser.add_argument(
+        '--dim',
+        type=int,
+        default=64,
+        help='dimension of the square weights')
+    parser.add_argument(
+        '--external-data',
+        action='store_true',
+        help='write the weights into an external file')
+    return parser.parse_args()
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    output_dir = tempfile.mkdtemp()
+    try:
+        for size in args.sizes:
+            x = dragon.constant(numpy.ones((2, args.dim), 'float32'))
+            weights = [dragon.constant(numpy.random.rand(args.dim, args.dim)
+                                       .astype('float32')) for _ in range(size)]
+            f = os.path.join(output_dir, 'model_%d.onnx' % size)
+            with dragon.onnx.record():
+                # Each block emits a constant tensor for the reshape.
+                y = x
+                for weight in weights:
+                    y = dragon.math.matmul([y, weight])
+                    y = dragon.reshape(dragon.nn.relu(y), (2, args.dim))
+                tic = time.time()
+                dragon.onnx.export(inputs=[x], outputs=[y], f=f,
+                                   external_data=args.external_data)
+                export_time = time.time() - tic
+            print('Operators: {}, export: {:.3f} s, file: {:.1f} MB'
+                  .format(size * 3, export_time, os.path.getsize(f) / 1e6))
+    finally:
+        shutil.rmtree(output_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the onnx serving under concurrent requests."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import numpy
+
+import dragon
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the onnx serving with concurrent clients')
+    parser.add_argument(
+        '--num-clients',
+        type=int,
+        default=16,
+        help='number of concurrent clients')
+    parser.add_argument(
+        '--num-requests',
+        type=int,
+        default=50,
+        help='number of requests of each client')
+    parser.add_argument(
+        '--num-workers',
+        type=int,
+        default=2,
+        help='number of serving workers')
+    parser.add_argument(
+        '--dim',
+        type=int,
+        default=512,
+        help='dimension of the linear layers')
+    return parser.parse_args()
+
+
+def export_model(args, f):
+    """Export a multi-layer perceptron."""
+    x = dragon.constant(numpy.ones((1, args.dim), 'float32'))
+    with dragon.onnx.record():
+        y = x
+        for _ in range(4):
+            w = numpy.random.rand(args.dim, args.dim).astype('float32')
+            y = dragon.nn.relu(dragon.math.matmul([y, dragon.constant(w)]))
+        dragon.onnx.export(inputs=[x], outputs=[y], f=f, output_names=['y'])
+
+
+def run_clients(args, run_fn):
+    """Run the clients concurrently and return the elapsed time."""
+    def client():
+        x = numpy.random.rand(1, args.dim).astype('float32')
+        for _ in range(args.num_requests):
+            run_fn(x)
+    threads = [threading.Thread(target=client) for _ in range(args.num_clients)]
+    tic = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.time() - tic
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    num_requests = args.num_clients * args.num_requests
+    model_file = os.path.join(tempfile.mkdtemp(), 'model.onnx')
+    export_model(args, model_file)
+    rep, lock = dragon.onnx.BackendRep(model_file, 'CPU:0'), threading.Lock()
+
+    def locked_run(x):
+        with lock:
+            return rep.run([x])[0].numpy(copy=True)
+
+    elapsed = run_clients(args, locked_run)
+    print('BackendRep, requests: {}, throughput: {:.1f} req/s'
+          .format(num_requests, num_requests / elapsed))
+    with dragon.onnx.ServingRep(
+            model_file, 'CPU:0', num_workers=args.num_workers,
+            max_batch_size=args.num_clients, batch_outputs=['y']) as rep:
+        elapsed = run_clients(args, lambda x: rep.run([x])[0])
+    print('ServingRep, requests: {}, throughput: {:.1f} req/s'
+          .format(num_requests, num_requests / elapsed))
+
+
+if __name__ == '__main__':
+    main()
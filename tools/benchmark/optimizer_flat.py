@@ -0,0 +1,88 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the optimizer step with and without flat buffer."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import time
+
+import numpy
+
+from dragon.vm import torch
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the update of many small parameters')
+    parser.add_argument(
+        '--num-params',
+        type=int,
+        default=1000,
+        help='number of parameter tensors')
+    parser.add_argument(
+        '--max-size',
+        type=int,
+        default=256,
+        help='max number of elements of each parameter')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=100,
+        help='number of steps to run')
+    parser.add_argument(
+        '--device',
+        type=str,
+        default='cpu',
+        help='device to run')
+    return parser.parse_args()
+
+
+def make_params(args):
+    """Return the parameters with computed gradients."""
+    rng = numpy.random.RandomState(1337)
+    device = torch.device(args.device)
+    params = []
+    for size in rng.randint(1, args.max_size + 1, args.num_params):
+        value = rng.uniform(-1, 1, (size,)).astype('float32')
+        param = torch.tensor(value, device=device, requires_grad=True)
+        params.append(param)
+    loss = params[0].sum()
+    for param in params[1:]:
+        loss = loss + param.sum()
+    loss.backward()
+    return params
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    params = make_params(args)
+    configs = [('SGD', torch.optim.SGD, {'lr': 0.01, 'momentum': 0.9}),
+               ('Adam', torch.optim.Adam, {'lr': 0.001})]
+    for name, optimizer_type, kwargs in configs:
+        step_times = []
+        for flat in (False, True):
+            optimizer = optimizer_type(
+                params, weight_decay=1e-4, clip_norm=1.0, flat=flat, **kwargs)
+            optimizer.step()  # Warmup.
+            tic = time.time()
+            for _ in range(args.num_steps):
+                optimizer.step()
+            step_times.append((time.time() - tic) / args.num_steps)
+        print('Optimizer: {}, params: {}, per-tensor: {:.3f} ms, flat: {:.3f} ms'
+              .format(name, len(params), *[t * 1e3 for t in step_times]))
+
+
+if __name__ == '__main__':
+    main()
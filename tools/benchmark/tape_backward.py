@@ -0,0 +1,72 @@
+# ------------------------------------------------------------
+# Copyright (c) 2017-present, SeetaTech, Co.,Ltd.
+#
+# Licensed under the BSD 2-Clause License.
+# You should have received a copy of the BSD 2-Clause License
+# along with the software. If not, See,
+#
+#      <https://opensource.org/licenses/BSD-2-Clause>
+#
+# ------------------------------------------------------------
+"""Benchmark the backward preparation of eager tapes."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import collections
+import time
+
+from dragon.core.autograph import tape
+from dragon.vm import torch
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='benchmark the tape collection against the number of ops')
+    parser.add_argument(
+        '--num-ops',
+        type=int,
+        nargs='+',
+        default=[100, 1000, 5000, 10000],
+        help='number of operators to record')
+    return parser.parse_args()
+
+
+def collect_tapes(outputs):
+    """Collect the forward tapes as ``FunctionLib._backward``."""
+    inputs = collections.deque(outputs)
+    op_tape, memo = tape.OrderedTape(), set()
+    while len(inputs) > 0:
+        input = inputs.popleft()
+        if id(input) in memo:
+            continue
+        memo.add(id(input))
+        if input._tape:
+            op_tape.merge_from(input._tape)
+            inputs.extend(input._tape.get_sources())
+    return op_tape.get_op_defs()
+
+
+def main():
+    """The main procedure."""
+    args = parse_args()
+    for num_ops in args.num_ops:
+        x = torch.ones(2, 2, requires_grad=True)
+        h, y = x, x
+        for i in range(num_ops // 2):
+            h = h * 0.5
+            y = y + h
+        tic = time.time()
+        op_defs = collect_tapes([y])
+        prep_time = time.time() - tic
+        tic = time.time()
+        y.sum().backward()
+        total_time = time.time() - tic
+        print('Ops: {}, prepare: {:.3f} ms, backward: {:.3f} ms'
+              .format(len(op_defs), prep_time * 1e3, total_time * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -14,14 +14,18 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
 import numpy
 
+from dragon.core import distributed
 from dragon.core.autograph.op_impl import OpSchema
 from dragon.core.autograph import tape
 from dragon.core.framework import context
 from dragon.core.framework import proto_util
 from dragon.core.framework import workspace
 from dragon.vm.torch.core.autograd import grad_mode
+from dragon.vm.torch.core.nn.parameter import Parameter
 from dragon.vm.torch.core.tensor import Tensor
 
 
@@ -221,12 +225,12 @@ class FunctionLib(object):
     def _backward(outputs, grad_outputs, retain_graph=False):
         """Compute the function derivatives w.r.t graph leaves."""
         # Collect forward tapes.
-        inputs = list(outputs)
+        inputs = collections.deque(outputs)
         op_tape = tape.OrderedTape()
-        graph_leaves = set()
+        graph_leaves, param_leaves = set(), set()
         memo = set()
         while len(inputs) > 0:
-            input = inputs.pop(0)
+            input = inputs.popleft()
             if id(input) in memo:
                 continue
             memo.add(id(input))
@@ -238,6 +242,8 @@ class FunctionLib(object):
                     graph_leaves.add(input.id)
             elif input._requires_grad:
                 graph_leaves.add(input.id)
+                if isinstance(input, Parameter):
+                    param_leaves.add(input.id)
 
         # Run backward computations reversely.
         op_defs = op_tape.get_op_defs()
@@ -247,6 +253,8 @@ class FunctionLib(object):
             targets=[y.id for y in outputs],
             grad_targets=[dy.id for dy in grad_outputs],
             sources=list(graph_leaves),
+            reduce_sources=list(param_leaves),
+            process_group=distributed.get_group(),
         )
 
         # Free the forward handles if allowed.
@@ -18,6 +18,7 @@ import weakref
 
 from dragon.core.autograph import tape
 from dragon.core.autograph.function_impl import FunctionSpec
+from dragon.core.autograph.function_impl import _make_hashable
 from dragon.core.autograph.function_impl import class_method_to_instance_method
 from dragon.core.framework import context
 from dragon.core.framework import workspace
@@ -30,34 +31,37 @@ from dragon.vm.torch.core.tensor import Tensor
 class FunctionGuard(object):
     """Map the python function to workspace-local functions."""
 
-    def __init__(self, python_function, input_signature=None):
+    CacheInfo = collections.namedtuple(
+        'CacheInfo', ['hits', 'misses', 'retraces', 'maxsize', 'currsize'])
+
+    def __init__(self, python_function, input_signature=None, max_cache_size=32):
         self._python_function = python_function
         self._spec = FunctionSpec.from_function_and_signature(
             python_function, input_signature)
-        self._defs = collections.defaultdict(list)
-        self._inputs = collections.defaultdict(list)
-        self._outputs = collections.defaultdict(list)
+        self._max_cache_size = max_cache_size
+        self._function_cache = collections.OrderedDict()
+        self._call_counts = collections.defaultdict(int)
+        self._last_functions = dict()
+        self._num_traces = collections.defaultdict(int)
+        self._hits, self._misses, self._retraces = 0, 0, 0
         self._descriptor_cache = weakref.WeakKeyDictionary()
 
     @property
-    def defs(self):
-        """Return the recorded operator defs."""
-        return self._defs.get(id(workspace.get_workspace()), None)
+    def cache_options(self):
+        """Return the options of function cache."""
+        return {'max_cache_size': self._max_cache_size}
 
-    @defs.setter
-    def defs(self, value):
-        """Set the recorded operator defs."""
-        self._defs[id(workspace.get_workspace())] = value
+    @property
+    def defs(self):
+        """Return the recorded operator defs of last called function."""
+        function = self._last_functions.get(id(workspace.get_workspace()))
+        return function['defs'] if function else None
 
     @property
     def inputs(self):
-        """Return the input symbols."""
-        return self._inputs.get(id(workspace.get_workspace()), None)
-
-    @inputs.setter
-    def inputs(self, value):
-        """Set the input symbols."""
-        self._inputs[id(workspace.get_workspace())] = value
+        """Return the input symbols of last called function."""
+        function = self._last_functions.get(id(workspace.get_workspace()))
+        return function['inputs'] if function else None
 
     @property
     def input_signature(self):
@@ -66,19 +70,48 @@ class FunctionGuard(object):
 
     @property
     def outputs(self):
-        """Return the output symbols."""
-        return self._outputs.get(id(workspace.get_workspace()), None)
-
-    @outputs.setter
-    def outputs(self, value):
-        """Set the output symbols."""
-        self._outputs[id(workspace.get_workspace())] = value
+        """Return the output symbols of last called function."""
+        function = self._last_functions.get(id(workspace.get_workspace()))
+        return function['outputs'] if function else None
 
     @property
     def python_function(self):
         """Return the defined python function."""
         return self._python_function
 
+    def cache_info(self):
+        """Return the statistics of function cache.
+
+        Returns
+        -------
+        CacheInfo
+            The number of hits, misses, retraces and cached functions.
+
+        """
+        return self.CacheInfo(self._hits, self._misses, self._retraces,
+                              self._max_cache_size, len(self._function_cache))
+
+    def call_counts(self):
+        """Return the number of calls for each input signature.
+
+        Returns
+        -------
+        Dict[Tuple, int]
+            The number of calls.
+
+        """
+        return dict(self._call_counts)
+
+    def clear_cache(self):
+        """Clear the cached functions and statistics."""
+        for function in self._function_cache.values():
+            self._release(function)
+        self._function_cache.clear()
+        self._call_counts.clear()
+        self._last_functions.clear()
+        self._num_traces.clear()
+        self._hits, self._misses, self._retraces = 0, 0, 0
+
     def separate_inputs(self, *args, **kwargs):
         """Separate inputs from the call arguments."""
         inputs, kwargs = self._spec.separate_inputs(*args, **kwargs)
@@ -90,36 +123,79 @@ class FunctionGuard(object):
 
     def __call__(self, *args, **kwargs):
         """Call the traced function."""
-        if self.defs is None:
-            inputs = []
-            input_signature = self.input_signature
-            with context.variable_scope('%s/Variable' % id(self)):
-                for i in range(self._spec.num_inputs):
-                    if input_signature is not None:
-                        if i >= len(input_signature):
-                            raise ValueError(
-                                'When <example_inputs> is provided, '
-                                'only define arguments covered by it.\n'
-                                'Got %d inputs(s) and %d argument(s).'
-                                % (len(input_signature), self._spec.num_inputs))
-                        if input_signature[i] is not None:
-                            inputs.append(Tensor(
-                                *input_signature[i]['shape'],
-                                dtype=input_signature[i]['dtype'],
-                                device=input_signature[i]['device']))
-                        else:
-                            inputs.append(Tensor(1))
-                    else:
-                        inputs.append(Tensor(1))
-                self.inputs = inputs
-                with tape.GraphTape() as function_tape:
-                    inputs, kwargs = self.separate_inputs(*args, **kwargs)
-                    self.outputs = self._python_function(*inputs, **kwargs)
-                    self.defs = function_tape.get_op_defs()
+        inputs, extra_kwargs = self._spec.separate_inputs(*args, **kwargs)
+        signature = []
+        for value in inputs[:self._spec.num_inputs]:
+            if isinstance(value, Tensor):
+                signature.append((tuple(value.shape), value.dtype,
+                                  str(value.device)))
+            else:
+                signature.append(None)
+        signature = tuple(signature)
+        ws_id = id(workspace.get_workspace())
+        key = (ws_id, _make_hashable(extra_kwargs), signature)
+        function = self._function_cache.get(key, None)
+        if function is None:
+            self._misses += 1
+            if self._num_traces[ws_id] > 0:
+                self._retraces += 1
+            self._num_traces[ws_id] += 1
+            function = self._last_functions[ws_id] = self._trace(
+                args, kwargs, inputs[:self._spec.num_inputs])
+            self._function_cache[key] = function
+            while len(self._function_cache) > self._max_cache_size:
+                self._release(self._function_cache.popitem(last=False)[1])
         else:
+            self._hits += 1
+            self._function_cache.move_to_end(key)
+            self._last_functions[ws_id] = function
             self.separate_inputs(*args, **kwargs)
-            workspace.get_workspace().run_operator(self.defs)
-        return self.outputs
+            workspace.get_workspace().run_operator(function['defs'])
+        self._call_counts[signature] += 1
+        return function['outputs']
+
+    def _trace(self, args, kwargs, values):
+        """Trace the python function with the given values."""
+        inputs = []
+        input_signature = self.input_signature
+        with context.variable_scope('%s/Variable' % id(self)):
+            for i in range(self._spec.num_inputs):
+                spec = None
+                if input_signature is not None:
+                    if i >= len(input_signature):
+                        raise ValueError(
+                            'When <example_inputs> is provided, '
+                            'only define arguments covered by it.\n'
+                            'Got %d inputs(s) and %d argument(s).'
+                            % (len(input_signature), self._spec.num_inputs))
+                    spec = input_signature[i]
+                if i < len(values) and isinstance(values[i], Tensor):
+                    spec = {'shape': values[i].shape,
+                            'dtype': values[i].dtype,
+                            'device': values[i].device}
+                if spec is not None:
+                    inputs.append(Tensor(
+                        *(tuple(spec['shape']) or (1,)),
+                        dtype=spec['dtype'],
+                        device=spec['device']))
+                else:
+                    inputs.append(Tensor(1))
+            function = {'inputs': inputs,
+                        'workspace': weakref.ref(workspace.get_workspace())}
+            self._last_functions[id(workspace.get_workspace())] = function
+            with tape.GraphTape() as function_tape:
+                inputs, kwargs = self.separate_inputs(*args, **kwargs)
+                function['outputs'] = self._python_function(*inputs, **kwargs)
+                function['defs'] = function_tape.get_op_defs()
+        return function
+
+    @staticmethod
+    def _release(function):
+        """Reset the input aliases before the handles are reused."""
+        execute_ws = function['workspace']()
+        if execute_ws is not None:
+            for input in function['inputs']:
+                execute_ws.set_alias(input.id, input.id)
 
     def __get__(self, instance, owner):
         """Override to patch the instance methods."""
@@ -132,7 +208,7 @@ class FunctionGuard(object):
         return self._descriptor_cache[instance]
 
 
-def trace(func=None, example_inputs=None):
+def trace(func=None, example_inputs=None, max_cache_size=32):
     """Trace a function and return an executable.
 
     Only the tensor operations could be traced:
@@ -166,12 +242,24 @@ def trace(func=None, example_inputs=None):
     print(m(torch.tensor([1, 2])))
     ```
 
+    Operators are re-traced for each unseen shape, dtype and device of inputs,
+    and replayed from a bounded cache otherwise:
+
+    ```python
+    m(torch.ones(1, 3, 224, 224))
+    m(torch.ones(1, 3, 320, 320))  # Retrace
+    m(torch.ones(1, 3, 224, 224))  # Replay
+    print(m.forward.cache_info(), m.forward.call_counts())
+    ```
+
     Parameters
     ----------
     func : Union[callable, dragon.vm.torch.nn.Module], required
         The function to be traced.
     example_inputs : Sequence[dragon.vm.torch.Tensor], required
         The examples to hint the input info.
+    max_cache_size : int, optional, default=32
+        The max number of cached traces.
 
     Returns
     -------
@@ -193,7 +281,8 @@ def trace(func=None, example_inputs=None):
         else:
             input_signatures = None
         return decorator.make_decorator(
-            inner_function, FunctionGuard(inner_function, input_signatures))
+            inner_function,
+            FunctionGuard(inner_function, input_signatures, max_cache_size))
     if func is not None:
         if isinstance(func, Module):
             func.forward = decorated(func.forward)
@@ -593,7 +593,7 @@ class Module(object):
                 if isinstance(input_param, Tensor):
                     param.copy_(input_param)
                 elif isinstance(input_param, numpy.ndarray):
-                    param._impl.FromNumpy(input_param.copy(), True)
+                    param._impl.FromNumpy(input_param, True)
                 else:
                     error_msgs.append(
                         'Excepted the input param is either '
@@ -49,6 +49,7 @@ class Adam(Optimizer):
         amsgrad=False,
         scale=1,
         clip_norm=0,
+        flat=False,
     ):
         r"""Create an ``Adam`` optimizer.
 
@@ -70,6 +71,8 @@ class Adam(Optimizer):
             The scaling factor to gradient.
         clip_norm : float, optional, default=0
             The maximum L2 norm to clip gradient.
+        flat : bool, optional, default=False
+            ``True`` to keep the float32 group as views of a flat buffer.
 
         """
         if not 0. <= lr:
@@ -84,7 +87,7 @@ class Adam(Optimizer):
             raise NotImplementedError
         defaults = dict(lr=lr, beta1=betas[0], beta2=betas[1],
                         eps=eps, amsgrad=amsgrad, weight_decay=weight_decay,
-                        scale=scale, clip_norm=clip_norm)
+                        scale=scale, clip_norm=clip_norm, flat=flat)
         super(Adam, self).__init__(params, defaults)
         self._hyper = {
             'lr': ('lr', collections.defaultdict(str)),
@@ -124,6 +127,7 @@ class AdamW(Adam):
         amsgrad=False,
         scale=1,
         clip_norm=0,
+        flat=False,
     ):
         r"""Create an ``AdamW`` optimizer.
 
@@ -145,8 +149,11 @@ class AdamW(Adam):
             The scaling factor to gradient.
         clip_norm : float, optional, default=0
             The maximum L2 norm to clip gradient.
+        flat : bool, optional, default=False
+            ``True`` to keep the float32 group as views of a flat buffer.
 
         """
         super(AdamW, self).__init__(params, lr=lr, betas=betas, eps=eps,
                                     weight_decay=weight_decay, amsgrad=amsgrad,
-                                    scale=scale, clip_norm=clip_norm)
+                                    scale=scale, clip_norm=clip_norm,
+                                    flat=flat)
@@ -23,6 +23,7 @@ import numpy
 from dragon.core import distributed
 from dragon.core.framework import workspace
 from dragon.vm.torch.core.autograd.function_impl import FunctionLib
+from dragon.vm.torch.core.nn.parameter import Parameter
 from dragon.vm.torch.core.ops import distributed_ops
 from dragon.vm.torch.core.tensor import Tensor
 
@@ -235,14 +236,22 @@ class Optimizer(object):
             hyper_impl.FromNumpy(numpy.array(group[name], 'float32'), False)
 
         # Reduce grads in the process group.
+        # Skip the parameter grads reduced in buckets during the backward.
         process_group = distributed.get_group()
         if process_group is not None:
-            distributed_ops.all_reduce(grads, 'MEAN', process_group)
+            if process_group.bucket_size > 0:
+                grads_to_reduce = [g for p, g in zip(params_with_grad, grads)
+                                   if not isinstance(p, Parameter)]
+            else:
+                grads_to_reduce = grads
+            if len(grads_to_reduce) > 0:
+                distributed_ops.all_reduce(grads_to_reduce, 'MEAN', process_group)
 
         # Apply updates.
         FunctionLib.apply(
             self._op_type, params_with_grad[0].device, grads,
-            outputs=params_with_grad, handle=group['name'], weight_decay=None)
+            outputs=params_with_grad, handle=group['name'],
+            weight_decay=None, flat=group.get('flat', False))
 
     @staticmethod
     def _get_grad(execute_ws, param, summed=False):
@@ -51,6 +51,7 @@ class RMSprop(Optimizer):
         centered=False,
         scale=1,
         clip_norm=0,
+        flat=False,
     ):
         r"""Create a ``RMSprop`` optimizer.
 
@@ -72,6 +73,8 @@ class RMSprop(Optimizer):
             The scaling factor to gradient.
         clip_norm : float, optional, default=0
             The maximum L2 norm to clip gradient.
+        flat : bool, optional, default=False
+            ``True`` to keep the float32 group as views of a flat buffer.
 
         """
         if not 0. <= lr:
@@ -84,7 +87,7 @@ class RMSprop(Optimizer):
             raise ValueError("Invalid alpha value: {}".format(alpha))
         defaults = dict(lr=lr, momentum=momentum, alpha=alpha,
                         eps=eps, centered=centered, weight_decay=weight_decay,
-                        scale=scale, clip_norm=clip_norm)
+                        scale=scale, clip_norm=clip_norm, flat=flat)
         super(RMSprop, self).__init__(params, defaults)
         self._hyper = {
             'lr': ('lr', collections.defaultdict(str)),
@@ -74,6 +74,7 @@ class SGD(Optimizer):
         nesterov=False,
         scale=1,
         clip_norm=0,
+        flat=False,
     ):
         r"""Create a ``SGD`` optimizer.
 
@@ -95,6 +96,8 @@ class SGD(Optimizer):
             The scaling factor to gradient.
         clip_norm : float, optional, default=0
             The maximum L2 norm to clip gradient.
+        flat : bool, optional, default=False
+            ``True`` to keep the float32 group as views of a flat buffer.
 
         """
         if lr is not required and lr < 0.:
@@ -103,7 +106,7 @@ class SGD(Optimizer):
             raise ValueError('Invalid momentum value: {}'.format(momentum))
         defaults = dict(lr=lr, momentum=momentum, dampening=dampening,
                         nesterov=nesterov, weight_decay=weight_decay,
-                        scale=scale, clip_norm=clip_norm)
+                        scale=scale, clip_norm=clip_norm, flat=flat)
         if nesterov and (momentum <= 0. or dampening != 0.):
             raise ValueError('Nesterov momentum requires a momentum and zero dampening.')
         super(SGD, self).__init__(params, defaults)
@@ -18,18 +18,44 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import io
+import json
 import pathlib
+import struct
 import sys
 
+import numpy
+
 from dragon.core.util import six
 
 PICKLE_MODULE = six.moves.pickle
 DEFAULT_PROTOCOL = 2
+CHUNKED_MAGIC = b'DRAGONCK'
+CHUNKED_VERSION = 2
+CHUNKED_ALIGNMENT = 64
 
 
-def save(obj, f, pickle_module=PICKLE_MODULE, pickle_protocol=DEFAULT_PROTOCOL):
+def save(
+    obj,
+    f,
+    pickle_module=PICKLE_MODULE,
+    pickle_protocol=DEFAULT_PROTOCOL,
+    chunked=False,
+):
     """Save an object using pickle.
 
+    Set ``chunked`` to save a dict without pickle:
+
+    ```python
+    torch.save(m.state_dict(), 'model.pth', chunked=True)
+    ```
+
+    The chunked format writes a header of tensor names, shapes and offsets,
+    followed by the aligned raw data of tensors.
+    Other values of dict should be JSON serializable,
+    where the types of tuples and dicts are kept in the header.
+
     Parameters
     ----------
     obj : Any
@@ -40,21 +66,36 @@ def save(obj, f, pickle_module=PICKLE_MODULE, pickle_protocol=DEFAULT_PROTOCOL):
         The optional pickle module.
     pickle_protocol : int, optional
         The optional pickle protocol.
+    chunked : bool, optional, default=False
+        ``True`` to save a dict in the chunked format.
 
     """
+    if chunked:
+        if not isinstance(obj, dict):
+            raise TypeError('Excepted a dict to save in the chunked format.')
+        return _with_file_like(f, 'wb', lambda f: _save_chunked(obj, f))
     return _with_file_like(
         f, 'wb', lambda f: _save(obj, f, pickle_module, pickle_protocol))
 
 
-def load(f, pickle_module=PICKLE_MODULE):
+def load(f, pickle_module=PICKLE_MODULE, mmap=True):
     """Load an object using pickle.
 
+    The chunked format is detected automatically, and tensors
+    are returned as read-only arrays mapping the file if ``mmap``:
+
+    ```python
+    m.load_state_dict(torch.load('model.pth'))
+    ```
+
     Parameters
     ----------
     f : file_like
         The file object or file name.
     pickle_module : module
         The optional pickle module.
+    mmap : bool, optional, default=True
+        ``True`` to memory-map the tensors of chunked format.
 
     Returns
     -------
@@ -62,12 +103,126 @@ def load(f, pickle_module=PICKLE_MODULE):
         The deserialized object.
 
     """
+    def body(f):
+        start = f.tell()
+        if f.read(len(CHUNKED_MAGIC)) == CHUNKED_MAGIC:
+            return _load_chunked(f, start, mmap)
+        f.seek(start)
+        try:
+            return pickle_module.load(f)
+        except UnicodeDecodeError:
+            f.seek(start)
+            return pickle_module.load(f, encoding='bytes')
+    return _with_file_like(f, 'rb', body)
+
+
+def _align(offset, alignment=CHUNKED_ALIGNMENT):
+    """Return the aligned offset."""
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def _flatten_dict(obj, prefix=()):
+    """Return the flattened (key path, value) pairs."""
+    for k, v in obj.items():
+        if isinstance(v, dict) and len(v) > 0:
+            for item in _flatten_dict(v, prefix + (k,)):
+                yield item
+        else:
+            yield prefix + (k,), v
+
+
+def _encode_value(value):
+    """Encode the value with the container types for JSON."""
+    if isinstance(value, tuple):
+        return {'tuple': [_encode_value(v) for v in value]}
+    elif isinstance(value, list):
+        return [_encode_value(v) for v in value]
+    elif isinstance(value, dict):
+        return {'dict': [[k, _encode_value(v)] for k, v in value.items()]}
+    return value
+
+
+def _decode_value(value):
+    """Decode the value with the container types from JSON."""
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    elif isinstance(value, dict):
+        if 'tuple' in value:
+            return tuple(_decode_value(v) for v in value['tuple'])
+        return collections.OrderedDict(
+            (k, _decode_value(v)) for k, v in value['dict'])
+    return value
+
+
+def _save_chunked(obj, f):
+    """Write the dict in the chunked format."""
+    entries, tensors, offset = [], [], 0
+    for path, v in _flatten_dict(obj):
+        if isinstance(v, numpy.ndarray) or hasattr(v, 'numpy'):
+            dtype = str(v.dtype)
+            shape = [int(d) for d in v.shape]
+            nbytes = numpy.dtype(dtype).itemsize * int(numpy.prod(shape))
+            entries.append({'key': path, 'dtype': dtype, 'shape': shape,
+                            'offset': offset, 'nbytes': nbytes})
+            tensors.append((entries[-1], v))
+            offset = _align(offset + nbytes)
+        else:
+            entries.append({'key': path, 'value': _encode_value(v)})
+    header = {'version': CHUNKED_VERSION,
+              'alignment': CHUNKED_ALIGNMENT,
+              'entries': entries}
     try:
-        return _with_file_like(
-            f, 'rb', lambda f: pickle_module.load(f))
-    except UnicodeDecodeError:
-        return _with_file_like(
-            f, 'rb', lambda f: pickle_module.load(f, encoding='bytes'))
+        header = json.dumps(header).encode('utf-8')
+    except TypeError as e:
+        raise TypeError('Values of the chunked format should be JSON serializable. '
+                        'Got ' + str(e))
+    f.write(CHUNKED_MAGIC)
+    f.write(struct.pack('<Q', len(header)))
+    f.write(header)
+    data_start = _align(len(CHUNKED_MAGIC) + 8 + len(header))
+    cursor = len(CHUNKED_MAGIC) + 8 + len(header)
+    # Stream the tensor data without an intermediate dict.
+    for entry, v in tensors:
+        padding = data_start + entry['offset'] - cursor
+        f.write(b'\0' * padding)
+        array = v if isinstance(v, numpy.ndarray) else v.numpy()
+        array = numpy.ascontiguousarray(array).reshape(-1)
+        f.write(memoryview(array.view('uint8')))
+        cursor += padding + entry['nbytes']
+
+
+def _load_chunked(f, start, mmap=True):
+    """Read the dict from the chunked format."""
+    magic_size = len(CHUNKED_MAGIC)
+    header_size = struct.unpack('<Q', f.read(8))[0]
+    header = json.loads(f.read(header_size).decode('utf-8'))
+    if header['version'] > CHUNKED_VERSION:
+        raise ValueError('Unsupported version of chunked format: {}'
+                         .format(header['version']))
+    data_start = start + _align(magic_size + 8 + header_size, header['alignment'])
+    buffer = None
+    if mmap:
+        try:
+            buffer = numpy.memmap(f, 'uint8', 'r', offset=data_start)
+        except (AttributeError, io.UnsupportedOperation, ValueError):
+            buffer = None
+    if buffer is None:
+        f.seek(data_start)
+        buffer = numpy.frombuffer(f.read(), 'uint8')
+    obj = collections.OrderedDict()
+    for entry in header['entries']:
+        dest, path = obj, entry['key']
+        for k in path[:-1]:
+            dest = dest.setdefault(k, collections.OrderedDict())
+        if 'dtype' in entry:
+            begin = entry['offset']
+            array = buffer[begin:begin + entry['nbytes']]
+            dest[path[-1]] = array.view(entry['dtype']).reshape(entry['shape'])
+        elif header['version'] > 1:
+            dest[path[-1]] = _decode_value(entry['value'])
+        else:
+            dest[path[-1]] = entry['value']
+    return obj
 
 
 def _save_dict(obj):